@@ -2,19 +2,25 @@
 # Nós não o escrevemos, apenas o usamos.
 from tensorflow.keras.layers import Input, Dense, Flatten, Conv2D, MaxPooling2D, BatchNormalization, Activation
 from tensorflow.keras.models import Model
-from keras_applications.imagenet_utils import _obtain_input_shape
-from tensorflow.keras import backend as K
+
+def _check_input_shape(input_shape, min_size=48):
+    """
+    Mesma validação que o _obtain_input_shape do keras_applications fazia
+    aqui (formato channels_last, sem pesos ImageNet), sem depender do pacote.
+    """
+    if input_shape is None:
+        return (None, None, 3)
+    if len(input_shape) != 3:
+        raise ValueError('`input_shape` must be a tuple of three integers.')
+    if any(dim is not None and dim < min_size for dim in input_shape[:2]):
+        raise ValueError(f'Input size must be at least {min_size}x{min_size}; got `input_shape={input_shape}`')
+    return tuple(input_shape)
 
 def Meso4(input_shape=None, **kwargs):
     """
     Cria a arquitetura do modelo Meso4
     """
-    input_shape = _obtain_input_shape(input_shape,
-                                      default_size=256,
-                                      min_size=48,
-                                      data_format=K.image_data_format(),
-                                      require_flatten=False,
-                                      weights=None)
+    input_shape = _check_input_shape(input_shape)
 
     input_tensor = Input(shape=input_shape)
     x = input_tensor
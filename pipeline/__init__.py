@@ -0,0 +1,3 @@
+"""
+Código compartilhado pelos scripts de extração, avaliação e treinamento.
+"""
@@ -0,0 +1,74 @@
+"""
+Ponto de entrada único dos scripts: python -m pipeline <comando> [opções].
+
+Cada comando roda o script correspondente de scripts/ (as opções são
+repassadas). Só o script escolhido é importado, então comandos leves
+(split, metrics, lq, ...) não inicializam o TensorFlow.
+
+    python -m pipeline                 # lista os comandos
+    python -m pipeline metrics --video mean
+    python -m pipeline startup         # benchmark do tempo de inicialização
+"""
+import os
+import sys
+import runpy
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "scripts")
+
+# comando -> (script, descrição)
+COMMANDS = {
+    "faces": ("01_extract_faces.py", "Extrai os rostos dos vídeos"),
+    "lq": ("02_create_lq_images.py", "Gera as versões comprimidas (q60, q30, q10)"),
+    "stress": ("08_stress_evaluation.py", "Teste de estresse de todos os modelos"),
+    "split": ("09_split_data.py", "Divide os vídeos em treino/teste (frames_split.csv)"),
+    "validate": ("10_robust_validation.py", "Validação final (modelo padrão x robusto)"),
+    "benchmark": ("11_benchmark_inference.py", "Vazão de cada modelo por tamanho de lote"),
+    "evaluate": ("12_evaluate.py", "Avalia N modelos x M cenários"),
+    "cache": ("13_build_frame_cache.py", "Gera o cache das imagens decodificadas"),
+    "metrics": ("14_metrics.py", "Métricas de todos os arquivos de resultados"),
+    "early-exit": ("15_early_exit.py", "Veredito por vídeo com parada antecipada"),
+    "export": ("16_export_models.py", "Exporta os modelos para TFLite/ONNX"),
+    "train-input": ("17_benchmark_training_input.py", "Vazão da entrada do treino (ImageDataGenerator x tf.data)"),
+    "cascade": ("18_cascade.py", "Cascata por confiança (modelo barato -> Xception)"),
+    "stream": ("19_stream_videos.py", "Avalia vídeos direto do arquivo, em memória"),
+    "serve": ("20_serve.py", "Serviço local de scores (micro-batching)"),
+    "load-test": ("21_load_test.py", "Carga no serviço: latência p50/p99 e vazão"),
+    "bench": ("22_benchmark_suite.py", "Suíte de benchmarks na base sintética"),
+    "dedup": ("23_dedup.py", "Deduplicação: inferência economizada x AUC"),
+    "crash-search": ("24_crash_search.py", "Qualidade JPEG em que cada modelo quebra"),
+}
+
+
+def usage():
+    print("Uso: python -m pipeline <comando> [opções]\n\nComandos:")
+    for name, (script, description) in COMMANDS.items():
+        print(f"  {name:<13} {description} (scripts/{script})")
+    print(f"  {'startup':<13} Benchmark do tempo de inicialização dos comandos (pipeline/startup.py)")
+
+
+def run(command, args):
+    """Roda o script do comando como se fosse chamado direto (python scripts/<script> args)."""
+    path = os.path.join(SCRIPTS_DIR, COMMANDS[command][0])
+    sys.argv = [path] + list(args)
+    runpy.run_path(path, run_name="__main__")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        usage()
+        return 0
+    command, args = argv[0], argv[1:]
+    if command == "startup":
+        from pipeline import startup
+        return startup.main(args)
+    if command not in COMMANDS:
+        print(f"Comando desconhecido: {command}\n")
+        usage()
+        return 2
+    run(command, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Backends de inferência: Keras (padrão), TFLite (float ou int8) e ONNX Runtime.
+
+Todos têm a mesma interface do BatchInference (predict_batch / run), então a
+avaliação escolhe o backend sem mudar mais nada. Os modelos exportados ficam
+em models/exported/ (ver scripts/16_export_models.py).
+"""
+import os
+
+import numpy as np
+
+from pipeline.inference import BatchInference, DEFAULT_BATCH_SIZE
+
+EXPORT_DIR = "models/exported"
+BACKENDS = ["keras", "tflite", "tflite-int8", "onnx"]
+
+
+def exported_path(m_info, backend, export_dir=EXPORT_DIR):
+    """
+    Arquivo exportado de um modelo do registro para o backend pedido, nomeado
+    a partir do arquivo original (ex.: models/exported/xception_model_int8.tflite).
+    """
+    extension = {"tflite": ".tflite", "tflite-int8": "_int8.tflite", "onnx": ".onnx"}[backend]
+    stem = os.path.splitext(os.path.basename(m_info['path']))[0]
+    return os.path.join(export_dir, stem + extension)
+
+
+def backend_name(name, backend):
+    """Nome do modelo nos CSVs: o backend só aparece quando não é o Keras."""
+    return name if backend == "keras" else f"{name} [{backend}]"
+
+
+def with_backend(model_infos, backend):
+    """Entradas do registro renomeadas para o backend (ver backend_name)."""
+    return [{**m_info, "name": backend_name(m_info['name'], backend)} for m_info in model_infos]
+
+
+def _tflite_interpreter(path, num_threads):
+    try:
+        # Runtime leve (pacote ai-edge-litert), sem precisar carregar o TensorFlow inteiro
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+    return Interpreter(model_path=path, num_threads=num_threads)
+
+
+class TFLiteInference(BatchInference):
+    """Roda um modelo .tflite; o tamanho do lote é ajustado conforme a entrada."""
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE, num_threads=None):
+        super().__init__(model=None, batch_size=batch_size)
+        self.interpreter = _tflite_interpreter(path, num_threads or os.cpu_count())
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_len = None
+
+    def predict_batch(self, batch):
+        batch = np.asarray(batch, dtype=np.float32)
+        if len(batch) != self._batch_len:
+            self.interpreter.resize_tensor_input(self._input['index'], list(batch.shape))
+            self.interpreter.allocate_tensors()
+            self._input = self.interpreter.get_input_details()[0]
+            self._output = self.interpreter.get_output_details()[0]
+            self._batch_len = len(batch)
+
+        # Modelos int8 com entrada quantizada: converte usando a escala do próprio modelo
+        if self._input['dtype'] != np.float32:
+            scale, zero_point = self._input['quantization']
+            batch = np.round(batch / scale + zero_point).astype(self._input['dtype'])
+        self.interpreter.set_tensor(self._input['index'], batch)
+        self.interpreter.invoke()
+        scores = self.interpreter.get_tensor(self._output['index'])
+        if self._output['dtype'] != np.float32:
+            scale, zero_point = self._output['quantization']
+            scores = (scores.astype(np.float32) - zero_point) * scale
+        return np.asarray(scores).reshape(len(batch), -1)[:, 0]
+
+
+class ONNXInference(BatchInference):
+    """Roda um modelo .onnx com o ONNX Runtime (CPU)."""
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__(model=None, batch_size=batch_size)
+        import onnxruntime as ort
+        self.session = ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+        self._input_name = self.session.get_inputs()[0].name
+
+    def predict_batch(self, batch):
+        batch = np.asarray(batch, dtype=np.float32)
+        scores = self.session.run(None, {self._input_name: batch})[0]
+        return np.asarray(scores).reshape(len(batch), -1)[:, 0]
+
+
+def make_engine(m_info, backend="keras", batch_size=DEFAULT_BATCH_SIZE, model=None):
+    """
+    Cria o motor de inferência de um modelo do registro no backend pedido.
+    Para o Keras, `model` pode ser passado já carregado.
+    """
+    if backend == "keras":
+        from pipeline import registry
+        return BatchInference(model if model is not None else registry.load(m_info), batch_size=batch_size)
+
+    path = exported_path(m_info, backend)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Arquivo {path} não encontrado! Rode scripts/16_export_models.py.")
+    if backend in ("tflite", "tflite-int8"):
+        return TFLiteInference(path, batch_size=batch_size)
+    if backend == "onnx":
+        return ONNXInference(path, batch_size=batch_size)
+    raise ValueError(f"Backend desconhecido: {backend}")
@@ -0,0 +1,221 @@
+"""
+Suíte de benchmarks reprodutível sobre a base sintética (pipeline/synthetic.py).
+
+Cada etapa do projeto é medida isoladamente, em `repeats` repetições (vale a
+mediana): extração de rostos (01), geração das versões LQ (02), divisão
+treino/teste (09), leitura e decodificação dos frames (hq e qN em memória),
+inferência de cada modelo com pesos aleatórios em vários tamanhos de lote e
+cálculo das métricas (14). O resultado é um JSON (a linha de base) que pode
+ser comparado com outra execução por compare(), que aponta as etapas que
+ficaram mais lentas.
+"""
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import contextlib
+
+import numpy as np
+import pandas as pd
+
+from pipeline import synthetic
+from pipeline.degrade import write_levels, load_degraded
+from pipeline.faces import extract_all, list_videos
+from pipeline.loader import find_images, parse_frame_path, stream_frames
+from pipeline.metrics import frame_metrics, video_scores
+from pipeline.split import make_split, split_images
+
+STAGES = ["extract", "lq", "split", "decode", "inference", "metrics"]
+DEFAULT_ROOT = "benchmarks/synthetic"
+DEFAULT_BATCH_SIZES = [1, 16, 64]
+DEFAULT_TOLERANCE = 0.10  # Fração de queda de vazão tolerada antes de apontar lentidão
+
+
+def _quiet():
+    """Silencia os prints das funções medidas (ex.: o resumo do make_split)."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def measure(fn, repeats=3):
+    """
+    Roda fn() `repeats` vezes; fn devolve o número de itens processados.
+    Retorna {"items", "seconds" (mediana), "min_seconds", "per_s"}.
+    """
+    times, items = [], 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        items = fn()
+        times.append(time.perf_counter() - start)
+    seconds = float(np.median(times))
+    return {"items": items, "seconds": seconds, "min_seconds": float(min(times)),
+            "per_s": items / seconds if seconds else None}
+
+
+# --- Etapas ---
+
+def bench_extract(root, detector="haar", sample_rate=15):
+    def run():
+        out = tempfile.mkdtemp(dir=root)
+        try:
+            extract_all(os.path.join(root, "data"), out, detector_name=detector, sample_rate=sample_rate)
+        finally:
+            shutil.rmtree(out)
+        return len(videos)
+    videos = list_videos(os.path.join(root, "data"))
+    return {"extract": ("vídeos", run)}
+
+
+def bench_lq(root, qualities=synthetic.QUALITIES):
+    hq = sorted(find_images(os.path.join(root, "frames", "hq")))
+
+    def run():
+        out = tempfile.mkdtemp(dir=root)
+        try:
+            for i, path in enumerate(hq):
+                write_levels(path, [(q, os.path.join(out, f"{i}_q{q}.jpg")) for q in qualities])
+        finally:
+            shutil.rmtree(out)
+        return len(hq) * len(qualities)
+    return {"lq": ("imagens", run)}
+
+
+def bench_split(root):
+    base_dir = os.path.join(root, "frames")
+
+    def run():
+        manifest = os.path.join(root, "bench_split.csv")
+        with _quiet():
+            make_split(base_dir).to_csv(manifest, index=False)
+        n = sum(len(split_images("hq", split, base_dir, manifest)) for split in ("train", "test"))
+        os.remove(manifest)
+        return n
+    return {"split": ("frames", run)}
+
+
+def bench_decode(root, size=256, quality=30):
+    hq = sorted(find_images(os.path.join(root, "frames", "hq")))
+
+    def decode():
+        return sum(1 for _ in stream_frames(hq, size))
+
+    def degraded():
+        for path in hq:
+            load_degraded(path, size, quality)
+        return len(hq)
+    return {"decode": ("frames", decode), f"decode_q{quality}_memoria": ("frames", degraded)}
+
+
+def bench_inference(model_infos, batch_sizes=DEFAULT_BATCH_SIZES, n_frames=128):
+    """Um benchmark por (modelo, lote); os modelos são criados com pesos aleatórios."""
+    from pipeline.inference import BatchInference
+
+    benches = {}
+    for m_info in model_infos:
+        engine = BatchInference(synthetic.random_model(m_info))
+        frames = np.random.default_rng(0).random((n_frames, m_info['size'], m_info['size'], 3), dtype=np.float32)
+        for batch_size in batch_sizes:
+            def run(engine=engine, frames=frames, batch_size=batch_size):
+                engine.batch_size = batch_size
+                for _ in engine.run(enumerate(frames)):
+                    pass
+                return len(frames)
+            # Aquecimento: compila o grafo antes da medição
+            engine.predict_batch(frames[:batch_size])
+            benches[f"inference[{m_info['name']},bs={batch_size}]"] = ("frames", run)
+    return benches
+
+
+def bench_metrics(root, n_models=4, scenarios=("hq", "q60", "q30", "q10"), seed=42):
+    """Métricas por frame e por vídeo sobre scores sintéticos para os frames da base."""
+    rng = np.random.default_rng(seed)
+    metas = [parse_frame_path(p) for p in sorted(find_images(os.path.join(root, "frames", "hq")))]
+    rows = [{**meta, "model": f"modelo_{m}", "scenario": scenario, "score": rng.random()}
+            for m in range(n_models) for scenario in scenarios for meta in metas]
+    df = pd.DataFrame(rows)
+
+    def run():
+        frame_metrics(df)
+        video_scores(df)
+        return len(df)
+    return {"metrics": ("linhas", run)}
+
+
+# --- Suíte ---
+
+def environment():
+    import cv2
+    env = {"python": platform.python_version(), "platform": platform.platform(), "processor": platform.processor(),
+           "cpu_count": os.cpu_count(), "numpy": np.__version__, "opencv": cv2.__version__}
+    if "tensorflow" in sys.modules:
+        env["tensorflow"] = sys.modules["tensorflow"].__version__
+    return env
+
+
+def run_suite(root=DEFAULT_ROOT, stages=STAGES, model_infos=(), batch_sizes=DEFAULT_BATCH_SIZES, repeats=3,
+              n_frames=128, detector="haar", progress=print):
+    """
+    Roda as etapas pedidas sobre a base sintética em `root` e devolve o
+    relatório (dicionário pronto para virar JSON).
+    """
+    builders = {
+        "extract": lambda: bench_extract(root, detector),
+        "lq": lambda: bench_lq(root),
+        "split": lambda: bench_split(root),
+        "decode": lambda: bench_decode(root),
+        "inference": lambda: bench_inference(model_infos, batch_sizes, n_frames),
+        "metrics": lambda: bench_metrics(root),
+    }
+    results = {}
+    for stage in stages:
+        for name, (unit, fn) in builders[stage]().items():
+            results[name] = {"stage": stage, "unit": unit, **measure(fn, repeats)}
+            if progress:
+                r = results[name]
+                progress(f"   {name:<36} {r['per_s']:10.1f} {unit}/s  ({r['seconds'] * 1000:.1f} ms, {r['items']} {unit})")
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": environment(),
+        "config": {"root": root, "stages": list(stages), "models": [m['name'] for m in model_infos],
+                   "batch_sizes": list(batch_sizes), "repeats": repeats, "inference_frames": n_frames,
+                   "detector": detector},
+        "benchmarks": results,
+    }
+
+
+def save(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline, current, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compara a vazão de cada benchmark presente nos dois relatórios. `ratio` é
+    vazão atual / vazão da linha de base; abaixo de 1 - tolerance, a etapa é
+    apontada como mais lenta (slower=True).
+    """
+    rows = []
+    for name, base in baseline["benchmarks"].items():
+        cur = current["benchmarks"].get(name)
+        if cur is None or not base.get("per_s") or not cur.get("per_s"):
+            continue
+        ratio = cur["per_s"] / base["per_s"]
+        rows.append({"benchmark": name, "stage": base["stage"], "unit": base["unit"],
+                     "baseline_per_s": base["per_s"], "current_per_s": cur["per_s"], "ratio": ratio,
+                     "slower": ratio < 1 - tolerance, "faster": ratio > 1 + tolerance})
+    return pd.DataFrame(rows, columns=["benchmark", "stage", "unit", "baseline_per_s", "current_per_s",
+                                       "ratio", "slower", "faster"])
+
+
+def environment_changes(baseline, current):
+    """Campos do ambiente que mudaram entre as execuções (as comparações valem menos)."""
+    base, cur = baseline.get("environment", {}), current.get("environment", {})
+    return {k: (base.get(k), cur.get(k)) for k in sorted(set(base) | set(cur)) if base.get(k) != cur.get(k)}
@@ -0,0 +1,99 @@
+"""
+Cascata por confiança: um modelo barato (MobileNetV2 ou MesoNet) avalia todos
+os frames e só os frames cujo score cai numa faixa de incerteza [low, high]
+são reavaliados pelo modelo forte (Xception); nos outros vale o score barato.
+
+O modelo forte roda uma única vez, nos frames da faixa mais larga pedida (ou
+em todos, para a referência "só o modelo forte"); as faixas mais estreitas são
+subconjuntos dela, então todas saem da mesma passada. O custo de cada faixa é
+estimado com os tempos medidos: tempo do modelo barato em todos os frames +
+frames escalados x tempo por frame do modelo forte.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from pipeline.evaluation import frame_source
+from pipeline.inference import batched, DEFAULT_BATCH_SIZE
+from pipeline.loader import parse_frame_path
+from pipeline.metrics import frame_metrics
+
+DEFAULT_BANDS = [(0.45, 0.55), (0.4, 0.6), (0.3, 0.7), (0.2, 0.8), (0.1, 0.9)]
+FRAME_KEYS = ["label_str", "video", "frame"]
+
+
+def score_frames(m_info, engine, image_paths, scenario, image_root="frames", use_cache=True, quality=None,
+                 encoded_cache=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Scores de um modelo nos frames pedidos: (DataFrame com os metadados e o score, segundos)."""
+    start = time.perf_counter()
+    frames = frame_source(image_paths, scenario, m_info['size'], image_root, use_cache, quality, encoded_cache)
+    rows = []
+    for metas, batch in batched(frames, batch_size):
+        scores = engine.predict_batch(m_info['prep'](batch.copy()))
+        rows.extend({**meta, "score": float(score)} for meta, score in zip(metas, scores))
+    columns = FRAME_KEYS + ["label", "scenario", "score"]
+    return pd.DataFrame(rows, columns=columns), time.perf_counter() - start
+
+
+def run(cheap, strong, image_paths, scenario, bands=DEFAULT_BANDS, reference=True, image_root="frames",
+        use_cache=True, quality=None, encoded_cache=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Roda a cascata em um cenário. `cheap` e `strong` são pares (m_info, motor).
+    Retorna (frames, tempos): um DataFrame com cheap_score e strong_score
+    (NaN onde o modelo forte não rodou) e um dicionário com os segundos do
+    modelo barato, do forte e os frames avaliados pelo forte.
+    """
+    frames, cheap_seconds = score_frames(*cheap, image_paths, scenario, image_root, use_cache, quality,
+                                         encoded_cache, batch_size)
+    frames = frames.rename(columns={"score": "cheap_score"})
+
+    if reference:
+        strong_paths = list(image_paths)
+    else:
+        low, high = min(b[0] for b in bands), max(b[1] for b in bands)
+        uncertain = frames[frames["cheap_score"].between(low, high)]
+        wanted = set(uncertain[FRAME_KEYS].itertuples(index=False, name=None))
+        strong_paths = [p for p in image_paths if _frame_key(p) in wanted]
+
+    # O cache decodificado guarda o cenário inteiro: só vale quando todos os frames serão lidos
+    strong_cache = use_cache and len(strong_paths) == len(image_paths)
+    strong_frames, strong_seconds = score_frames(*strong, strong_paths, scenario, image_root, strong_cache, quality,
+                                                 encoded_cache, batch_size)
+    frames = frames.merge(strong_frames[FRAME_KEYS + ["score"]].rename(columns={"score": "strong_score"}),
+                          on=FRAME_KEYS, how="left")
+    timings = {"cheap_seconds": cheap_seconds, "strong_seconds": strong_seconds, "strong_frames": len(strong_frames)}
+    return frames, timings
+
+
+def tradeoff(frames, timings, bands=DEFAULT_BANDS, threshold=0.5):
+    """
+    Acurácia x custo de cada faixa, mais as referências "só o barato" e (se o
+    modelo forte rodou em todos os frames) "só o forte". O custo relativo
+    (compute) é o tempo estimado dividido pelo do modelo forte em todos os frames.
+    """
+    n = len(frames)
+    strong_per_frame = timings["strong_seconds"] / max(timings["strong_frames"], 1)
+    strong_full = strong_per_frame * n
+
+    def row(name, low, high, score, escalated, seconds):
+        metrics = frame_metrics(frames.assign(model=name, score=score), threshold=threshold).iloc[0]
+        return {"band": name, "low": low, "high": high, "frames": n, "escalated": int(escalated),
+                "escalated_frac": escalated / n if n else np.nan,
+                "accuracy": metrics["accuracy"], "auc": metrics["auc"], "eer": metrics["eer"],
+                "seconds": seconds, "compute": seconds / strong_full if strong_full else np.nan}
+
+    rows = [row("barato", np.nan, np.nan, frames["cheap_score"], 0, timings["cheap_seconds"])]
+    for low, high in bands:
+        escalate = frames["cheap_score"].between(low, high) & frames["strong_score"].notna()
+        score = frames["strong_score"].where(escalate, frames["cheap_score"])
+        seconds = timings["cheap_seconds"] + escalate.sum() * strong_per_frame
+        rows.append(row(f"[{low:g}, {high:g}]", low, high, score, escalate.sum(), seconds))
+    if frames["strong_score"].notna().all():
+        rows.append(row("forte", np.nan, np.nan, frames["strong_score"], n, strong_full))
+    return pd.DataFrame(rows)
+
+
+def _frame_key(path):
+    meta = parse_frame_path(path)
+    return tuple(meta[k] for k in FRAME_KEYS)
@@ -0,0 +1,164 @@
+"""
+Busca adaptativa do ponto de quebra de cada modelo sob compressão JPEG.
+
+Em vez da grade fixa [60, 30, 10], a qualidade em que a métrica (acurácia ou
+AUC) cai abaixo do limiar é encontrada por bisseção em 1-100, com os frames
+comprimidos em memória (pipeline/degrade.py) e uma amostra dos frames de hq:
+
+- Cada qualidade é avaliada em uma amostra pequena; o intervalo de confiança
+  (bootstrap, pipeline/metrics.py) decide se o modelo está acima ou abaixo do
+  limiar. Se o intervalo ainda cruza o limiar, a amostra cresce (dobrando) até
+  `max_frames`; só então vale a estimativa pontual (marcada como incerta).
+- A busca para quando o intervalo [quebrado, ok] tem largura <= `tolerance`.
+
+A amostra é aninhada (cada tamanho é um prefixo da mesma ordem, equilibrada
+entre classes e vídeos), então crescer a amostra só avalia os frames novos.
+Supõe que a métrica não melhora quando a qualidade cai.
+"""
+import random
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from pipeline.cascade import FRAME_KEYS, score_frames, _frame_key
+from pipeline.inference import DEFAULT_BATCH_SIZE
+from pipeline.loader import parse_frame_path
+from pipeline.metrics import bootstrap_ci, frame_metrics
+
+METRICS = ["auc", "accuracy"]
+DEFAULT_THRESHOLD = 0.7
+MIN_QUALITY, MAX_QUALITY = 1, 100
+
+
+def sample_order(image_paths, seed=42):
+    """
+    Ordena os frames para amostragem aninhada: classes alternadas e, dentro de
+    cada classe, um frame de cada vídeo por vez (vídeos e frames embaralhados).
+    Qualquer prefixo da lista é uma amostra equilibrada.
+    """
+    rng = random.Random(seed)
+    by_label = defaultdict(lambda: defaultdict(list))
+    for path in sorted(image_paths):
+        meta = parse_frame_path(path)
+        by_label[meta["label_str"]][meta["video"]].append(path)
+
+    queues = []
+    for label in sorted(by_label):
+        videos = [by_label[label][v] for v in sorted(by_label[label])]
+        rng.shuffle(videos)
+        for frames in videos:
+            rng.shuffle(frames)
+        # Round-robin entre os vídeos da classe
+        order = [frames[i] for i in range(max(map(len, videos))) for frames in videos if i < len(frames)]
+        queues.append(order)
+    return [path for group in zip(*queues) for path in group] + \
+           [path for queue in queues for path in queue[min(map(len, queues)):]]
+
+
+class CrashSearch:
+    """Bisseção da qualidade de quebra de um modelo, reaproveitando os scores já calculados."""
+
+    def __init__(self, m_info, engine, ordered_paths, metric="auc", threshold=DEFAULT_THRESHOLD, min_frames=64,
+                 max_frames=1024, tolerance=2, alpha=0.05, n_boot=500, image_root="frames", encoded_cache=None,
+                 batch_size=DEFAULT_BATCH_SIZE, seed=42):
+        self.m_info = m_info
+        self.engine = engine
+        self.paths = ordered_paths
+        self.metric = metric
+        self.threshold = threshold
+        self.min_frames = min(min_frames, len(ordered_paths))
+        self.max_frames = min(max_frames, len(ordered_paths))
+        self.tolerance = tolerance
+        self.alpha = alpha
+        self.n_boot = n_boot
+        self.image_root = image_root
+        self.encoded_cache = encoded_cache
+        self.batch_size = batch_size
+        self.seed = seed
+        self.scores = {}  # qualidade -> DataFrame com os frames já avaliados (na ordem da amostra)
+        # qualidade -> quantos caminhos da amostra já foram avaliados; frames ilegíveis não viram linha,
+        # então esse número pode ser maior que o de linhas em self.scores
+        self.consumed = {}
+        self._position = {_frame_key(path): i for i, path in enumerate(ordered_paths)}
+        self.steps = []
+        self.frames_scored = 0
+
+    def _scores(self, quality, n):
+        """Scores dos frames entre os n primeiros caminhos da amostra (sem os que não puderam ser lidos)."""
+        have = self.consumed.get(quality, 0)
+        if have < n:
+            new, _ = score_frames(self.m_info, self.engine, self.paths[have:n], f"q{quality}", self.image_root,
+                                  use_cache=False, quality=quality, encoded_cache=self.encoded_cache,
+                                  batch_size=self.batch_size)
+            new["position"] = [self._position[key] for key in new[FRAME_KEYS].itertuples(index=False, name=None)]
+            self.frames_scored += len(new)
+            known = self.scores.get(quality)
+            self.scores[quality] = new if known is None else pd.concat([known, new], ignore_index=True)
+            self.consumed[quality] = n
+        known = self.scores[quality]
+        return known[known["position"] < n]
+
+    def _measure(self, df):
+        """(métrica, limite inferior, limite superior); NaN quando não dá para calcular (ex.: uma classe só)."""
+        if df.empty:
+            return np.nan, np.nan, np.nan
+        value = frame_metrics(df).iloc[0][self.metric]
+        ci = bootstrap_ci(df, n_boot=self.n_boot, alpha=self.alpha, seed=self.seed).iloc[0]
+        return value, ci[f"{self.metric}_lo"], ci[f"{self.metric}_hi"]
+
+    def evaluate(self, quality):
+        """
+        Avalia uma qualidade, crescendo a amostra até o intervalo de confiança
+        não cruzar o limiar. Métrica ou intervalo indefinidos (NaN) contam como
+        indecisos; se a métrica continua indefinida com `max_frames`, levanta
+        ValueError. Devolve o passo registrado (dicionário).
+        """
+        n = self.min_frames
+        while True:
+            df = self._scores(quality, n).assign(model=self.m_info['name'])
+            value, lo, hi = self._measure(df)
+            # Comparações com NaN dão False: intervalo indefinido nunca decide
+            decided = lo >= self.threshold or hi < self.threshold
+            if decided or n >= self.max_frames:
+                break
+            n = min(2 * n, self.max_frames)
+
+        if not decided and np.isnan(value):
+            raise ValueError(f"{self.m_info['name']} em q{quality}: {self.metric} indefinida com {len(df)} frames "
+                             f"(amostra com uma classe só?)")
+        ok = lo >= self.threshold if decided else value >= self.threshold
+        step = {"model": self.m_info['name'], "quality": quality, "frames": len(df), self.metric: value,
+                "ci_lo": lo, "ci_hi": hi, "ok": bool(ok), "certain": bool(decided)}
+        self.steps.append(step)
+        return step
+
+    def run(self):
+        """
+        Bisseção em [MIN_QUALITY, MAX_QUALITY]. Devolve o resumo: a maior
+        qualidade em que o modelo está quebrado (crash_quality) e a menor em
+        que ainda está ok (ok_quality); None quando não há quebra no intervalo.
+        """
+        top, bottom = self.evaluate(MAX_QUALITY), self.evaluate(MIN_QUALITY)
+        if not top["ok"]:
+            crash, ok = MAX_QUALITY, None  # Abaixo do limiar já sem compressão
+        elif bottom["ok"]:
+            crash, ok = None, MIN_QUALITY  # Não quebra nem na qualidade mínima
+        else:
+            crash, ok = MIN_QUALITY, MAX_QUALITY
+            while ok - crash > self.tolerance:
+                mid = (crash + ok) // 2
+                if self.evaluate(mid)["ok"]:
+                    ok = mid
+                else:
+                    crash = mid
+
+        return {"model": self.m_info['name'], "metric": self.metric, "threshold": self.threshold,
+                "crash_quality": crash, "ok_quality": ok, "evaluations": len(self.steps),
+                "uncertain_steps": sum(not s["certain"] for s in self.steps),
+                "frames_scored": self.frames_scored}
+
+
+def grid_cost(n_frames, qualities=range(MIN_QUALITY, MAX_QUALITY + 1)):
+    """Frames avaliados por uma grade densa (todas as qualidades, todos os frames)."""
+    return n_frames * len(list(qualities))
@@ -0,0 +1,102 @@
+"""
+tf.data a partir de listas de caminhos (ex.: os frames de um split do manifesto).
+
+Pipeline de entrada do treino e da validação: leitura e decodificação em
+paralelo, cache das imagens já decodificadas, embaralhamento, lotes,
+aumento de dados vetorizado (camadas do Keras aplicadas ao lote inteiro) e
+prefetch, para a CPU preparar o próximo lote enquanto o modelo roda.
+"""
+import time
+
+import tensorflow as tf
+
+from pipeline.loader import parse_frame_path
+
+ROTATION_DEGREES = 10
+SHUFFLE_BUFFER = 2048  # Lotes embaralhados de novo a cada época, depois do cache
+
+
+def paths_and_labels(image_paths):
+    """Rótulo de cada frame pelo caminho da pasta: 1 = videos_fake, 0 = videos_real."""
+    return list(image_paths), [float(parse_frame_path(p)["label"]) for p in image_paths]
+
+
+def decode_image(path, image_size):
+    """Lê o JPEG como RGB float32 (0-255) no tamanho pedido, como o image_dataset_from_directory."""
+    img = tf.io.decode_jpeg(tf.io.read_file(path), channels=3)
+    img = tf.image.resize(img, (image_size, image_size))
+    return img
+
+
+def augmentation(rotation_degrees=ROTATION_DEGREES, horizontal_flip=True, seed=None):
+    """
+    Rotação de até `rotation_degrees` graus e espelhamento horizontal, como o
+    ImageDataGenerator(rotation_range=10, horizontal_flip=True) dos scripts 05-07,
+    mas aplicados ao lote inteiro de uma vez.
+    """
+    layers = [tf.keras.layers.RandomRotation(rotation_degrees / 360, fill_mode="nearest", seed=seed)]
+    if horizontal_flip:
+        layers.append(tf.keras.layers.RandomFlip("horizontal", seed=seed))
+    return tf.keras.Sequential(layers)
+
+
+def make_dataset(image_paths, image_size, batch_size=32, shuffle=False, seed=42, cache=False, augment=None,
+                 preprocess=None):
+    """
+    Dataset de (imagem, rótulo) em lotes; rótulos no formato binário (N, 1).
+
+    cache      -> False, True (memória) ou um caminho de arquivo (tf.data cache em disco).
+                  As imagens ficam no cache como uint8, já decodificadas e redimensionadas,
+                  e a partir da 2ª época nenhum JPEG é lido de novo.
+    augment    -> camada/modelo Keras aplicado a cada lote em modo de treino (ex.: augmentation()).
+    preprocess -> função aplicada a cada lote depois do aumento (ex.: preprocess_input do modelo).
+    """
+    paths, labels = paths_and_labels(image_paths)
+    ds = tf.data.Dataset.from_tensor_slices((paths, labels))
+    if shuffle:
+        # Embaralha os caminhos (barato) antes de decodificar; depois do cache, o
+        # buffer menor troca a ordem a cada época sem guardar outra cópia das imagens
+        ds = ds.shuffle(len(paths), seed=seed, reshuffle_each_iteration=not cache)
+
+    if cache:
+        ds = ds.map(lambda p, y: (tf.cast(tf.round(decode_image(p, image_size)), tf.uint8), tf.expand_dims(y, -1)),
+                    num_parallel_calls=tf.data.AUTOTUNE)
+        ds = ds.cache(cache if isinstance(cache, str) else "")
+        if shuffle:
+            ds = ds.shuffle(min(len(paths), SHUFFLE_BUFFER), seed=seed, reshuffle_each_iteration=True)
+        ds = ds.map(lambda x, y: (tf.cast(x, tf.float32), y), num_parallel_calls=tf.data.AUTOTUNE)
+    else:
+        ds = ds.map(lambda p, y: (decode_image(p, image_size), tf.expand_dims(y, -1)),
+                    num_parallel_calls=tf.data.AUTOTUNE)
+
+    ds = ds.batch(batch_size)
+    if augment is not None:
+        ds = ds.map(lambda x, y: (augment(x, training=True), y), num_parallel_calls=tf.data.AUTOTUNE)
+    if preprocess is not None:
+        ds = ds.map(lambda x, y: (preprocess(x), y), num_parallel_calls=tf.data.AUTOTUNE)
+    return ds.prefetch(tf.data.AUTOTUNE)
+
+
+def use_mixed_precision(policy="mixed_float16"):
+    """
+    Ativa a precisão mista global do Keras (ex.: "mixed_float16" em GPU,
+    "mixed_bfloat16" em CPUs com suporte a bf16). Deve ser chamada antes de
+    criar o modelo; a última camada deve ter dtype='float32'.
+    """
+    tf.keras.mixed_precision.set_global_policy(policy)
+    print(f"Precisão mista: {policy}")
+
+
+def throughput(batches, n_batches=None):
+    """
+    Imagens por segundo de um iterável de lotes (x, y): tf.data ou o gerador do Keras.
+    Retorna (imagens, segundos, imagens/segundo).
+    """
+    images = 0
+    start = time.perf_counter()
+    for i, (x, _) in enumerate(batches):
+        images += len(x)
+        if n_batches is not None and i + 1 >= n_batches:
+            break
+    elapsed = time.perf_counter() - start
+    return images, elapsed, images / elapsed
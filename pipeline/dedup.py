@@ -0,0 +1,167 @@
+"""
+Deduplicação de frames quase idênticos antes da inferência.
+
+Com 1 frame a cada 15, vídeos de "cabeça falante" parada geram vários rostos
+praticamente iguais. Cada rosto de frames/hq recebe um hash perceptual
+(dHash ou pHash, 64 bits); dentro de cada vídeo, os frames (em ordem) entram
+no grupo do primeiro representante a até `threshold` bits de distância de
+Hamming, ou abrem um grupo novo. Só o representante de cada grupo é avaliado
+e o seu score é copiado para os outros membros, então o CSV de resultados
+continua com todas as linhas.
+
+Os grupos são calculados em hq e valem para todos os cenários (o frame N de
+q30 pertence ao mesmo grupo que o frame N de hq). Ficam em um manifesto
+(frames/dedup_groups.csv) que vale enquanto os JPEGs de hq não mudarem.
+"""
+import os
+import re
+
+import cv2
+import numpy as np
+import pandas as pd
+
+from pipeline.frame_cache import _file_stats
+from pipeline.loader import find_images, parse_frame_path, read_image
+
+DEDUP_MANIFEST = "frames/dedup_groups.csv"
+DEFAULT_THRESHOLD = 4  # bits diferentes (de 64) para dois rostos contarem como o mesmo
+METHODS = ["dhash", "phash"]
+GROUP_COLUMNS = ["label_str", "video", "frame", "group", "distance", "hash", "path", "mtime", "bytes"]
+FRAME_NUMBER = re.compile(r"(\d+)")
+
+
+def dhash(img, hash_size=8):
+    """Hash de diferença: cada bit diz se um pixel é mais claro que o vizinho da direita."""
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    return _pack(small[:, 1:] > small[:, :-1])
+
+
+def phash(img, hash_size=8, highfreq_factor=4):
+    """Hash perceptual: sinal das frequências baixas da DCT em relação à mediana."""
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    size = hash_size * highfreq_factor
+    small = cv2.resize(gray, (size, size), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:hash_size, :hash_size]
+    return _pack(low > np.median(low[1:].ravel() if hash_size > 1 else low))
+
+
+def _pack(bits):
+    return int("".join("1" if b else "0" for b in bits.ravel()), 2)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def _frame_order(frame):
+    match = FRAME_NUMBER.search(frame)
+    return int(match.group(1)) if match else 0
+
+
+def build_groups(hq_root="frames/hq", threshold=DEFAULT_THRESHOLD, method="dhash"):
+    """
+    Agrupa os rostos quase idênticos de cada vídeo de hq_root. Devolve um
+    DataFrame com uma linha por frame: o grupo é o nome do frame representante.
+    """
+    hash_fn = {"dhash": dhash, "phash": phash}[method]
+    rows = []
+    for path in find_images(hq_root):
+        img = read_image(path)
+        if img is None:
+            print(f"Erro ao processar imagem {path}: imagem não pôde ser lida")
+            continue
+        rows.append({**parse_frame_path(path), "hash": hash_fn(img), "path": path})
+    if not rows:
+        return pd.DataFrame(columns=GROUP_COLUMNS)
+
+    frames = pd.DataFrame(rows)
+    frames["order"] = frames["frame"].map(_frame_order)
+    frames = frames.sort_values(["label_str", "video", "order"]).reset_index(drop=True)
+    groups, distances = [], []
+    for _, video in frames.groupby(["label_str", "video"], sort=False):
+        reps = []  # (hash, frame) dos representantes do vídeo
+        for h, frame in zip(video["hash"], video["frame"]):
+            best = min(((hamming(h, rh), rf) for rh, rf in reps), default=None)
+            if best is not None and best[0] <= threshold:
+                groups.append(best[1])
+                distances.append(best[0])
+            else:
+                reps.append((h, frame))
+                groups.append(frame)
+                distances.append(0)
+    frames["group"] = groups
+    frames["distance"] = distances
+    frames["mtime"], frames["bytes"] = _file_stats(frames["path"].tolist())
+    # Hash em hexadecimal: 64 bits não cabem num inteiro com sinal do CSV
+    frames["hash"] = frames["hash"].map(lambda h: f"{h:016x}")
+    return frames[GROUP_COLUMNS]
+
+
+def save_groups(groups, path=DEDUP_MANIFEST, threshold=DEFAULT_THRESHOLD, method="dhash"):
+    groups.assign(threshold=threshold, method=method).to_csv(path, index=False)
+
+
+def load_groups(hq_root="frames/hq", threshold=DEFAULT_THRESHOLD, method="dhash", path=DEDUP_MANIFEST):
+    """
+    Grupos do manifesto, se ele foi gerado com o mesmo limiar e método e os
+    JPEGs de hq não mudaram; senão recalcula e grava o manifesto.
+    """
+    if os.path.exists(path):
+        groups = pd.read_csv(path, dtype={"hash": str, "label_str": str, "video": str, "frame": str, "group": str})
+        image_paths = sorted(find_images(hq_root))
+        same_config = (not groups.empty and (groups["threshold"] == threshold).all()
+                       and (groups["method"] == method).all())
+        if same_config and sorted(groups["path"]) == image_paths:
+            groups = groups.sort_values("path")
+            try:
+                mtimes, sizes = _file_stats(groups["path"].tolist())
+            except OSError:
+                mtimes, sizes = None, None
+            if groups["mtime"].tolist() == mtimes and groups["bytes"].tolist() == sizes:
+                return groups[GROUP_COLUMNS].reset_index(drop=True)
+
+    groups = build_groups(hq_root, threshold, method)
+    save_groups(groups, path, threshold, method)
+    return groups
+
+
+def representatives(image_paths, groups):
+    """
+    Separa os caminhos de um cenário em representantes (avaliados) e membros.
+    Devolve (caminhos dos representantes, {(label_str, vídeo, frame representante):
+    [frames membros]}). Frames sem grupo (ex.: que não existem em hq) são avaliados.
+    """
+    group_of = {(r.label_str, r.video, r.frame): r.group for r in groups.itertuples(index=False)}
+    by_dir = {}
+    for path in image_paths:
+        by_dir.setdefault(os.path.dirname(path), []).append(path)
+
+    reps, members = [], {}
+    for folder, paths in by_dir.items():
+        present = {os.path.basename(p) for p in paths}
+        for path in paths:
+            meta = parse_frame_path(path)
+            group = group_of.get((meta["label_str"], meta["video"], meta["frame"]), meta["frame"])
+            # Representante ausente neste cenário: o próprio frame é avaliado
+            if group == meta["frame"] or group not in present:
+                reps.append(path)
+            else:
+                members.setdefault((meta["label_str"], meta["video"], group), []).append(meta["frame"])
+    return reps, members
+
+
+def broadcast(df, groups, keys=("model", "scenario")):
+    """
+    Simula a deduplicação sobre scores já calculados para todos os frames: cada
+    membro recebe o score do seu representante. Serve para medir o efeito na
+    AUC sem rodar a inferência de novo.
+    """
+    group_of = groups[["label_str", "video", "frame", "group"]]
+    out = df.merge(group_of, on=["label_str", "video", "frame"], how="left")
+    out["group"] = out["group"].fillna(out["frame"])
+    rep_scores = df[list(keys) + ["label_str", "video", "frame", "score"]].rename(
+        columns={"frame": "group", "score": "rep_score"})
+    out = out.merge(rep_scores, on=list(keys) + ["label_str", "video", "group"], how="left")
+    out["score"] = out["rep_score"].fillna(out["score"])
+    return out.drop(columns=["group", "rep_score"])
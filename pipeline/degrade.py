@@ -0,0 +1,125 @@
+"""
+Compressão JPEG em memória (cv2.imencode + cv2.imdecode), sem gravar as
+árvores frames/q60, q30, q10 no disco.
+
+Um cenário "qN" pode ser gerado na hora a partir de frames/hq, com qualquer
+qualidade N (1-100). Os bytes já comprimidos podem ficar num cache LRU, para
+não recomprimir a mesma imagem quando ela é lida mais de uma vez (ex.: um
+modelo de 299px e outro de 224px no mesmo cenário).
+"""
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from pipeline import profiling
+from pipeline.loader import read_image
+
+SCENARIO_PATTERN = re.compile(r"^q(\d{1,3})$")
+
+
+def parse_quality(scenario):
+    """'q30' -> 30; devolve None para cenários que não são de compressão (ex.: 'hq')."""
+    match = SCENARIO_PATTERN.match(scenario)
+    if match and 1 <= int(match.group(1)) <= 100:
+        return int(match.group(1))
+    return None
+
+
+def encode_jpeg(img, quality):
+    ok, encoded = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError(f"falha ao comprimir com qualidade {quality}")
+    return encoded
+
+
+def jpeg_degrade(img, quality):
+    """Aplica a mesma compressão que o cv2.imwrite(..., [IMWRITE_JPEG_QUALITY, q]) do script 02."""
+    return cv2.imdecode(encode_jpeg(img, quality), cv2.IMREAD_COLOR)
+
+
+class EncodedCache:
+    """Cache LRU (seguro entre threads) dos bytes JPEG comprimidos, limitado em megabytes."""
+
+    def __init__(self, max_mb=512):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            encoded = self._items.get(key)
+            if encoded is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return encoded
+
+    def put(self, key, encoded):
+        with self._lock:
+            if key in self._items or encoded.nbytes > self.max_bytes:
+                return
+            self._items[key] = encoded
+            self.current_bytes += encoded.nbytes
+            while self.current_bytes > self.max_bytes:
+                _, old = self._items.popitem(last=False)
+                self.current_bytes -= old.nbytes
+
+
+def load_degraded(img_path, size, quality, prep=None, cache=None):
+    """
+    Lê a imagem HQ, comprime em memória na qualidade pedida, descomprime,
+    redimensiona e aplica o pré-processamento (mesmo formato de loader.load_image).
+    """
+    key = (img_path, quality)
+    encoded = cache.get(key) if cache is not None else None
+    if encoded is None:
+        img = read_image(img_path)
+        if img is None:
+            raise ValueError("imagem não pôde ser lida")
+        with profiling.stage("jpeg_encode"):
+            encoded = encode_jpeg(img, quality)
+        if cache is not None:
+            cache.put(key, encoded)
+
+    with profiling.stage("decode"):
+        img = cv2.imdecode(encoded, cv2.IMREAD_COLOR)
+    with profiling.stage("resize"):
+        img = cv2.resize(img, (size, size)).astype(np.float32)
+    if prep is not None:
+        with profiling.stage("preprocess"):
+            img = prep(img)
+    return img
+
+
+def is_virtual(scenario, image_root="frames"):
+    """Um cenário 'qN' sem pasta própria em image_root é gerado em memória a partir de 'hq'."""
+    return parse_quality(scenario) is not None and not os.path.isdir(os.path.join(image_root, scenario))
+
+
+def write_levels(hq_path, outputs):
+    """
+    Lê a imagem HQ uma única vez e grava uma cópia comprimida para cada
+    (qualidade, caminho de saída) em `outputs`. Retorna a lista de
+    (qualidade, caminho, bytes gravados).
+    """
+    img = read_image(hq_path)
+    if img is None:
+        raise ValueError(f"imagem não pôde ser lida: {hq_path}")
+
+    written = []
+    for quality, out_path in outputs:
+        with profiling.stage("jpeg_encode"):
+            encoded = encode_jpeg(img, quality)
+        with profiling.stage("write"), open(out_path, "wb") as f:
+            f.write(encoded.tobytes())
+        written.append((quality, out_path, encoded.nbytes))
+    profiling.count("images_written", len(written))
+    return written
@@ -0,0 +1,131 @@
+"""
+Avaliação por vídeo com parada antecipada (early exit).
+
+Os frames de cada vídeo entram em ordem, alguns por vez; a média dos scores
+e a sua incerteza (intervalo de confiança da média) são atualizadas a cada
+passo. Quando o intervalo fica inteiro de um lado do limiar (real ou fake),
+o veredito está decidido e o resto do vídeo não é lido nem avaliado.
+
+Para aproveitar os lotes, vários vídeos são avaliados ao mesmo tempo: cada
+rodada junta os próximos `step` frames de todos os vídeos ativos num lote só.
+"""
+import math
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pipeline.loader import parse_frame_path, DEFAULT_WORKERS
+
+FRAME_NUMBER = re.compile(r"(\d+)")
+
+
+def frame_number(frame_name):
+    match = FRAME_NUMBER.search(frame_name)
+    return int(match.group(1)) if match else 0
+
+
+def group_by_video(image_paths):
+    """Agrupa os caminhos por vídeo, com os frames na ordem do vídeo."""
+    videos = defaultdict(list)
+    for path in image_paths:
+        meta = parse_frame_path(path)
+        videos[(meta["label_str"], meta["video"])].append(path)
+    return [(key, sorted(paths, key=lambda p: frame_number(parse_frame_path(p)["frame"])))
+            for key, paths in sorted(videos.items())]
+
+
+class RunningScore:
+    """Média e desvio padrão acumulados (algoritmo de Welford) dos scores de um vídeo."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, scores):
+        for s in scores:
+            self.n += 1
+            delta = s - self.mean
+            self.mean += delta / self.n
+            self._m2 += delta * (s - self.mean)
+
+    @property
+    def std(self):
+        return math.sqrt(self._m2 / (self.n - 1)) if self.n > 1 else float("inf")
+
+    def is_decided(self, threshold=0.5, z=1.96, min_frames=4):
+        """O intervalo mean ± z * std / sqrt(n) está inteiro de um lado do limiar?"""
+        if self.n < min_frames:
+            return False
+        half_width = z * self.std / math.sqrt(self.n)
+        return self.mean - half_width > threshold or self.mean + half_width < threshold
+
+
+def score_videos(videos, engine, load_fn, step=4, min_frames=4, max_frames=None, threshold=0.5, z=1.96,
+                 max_active=16, workers=DEFAULT_WORKERS, full=False):
+    """
+    Avalia cada vídeo (lista de (chave, caminhos) de group_by_video) e gera
+    um dicionário por vídeo com o score médio, o veredito e quantos frames
+    foram usados. Com full=True, todos os frames são avaliados (referência).
+    """
+    pending = iter(videos)
+    active = []  # [chave, caminhos, próximo índice, RunningScore]
+
+    def admit():
+        while len(active) < max_active:
+            try:
+                key, paths = next(pending)
+            except StopIteration:
+                return
+            active.append([key, paths, 0, RunningScore()])
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        admit()
+        while active:
+            # Próximos `step` frames de cada vídeo ativo, todos num lote só
+            owners, chunk_paths = [], []
+            for i, (key, paths, pos, _) in enumerate(active):
+                limit = len(paths) if max_frames is None else min(len(paths), max_frames)
+                take = paths[pos:min(pos + step, limit)]
+                owners.extend([i] * len(take))
+                chunk_paths.extend(take)
+                active[i][2] = pos + len(take)
+
+            images = list(pool.map(_safe_load, [load_fn] * len(chunk_paths), chunk_paths))
+            ok = [img is not None for img in images]
+            if any(ok):
+                batch = np.stack([img for img in images if img is not None])
+                scores = engine.predict_batch(batch)
+                per_video = defaultdict(list)
+                for owner, score in zip([o for o, good in zip(owners, ok) if good], scores):
+                    per_video[owner].append(float(score))
+                for owner, video_scores in per_video.items():
+                    active[owner][3].update(video_scores)
+
+            still_active = []
+            for key, paths, pos, running in active:
+                limit = len(paths) if max_frames is None else min(len(paths), max_frames)
+                decided = not full and running.is_decided(threshold, z, min_frames)
+                if decided or pos >= limit:
+                    label_str, video = key
+                    yield {
+                        "label_str": label_str, "video": video,
+                        "label": 1 if label_str == "videos_fake" else 0,
+                        "score": running.mean if running.n else np.nan,
+                        "frames_used": running.n, "frames_total": len(paths),
+                        "early_exit": decided and pos < len(paths),
+                    }
+                else:
+                    still_active.append([key, paths, pos, running])
+            active[:] = still_active
+            admit()
+
+
+def _safe_load(load_fn, path):
+    try:
+        return load_fn(path)
+    except Exception as e:
+        print(f"Erro ao processar imagem {path}: {e}")
+        return None
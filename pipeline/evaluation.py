@@ -0,0 +1,217 @@
+"""
+Avaliação de N modelos x M cenários de compressão em um único processo.
+
+Os modelos com o mesmo tamanho de entrada compartilham a mesma leitura das
+imagens: cada frame de frames/<cenário> é decodificado e redimensionado uma
+única vez por tamanho, e cada modelo aplica apenas o seu pré-processamento.
+"""
+import os
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from pipeline import backends, dedup, frame_cache, degrade, profiling, split as splits
+from pipeline.inference import batched, DEFAULT_BATCH_SIZE
+from pipeline.loader import find_images, parse_frame_path, stream_frames
+from pipeline.results import row_key
+from pipeline.score_cache import image_hash, prep_key
+
+RESULT_COLUMNS = ["model", "scenario", "video", "frame", "label", "label_str", "score"]
+
+
+def load_engines(model_infos, backend="keras", batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Carrega os modelos do registro no backend pedido (pipeline/backends.py),
+    pulando (com aviso) os que não existirem.
+    """
+    loaded = []
+    for m_info in model_infos:
+        print(f"\n>>> Carregando Modelo: {m_info['name']}")
+        try:
+            engine = backends.make_engine(m_info, backend, batch_size=batch_size)
+        except Exception as e:
+            print(f"Erro: {e}")
+            continue
+        loaded.append((m_info, engine))
+    return loaded
+
+
+def frame_source(image_paths, scenario, size, image_root="frames", use_cache=True, quality=None, encoded_cache=None):
+    """
+    Frames de um cenário no tamanho pedido, sem pré-processamento: do cache
+    decodificado (pipeline/frame_cache.py) se ele estiver válido, senão dos JPEGs.
+    Com `quality`, os JPEGs (de hq) são comprimidos em memória nessa qualidade.
+    """
+    if quality is not None:
+        return stream_frames(image_paths, size, extra_meta={"scenario": scenario}, quality=quality, cache=encoded_cache)
+    if use_cache and frame_cache.is_valid(scenario, size, image_root):
+        return frame_cache.stream_cached(scenario, size, extra_meta={"scenario": scenario})
+    return stream_frames(image_paths, size, extra_meta={"scenario": scenario})
+
+
+def scenario_images(scenario, image_root="frames", degrade_in_memory=False, split=None,
+                    split_manifest=splits.SPLIT_MANIFEST):
+    """
+    Caminhos dos frames de um cenário e a qualidade JPEG a aplicar em memória
+    (None = ler a pasta do cenário como está; senão os caminhos são os de hq).
+    """
+    quality = None
+    if degrade_in_memory or degrade.is_virtual(scenario, image_root):
+        quality = degrade.parse_quality(scenario)
+    source = "hq" if quality is not None else scenario
+    if split is not None:
+        return splits.split_images(source, split, image_root, split_manifest), quality
+    return find_images(os.path.join(image_root, source)), quality
+
+
+def evaluate(model_infos, scenarios, image_root="frames", batch_size=DEFAULT_BATCH_SIZE, use_cache=True,
+             degrade_in_memory=False, encoded_cache_mb=512, split=None, split_manifest=splits.SPLIT_MANIFEST,
+             writer=None, backend="keras", score_cache=None, dedup_groups=None):
+    """
+    Avalia cada modelo em cada cenário e devolve um DataFrame com uma linha
+    por (modelo, frame), ordenado por modelo e depois por cenário.
+
+    Cenários "qN" sem pasta própria (ou todos, com degrade_in_memory=True)
+    são gerados em memória a partir de image_root/hq.
+    Com `split` ('train' ou 'test'), só entram os vídeos desse lado do manifesto
+    gerado pelo scripts/09_split_data.py.
+    Com `writer` (pipeline.results.ResultsWriter), os scores vão para o disco
+    aos poucos e os frames que já têm score gravado são pulados. Cada célula
+    (modelo, cenário) concluída fica registrada; numa nova execução ela é
+    pulada, e modelos sem nenhuma célula pendente nem chegam a ser carregados.
+    Com `backend` diferente de "keras", os modelos exportados por
+    scripts/16_export_models.py são usados e o nome ganha o sufixo "[backend]".
+    Com `score_cache` (pipeline.score_cache.ScoreCache), os frames cujo conteúdo
+    já foi avaliado pelo mesmo modelo (mesmos pesos e pré-processamento) não
+    passam de novo pela inferência.
+    Com `dedup_groups` (pipeline.dedup.load_groups), só o representante de cada
+    grupo de frames quase idênticos é avaliado; os membros recebem o seu score.
+    """
+    model_infos = backends.with_backend(model_infos, backend)
+    completed = writer.completed_cells() if writer is not None else set()
+    pending_models = []
+    for m_info in model_infos:
+        if all((m_info['name'], scenario) in completed for scenario in scenarios):
+            print(f"\n>>> {m_info['name']}: todos os cenários já foram avaliados. Pulando.")
+        else:
+            pending_models.append(m_info)
+
+    loaded = load_engines(pending_models, backend, batch_size)
+    cache_keys = {}
+    if score_cache is not None:
+        for m_info, _ in loaded:
+            weights = m_info['path'] if backend == "keras" else backends.exported_path(m_info, backend)
+            cache_keys[m_info['name']] = (score_cache.model_fingerprint(weights), prep_key(m_info, backend))
+    model_names = [m_info['name'] for m_info in model_infos]
+
+    # Agrupa os modelos pelo tamanho de entrada
+    by_size = defaultdict(list)
+    for m_info, engine in loaded:
+        by_size[m_info['size']].append((m_info, engine))
+
+    rows = []
+    sink = writer.append if writer is not None else rows.extend
+    done = writer.done_keys() if writer is not None else set()
+    if done:
+        print(f"Retomando: {len(done)} scores já gravados serão pulados.")
+
+    encoded_cache = degrade.EncodedCache(max_mb=encoded_cache_mb)
+    for scenario in scenarios:
+        image_paths, quality = scenario_images(scenario, image_root, degrade_in_memory, split, split_manifest)
+        source = "hq" if quality is not None else scenario
+        if not image_paths:
+            print(f"Aviso: Nenhuma imagem encontrada em {scenario}")
+            continue
+        n_frames = len(image_paths)
+        members = {}
+        if dedup_groups is not None:
+            image_paths, members = dedup.representatives(image_paths, dedup_groups)
+            print(f"   Dedup {scenario}: {len(image_paths)} de {n_frames} frames avaliados "
+                  f"({1 - len(image_paths) / n_frames:.1%} da inferência economizada)")
+            profiling.count("dedup_frames", n_frames)
+            profiling.count("dedup_scored", len(image_paths))
+
+        for size, group in by_size.items():
+            engines = [(m_info, engine) for m_info, engine in group if (m_info['name'], scenario) not in completed]
+            if not engines:
+                continue
+
+            # Só os frames que ainda faltam para algum modelo do grupo
+            pending = [p for p in image_paths
+                       if any(row_key(m_info['name'], {**parse_frame_path(p), "scenario": scenario}) not in done
+                              for m_info, _ in engines)]
+            if not pending:
+                mark_completed(writer, engines, scenario, n_frames)
+                continue
+
+            names = ", ".join(m_info['name'] for m_info, _ in engines)
+            origin = f", comprimido em memória a partir de {source}" if quality is not None else ""
+            print(f"   Processando {scenario} ({size}px: {names}{origin}): {len(pending)} imagens")
+
+            # O cache decodificado guarda o cenário inteiro: só vale quando todos os frames serão lidos
+            group_cache = use_cache and split is None and len(pending) == n_frames
+
+            # Sem pré-processamento aqui: cada modelo aplica o seu no lote
+            frames = frame_source(pending, scenario, size, image_root, group_cache, quality, encoded_cache)
+            frames = tqdm(frames, total=len(pending), desc=f"      {scenario}", leave=False)
+            for metas, batch in batched(frames, batch_size):
+                hashes = [image_hash(img) for img in batch] if score_cache is not None else None
+                for m_info, engine in engines:
+                    todo = np.array([row_key(m_info['name'], meta) not in done for meta in metas])
+                    if not todo.any():
+                        continue
+                    if score_cache is None:
+                        scores = _score(m_info, engine, batch[todo])
+                    else:
+                        keys = [h for h, keep in zip(hashes, todo) if keep]
+                        known = score_cache.lookup(keys, *cache_keys[m_info['name']])
+                        miss = np.array([k not in known for k in keys])
+                        scores = np.array([known.get(k, np.nan) for k in keys])
+                        if miss.any():
+                            scores[miss] = _score(m_info, engine, batch[todo][miss])
+                            score_cache.store([k for k, m in zip(keys, miss) if m], *cache_keys[m_info['name']], scores[miss])
+                    todo_metas = [meta for meta, keep in zip(metas, todo) if keep]
+                    new_rows = [{**meta, "model": m_info['name'], "score": score}
+                                for meta, score in zip(todo_metas, scores)]
+                    # Os membros de cada grupo herdam o score do representante
+                    new_rows += [{**row, "frame": frame} for row in new_rows
+                                 for frame in members.get((row["label_str"], row["video"], row["frame"]), ())]
+                    sink(new_rows)
+
+            mark_completed(writer, engines, scenario, n_frames)
+
+    if writer is not None:
+        writer.flush()
+        df = writer.read_all()
+    else:
+        df = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    return sort_by_model(df, model_names)
+
+
+def _score(m_info, engine, batch):
+    # Cópia porque alguns preprocess_input do Keras alteram o array no lugar
+    with profiling.stage("preprocess"):
+        inputs = m_info['prep'](batch.copy())
+    with profiling.stage("inference"):
+        scores = engine.predict_batch(inputs)
+    profiling.count(f"frames[{m_info['name']}]", len(inputs))
+    return scores
+
+
+def mark_completed(writer, engines, scenario, frames):
+    """Registra as células (modelo, cenário) do grupo como concluídas, se houver um writer."""
+    if writer is None:
+        return
+    for m_info, _ in engines:
+        writer.mark_completed(m_info['name'], scenario, frames)
+
+
+def sort_by_model(df, model_names):
+    """Ordena as linhas pela ordem dos modelos (ordenação estável: o resto da ordem é mantido)."""
+    if df.empty:
+        return df
+    order = {name: i for i, name in enumerate(model_names)}
+    keys = df["model"].astype(str).map(order).fillna(len(order)).to_numpy()
+    return df.iloc[np.argsort(keys, kind="stable")].reset_index(drop=True)
@@ -0,0 +1,55 @@
+"""
+Exportação dos modelos Keras para TFLite (com quantização int8 opcional) e ONNX.
+"""
+import os
+import random
+
+import numpy as np
+
+from pipeline.loader import find_images, load_image
+
+
+def calibration_frames(m_info, image_root="frames/hq", n_frames=200, seed=42):
+    """Amostra de frames HQ já pré-processados para calibrar a quantização int8."""
+    paths = sorted(find_images(image_root))
+    random.Random(seed).shuffle(paths)
+    frames = []
+    for path in paths[:n_frames]:
+        try:
+            frames.append(load_image(path, m_info['size'], m_info['prep']))
+        except Exception as e:
+            print(f"Erro ao processar imagem {path}: {e}")
+    if not frames:
+        raise ValueError(f"Nenhuma imagem de calibração encontrada em {image_root}")
+    return np.stack(frames).astype(np.float32)
+
+
+def export_tflite(model, out_path, calibration=None):
+    """
+    Converte para TFLite. Com `calibration` (array N x H x W x 3), aplica a
+    quantização pós-treinamento int8 calibrada nesses frames; a entrada e a
+    saída continuam em float32.
+    """
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if calibration is not None:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: ([frame[None]] for frame in calibration)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "wb") as f:
+        f.write(converter.convert())
+    return out_path
+
+
+def export_onnx(model, out_path, opset=13):
+    """Converte para ONNX (precisa do pacote tf2onnx), com lote de tamanho variável."""
+    import tensorflow as tf
+    import tf2onnx
+
+    spec = (tf.TensorSpec((None,) + tuple(model.input_shape[1:]), tf.float32, name="input"),)
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tf2onnx.convert.from_keras(model, input_signature=spec, opset=opset, output_path=out_path)
+    return out_path
@@ -0,0 +1,311 @@
+"""
+Extração de rostos dos vídeos (usado por scripts/01_extract_faces.py).
+
+- Amostragem com cap.grab(): os frames que não serão usados não são decodificados.
+- Detecção em lotes sobre os frames amostrados.
+- Detectores intercambiáveis: MTCNN (padrão, o mesmo de antes), YuNet (OpenCV DNN) e Haar.
+- Modo de rastreamento opcional: detecção completa só a cada K amostras.
+- Um processo por vídeo, cada um com o seu próprio detector.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+
+from pipeline import profiling
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov')
+YUNET_MODEL_PATH = "models/face_detection_yunet_2023mar.onnx"
+
+
+class MTCNNDetector:
+    """Detector MTCNN (pacote mtcnn). Recebe frames RGB."""
+    rgb = True
+
+    def __init__(self):
+        import mtcnn
+        self.detector = mtcnn.MTCNN()
+        # A partir da versão 1.0 o detect_faces aceita uma lista de imagens
+        major = int(getattr(mtcnn, "__version__", "0").split(".")[0])
+        self.batched = major >= 1
+
+    def detect(self, frames):
+        """Devolve, para cada frame, a lista de caixas (x, y, w, h, confiança)."""
+        if self.batched:
+            results = self.detector.detect_faces(list(frames))
+        else:
+            results = [self.detector.detect_faces(f) for f in frames]
+        return [[(*r['box'], r['confidence']) for r in res] for res in results]
+
+
+class YuNetDetector:
+    """Detector YuNet do OpenCV (cv2.FaceDetectorYN), bem mais leve que o MTCNN na CPU."""
+    rgb = False
+
+    def __init__(self, model_path=YUNET_MODEL_PATH, score_threshold=0.8):
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Modelo YuNet não encontrado em {model_path}")
+        self.detector = cv2.FaceDetectorYN.create(model_path, "", (320, 320), score_threshold)
+
+    def detect(self, frames):
+        results = []
+        for frame in frames:
+            self.detector.setInputSize((frame.shape[1], frame.shape[0]))
+            _, faces = self.detector.detect(frame)
+            faces = [] if faces is None else sorted(faces, key=lambda f: -f[14])
+            results.append([(int(f[0]), int(f[1]), int(f[2]), int(f[3]), float(f[14])) for f in faces])
+        return results
+
+
+class HaarDetector:
+    """Cascata de Haar do OpenCV: a opção mais rápida, porém a menos precisa."""
+    rgb = False
+
+    def __init__(self):
+        self.detector = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+
+    def detect(self, frames):
+        results = []
+        for frame in frames:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            faces = self.detector.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5)
+            # Maior rosto primeiro
+            faces = sorted(faces, key=lambda f: -(f[2] * f[3]))
+            results.append([(int(x), int(y), int(w), int(h), 1.0) for x, y, w, h in faces])
+        return results
+
+
+DETECTORS = {"mtcnn": MTCNNDetector, "yunet": YuNetDetector, "haar": HaarDetector}
+
+
+def get_detector(name):
+    return DETECTORS[name]()
+
+
+def sample_frames(cap, sample_rate):
+    """
+    Gera (índice, frame BGR) de 1 a cada `sample_rate` frames.
+    Os demais só avançam o vídeo com grab(), sem decodificar a imagem.
+    """
+    frame_count = 0
+    while True:
+        if frame_count % sample_rate == 0:
+            with profiling.stage("video_decode"):
+                ret, frame = cap.read()
+            if not ret:
+                break
+            profiling.count("frames_sampled")
+            yield frame_count, frame
+        else:
+            with profiling.stage("video_grab"):
+                ret = cap.grab()
+            if not ret:
+                break
+        frame_count += 1
+
+
+def crop_face(frame, box, img_size, pad):
+    """Recorta o rosto com padding (sem sair dos limites da imagem) e redimensiona."""
+    x, y, w, h = box[:4]
+    x1 = max(0, x - pad)
+    y1 = max(0, y - pad)
+    x2 = min(frame.shape[1], x + w + pad)
+    y2 = min(frame.shape[0], y + h + pad)
+    return cv2.resize(frame[y1:y2, x1:x2], (img_size, img_size))
+
+
+class FaceTracker:
+    """
+    Rastreador simples por busca local: procura o recorte do rosto anterior
+    (template matching em tons de cinza) numa janela ao redor da última caixa.
+    """
+
+    def __init__(self, frame, box, search_margin=0.5):
+        self.search_margin = search_margin
+        self._reset(frame, box)
+
+    def _reset(self, frame, box):
+        x, y, w, h = (int(v) for v in box[:4])
+        x, y = max(0, x), max(0, y)
+        self.box = (x, y, w, h)
+        self.template = cv2.cvtColor(frame[y:y + h, x:x + w], cv2.COLOR_BGR2GRAY)
+
+    def update(self, frame):
+        """Devolve (nova caixa, confiança entre -1 e 1) e passa a seguir a nova posição."""
+        x, y, w, h = self.box
+        th, tw = self.template.shape[:2]
+        if th == 0 or tw == 0:
+            return self.box, -1.0
+
+        mx, my = int(w * self.search_margin), int(h * self.search_margin)
+        x1, y1 = max(0, x - mx), max(0, y - my)
+        x2, y2 = min(frame.shape[1], x + tw + mx), min(frame.shape[0], y + th + my)
+        window = cv2.cvtColor(frame[y1:y2, x1:x2], cv2.COLOR_BGR2GRAY)
+        if window.shape[0] < th or window.shape[1] < tw:
+            return self.box, -1.0
+
+        result = cv2.matchTemplate(window, self.template, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (dx, dy) = cv2.minMaxLoc(result)
+        self._reset(frame, (x1 + dx, y1 + dy, tw, th))
+        return self.box, float(score)
+
+
+def _detector_input(detector, frame):
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) if detector.rgb else frame
+
+
+def _save_face(frame, box, frame_count, video_output_dir, img_size, pad):
+    try:
+        with profiling.stage("crop"):
+            face = crop_face(frame, box, img_size, pad)
+        save_path = os.path.join(video_output_dir, f"frame_{frame_count}.jpg")
+        with profiling.stage("write"):
+            cv2.imwrite(save_path, face)
+        profiling.count("faces_saved")
+        return 1
+    except Exception:
+        return 0
+
+
+def _detect_and_save(detector, batch, video_output_dir, img_size, pad):
+    frames = [_detector_input(detector, f) for _, f in batch]
+    saved = 0
+    with profiling.stage("detect"):
+        detections = detector.detect(frames)
+    for (frame_count, frame), faces in zip(batch, detections):
+        if faces:
+            # Pega o primeiro rosto (geralmente o maior)
+            saved += _save_face(frame, faces[0], frame_count, video_output_dir, img_size, pad)
+    return saved
+
+
+def _track_and_save(detector, samples, video_output_dir, img_size, pad, track_every, min_track_score):
+    """
+    Modo de rastreamento: detecção completa a cada `track_every` amostras (ou
+    quando a confiança do rastreador cai abaixo de `min_track_score`); nas
+    amostras intermediárias a caixa anterior é reaproveitada e realinhada.
+    """
+    saved = 0
+    tracker = None
+    since_detection = 0
+
+    for frame_count, frame in samples:
+        box = None
+        if tracker is not None and since_detection + 1 < track_every:
+            with profiling.stage("track"):
+                box, score = tracker.update(frame)
+            if score < min_track_score:
+                box = None
+            else:
+                since_detection += 1
+
+        if box is None:
+            with profiling.stage("detect"):
+                faces = detector.detect([_detector_input(detector, frame)])[0]
+            since_detection = 0
+            if not faces:
+                tracker = None
+                continue
+            box = faces[0][:4]
+            tracker = FaceTracker(frame, box)
+
+        saved += _save_face(frame, box, frame_count, video_output_dir, img_size, pad)
+    return saved
+
+
+def process_video(video_path, output_dir, detector, sample_rate=15, img_size=256, pad=20, batch_size=16,
+                  track_every=0, min_track_score=0.6):
+    """
+    Abre um vídeo, detecta rostos, recorta e salva os frames.
+    Com track_every > 0, usa o modo de rastreamento entre as detecções.
+    Retorna o número de rostos salvos (0 se o vídeo já tinha sido processado).
+    """
+    video_name = os.path.basename(video_path).split('.')[0]
+    video_output_dir = os.path.join(output_dir, video_name)
+
+    if os.path.exists(video_output_dir):
+        return 0
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        print(f"Erro ao abrir vídeo: {video_path}")
+        return 0
+
+    os.makedirs(video_output_dir, exist_ok=True)
+    samples = sample_frames(cap, sample_rate)
+
+    if track_every > 0:
+        saved_count = _track_and_save(detector, samples, video_output_dir, img_size, pad, track_every, min_track_score)
+        cap.release()
+        return saved_count
+
+    saved_count = 0
+    batch = []
+    for frame_count, frame in samples:
+        batch.append((frame_count, frame))
+        if len(batch) == batch_size:
+            saved_count += _detect_and_save(detector, batch, video_output_dir, img_size, pad)
+            batch = []
+    if batch:
+        saved_count += _detect_and_save(detector, batch, video_output_dir, img_size, pad)
+
+    cap.release()
+    return saved_count
+
+
+# Cada processo do pool cria o seu detector uma única vez
+_worker_detector = None
+
+
+def _init_worker(detector_name):
+    global _worker_detector
+    # Evita que cada processo abra várias threads do OpenCV disputando os mesmos núcleos
+    cv2.setNumThreads(1)
+    _worker_detector = get_detector(detector_name)
+
+
+def _process_video_worker(video_path, output_dir, options):
+    return process_video(video_path, output_dir, _worker_detector, **options)
+
+
+def list_videos(video_root):
+    """Lista (caminho do vídeo, pasta de saída relativa ao rótulo) para cada vídeo em video_root/<rótulo>/."""
+    videos = []
+    for label_folder in sorted(os.listdir(video_root)):
+        label_path = os.path.join(video_root, label_folder)
+        if not os.path.isdir(label_path):
+            continue
+        video_files = [f for f in os.listdir(label_path) if f.endswith(VIDEO_EXTENSIONS)]
+        if not video_files:
+            print(f"Nenhum vídeo (.mp4, .avi, .mov) encontrado em {label_path}")
+        videos.extend((os.path.join(label_path, f), label_folder) for f in sorted(video_files))
+    return videos
+
+
+def extract_all(video_root, frame_root, detector_name="mtcnn", workers=1, progress=None, **options):
+    """
+    Extrai os rostos de todos os vídeos, em `workers` processos.
+    Retorna (vídeos processados, total de rostos salvos).
+    """
+    videos = list_videos(video_root)
+    total_saved = 0
+    videos_processados = 0
+
+    if workers <= 1:
+        # No processo principal o OpenCV mantém todas as suas threads
+        detector = get_detector(detector_name)
+        results = (process_video(path, os.path.join(frame_root, label), detector, **options) for path, label in videos)
+        for saved in (progress(results, total=len(videos)) if progress else results):
+            total_saved += saved
+            videos_processados += saved > 0
+        return videos_processados, total_saved
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(detector_name,)) as pool:
+        futures = [profiling.submit(pool, _process_video_worker, path, os.path.join(frame_root, label), options)
+                   for path, label in videos]
+        done = as_completed(futures)
+        for future in (progress(done, total=len(futures)) if progress else done):
+            saved = profiling.result(future)
+            total_saved += saved
+            videos_processados += saved > 0
+    return videos_processados, total_saved
@@ -0,0 +1,151 @@
+"""
+Cache de embeddings do backbone congelado, para treinar só a "cabeça".
+
+Nos scripts 05-07 o backbone (Xception, MobileNetV2, EfficientNetB0) fica com
+trainable = False: a saída do GlobalAveragePooling2D de cada imagem nunca muda.
+Aqui ela é calculada uma única vez por (backbone, imagem, variante de aumento)
+e gravada em cache/features/<backbone>_<tamanho>px_<chave>_v<variante>.npy
+(float32, N x D, lido com memória mapeada) mais um índice .csv com o caminho,
+o rótulo e o mtime/tamanho de cada JPEG. A chave é um hash do tamanho de
+entrada, da função de pré-processamento e dos pesos do backbone: trocar
+qualquer um deles (ex.: outro checkpoint do ImageNet) gera embeddings novos. A variante 0 é a imagem original; as variantes
+1..K-1 são cópias aumentadas (rotação de até 10° e espelhamento horizontal,
+como o ImageDataGenerator dos scripts), sorteadas com semente fixa.
+
+As camadas Dense depois do pooling são então treinadas direto sobre os
+embeddings; como elas são compartilhadas com o modelo completo, basta salvar
+o modelo completo no fim.
+"""
+import os
+import hashlib
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from tqdm import tqdm
+
+from pipeline.datasets import decode_image, augmentation
+from pipeline.frame_cache import _file_stats
+
+FEATURE_ROOT = "cache/features"
+
+
+def config_key(extractor, preprocess, image_size):
+    """Hash do que muda os embeddings além das imagens: tamanho, pré-processamento e pesos do backbone."""
+    digest = hashlib.blake2b(digest_size=6)
+    digest.update(f"{image_size}|{preprocess.__module__}.{preprocess.__qualname__}".encode())
+    for weight in extractor.weights:
+        digest.update(np.ascontiguousarray(weight.numpy()).tobytes())
+    return digest.hexdigest()
+
+
+def store_paths(backbone, key, variant, image_size, root=FEATURE_ROOT):
+    """Caminhos dos embeddings (.npy) e do índice (.csv) de uma variante."""
+    base = os.path.join(root, f"{backbone}_{image_size}px_{key}_v{variant}")
+    return base + ".npy", base + ".csv"
+
+
+def is_valid(npy_path, index_path, image_paths):
+    """O cache existe e foi feito com essas mesmas imagens (lista, mtime e tamanho)?"""
+    if not (os.path.exists(npy_path) and os.path.exists(index_path)):
+        return False
+    index = pd.read_csv(index_path)
+    if index["path"].tolist() != list(image_paths):
+        return False
+    try:
+        mtimes, sizes = _file_stats(image_paths)
+    except OSError:
+        return False
+    return index["mtime"].tolist() == mtimes and index["bytes"].tolist() == sizes
+
+
+def extract(model, preprocess, image_paths, labels, image_size, backbone, variants=1, batch_size=64, root=FEATURE_ROOT):
+    """
+    Calcula (ou reaproveita) os embeddings de `image_paths` para cada variante.
+    `model` é o modelo completo; os embeddings são a saída da sua camada
+    GlobalAveragePooling2D. Retorna a lista de arrays memmap (um por variante).
+    """
+    pooling = _pooling_layer(model)
+    extractor = tf.keras.Model(model.input, pooling.output)
+    os.makedirs(root, exist_ok=True)
+    key = config_key(extractor, preprocess, image_size)
+
+    stores = []
+    for variant in range(variants):
+        npy_path, index_path = store_paths(backbone, key, variant, image_size, root)
+        if is_valid(npy_path, index_path, image_paths):
+            print(f"   Embeddings {backbone} v{variant}: usando o cache ({npy_path})")
+            stores.append(np.load(npy_path, mmap_mode="r"))
+            continue
+
+        ds = tf.data.Dataset.from_tensor_slices(list(image_paths))
+        ds = ds.map(lambda p: decode_image(p, image_size), num_parallel_calls=tf.data.AUTOTUNE).batch(batch_size)
+        if variant > 0:
+            augment = augmentation(seed=variant)
+            ds = ds.map(lambda x: augment(x, training=True))
+        ds = ds.map(preprocess, num_parallel_calls=tf.data.AUTOTUNE).prefetch(tf.data.AUTOTUNE)
+
+        tmp_npy, tmp_index = npy_path + ".tmp", index_path + ".tmp"
+        array = np.lib.format.open_memmap(tmp_npy, mode="w+", dtype=np.float32,
+                                          shape=(len(image_paths), pooling.output.shape[-1]))
+        pos = 0
+        for batch in tqdm(ds, total=-(-len(image_paths) // batch_size), desc=f"Embeddings {backbone} v{variant}"):
+            feats = extractor(batch, training=False).numpy()
+            array[pos:pos + len(feats)] = feats
+            pos += len(feats)
+        array.flush()
+        del array
+
+        mtimes, sizes = _file_stats(image_paths)
+        pd.DataFrame({"path": list(image_paths), "label": labels, "mtime": mtimes, "bytes": sizes}).to_csv(tmp_index, index=False)
+        os.replace(tmp_npy, npy_path)
+        os.replace(tmp_index, index_path)
+        stores.append(np.load(npy_path, mmap_mode="r"))
+    return stores
+
+
+def head_model(model):
+    """
+    Modelo só com as camadas depois do pooling (ex.: Dense(1024) -> Dense(1)),
+    que recebe os embeddings. As camadas são as mesmas do modelo completo.
+    """
+    layers = model.layers[model.layers.index(_pooling_layer(model)) + 1:]
+    inputs = tf.keras.Input(shape=(_pooling_layer(model).output.shape[-1],))
+    x = inputs
+    for layer in layers:
+        x = layer(x)
+    head = tf.keras.Model(inputs, x, name=f"{model.name}_head")
+    head.compile(optimizer=type(model.optimizer).from_config(model.optimizer.get_config()),
+                 loss=model.loss, metrics=["accuracy"])
+    return head
+
+
+def fit_head(model, stores, labels, epochs=5, batch_size=16, seed=42):
+    """
+    Treina a cabeça do modelo a partir dos embeddings. Com variantes aumentadas
+    (len(stores) > 1), cada época usa, para cada imagem, uma das variantes
+    (incluindo a original) sorteada, como o ImageDataGenerator sorteava uma
+    transformação por época.
+    """
+    head = head_model(model)
+    labels = np.asarray(labels, dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    for epoch in range(epochs):
+        if len(stores) > 1:
+            choice = rng.integers(0, len(stores), size=len(labels))
+            x = np.empty(stores[0].shape, dtype=np.float32)
+            for variant in range(len(stores)):
+                mask = choice == variant
+                x[mask] = stores[variant][mask]
+        else:
+            x = np.asarray(stores[0])
+        head.fit(x, labels, batch_size=batch_size, epochs=epoch + 1, initial_epoch=epoch, shuffle=True)
+    return head
+
+
+def _pooling_layer(model):
+    # A última: o EfficientNet também usa GlobalAveragePooling2D dentro dos blocos
+    for layer in reversed(model.layers):
+        if isinstance(layer, tf.keras.layers.GlobalAveragePooling2D):
+            return layer
+    raise ValueError(f"o modelo {model.name} não tem uma camada GlobalAveragePooling2D")
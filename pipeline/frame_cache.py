@@ -0,0 +1,113 @@
+"""
+Cache das imagens já decodificadas, por (cenário, tamanho de entrada).
+
+Para cada par é gerado um único arquivo .npy (uint8, N x size x size x 3, BGR)
+lido com memória mapeada (np.load(..., mmap_mode='r')), mais um índice .csv
+com (caminho, vídeo, frame, rótulo) e o mtime/tamanho de cada JPEG de origem.
+Se algum JPEG mudar, aparecer ou sumir, o cache deixa de ser válido.
+"""
+import os
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from pipeline.loader import find_images, parse_frame_path, decode_resize, stream_images
+
+CACHE_ROOT = "cache/frames"
+INDEX_COLUMNS = ["path", "video", "frame", "label", "label_str", "mtime", "bytes", "ok"]
+# Como em results.py/split.py: IDs numéricos ("000", "012") continuam texto
+INDEX_DTYPES = {"video": str, "frame": str, "label_str": str}
+
+
+def cache_paths(scenario, size, cache_root=CACHE_ROOT):
+    """Caminhos do arquivo de imagens (.npy) e do índice (.csv) de um par (cenário, tamanho)."""
+    base = os.path.join(cache_root, f"{scenario}_{size}")
+    return base + ".npy", base + ".csv"
+
+
+def _file_stats(paths):
+    stats = [os.stat(p) for p in paths]
+    return [s.st_mtime_ns for s in stats], [s.st_size for s in stats]
+
+
+def build(scenario, size, image_root="frames", cache_root=CACHE_ROOT):
+    """
+    Decodifica todas as imagens de image_root/<cenário> uma vez e grava o cache.
+    Imagens que não puderem ser lidas ficam no índice com ok=0.
+    Retorna o número de imagens gravadas.
+    """
+    image_paths = sorted(find_images(os.path.join(image_root, scenario)))
+    if not image_paths:
+        print(f"Aviso: Nenhuma imagem encontrada em {scenario}")
+        return 0
+
+    os.makedirs(cache_root, exist_ok=True)
+    npy_path, index_path = cache_paths(scenario, size, cache_root)
+    tmp_npy, tmp_index = npy_path + ".tmp", index_path + ".tmp"
+
+    mtimes, sizes = _file_stats(image_paths)
+    index = pd.DataFrame([parse_frame_path(p) for p in image_paths])
+    index.insert(0, "path", image_paths)
+    index["mtime"] = mtimes
+    index["bytes"] = sizes
+    index["ok"] = 0
+
+    array = np.lib.format.open_memmap(tmp_npy, mode="w+", dtype=np.uint8, shape=(len(image_paths), size, size, 3))
+    items = enumerate(image_paths)
+    for i, img in tqdm(stream_images(items, partial(decode_resize, size=size)), total=len(image_paths), desc=f"Cache {scenario} {size}px"):
+        array[i] = img
+        index.at[i, "ok"] = 1
+    array.flush()
+    del array
+
+    index[INDEX_COLUMNS].to_csv(tmp_index, index=False)
+    # Só substitui o cache antigo quando os dois arquivos estão completos
+    os.replace(tmp_npy, npy_path)
+    os.replace(tmp_index, index_path)
+    return int(index["ok"].sum())
+
+
+def is_valid(scenario, size, image_root="frames", cache_root=CACHE_ROOT):
+    """Confere se o cache existe e se os JPEGs de origem continuam iguais (lista, mtime e tamanho)."""
+    npy_path, index_path = cache_paths(scenario, size, cache_root)
+    if not (os.path.exists(npy_path) and os.path.exists(index_path)):
+        return False
+
+    index = pd.read_csv(index_path, dtype=INDEX_DTYPES)
+    image_paths = sorted(find_images(os.path.join(image_root, scenario)))
+    if index["path"].tolist() != image_paths:
+        return False
+
+    try:
+        mtimes, sizes = _file_stats(image_paths)
+    except OSError:
+        return False
+    return index["mtime"].tolist() == mtimes and index["bytes"].tolist() == sizes
+
+
+def load(scenario, size, cache_root=CACHE_ROOT):
+    """
+    Abre o cache sem copiar os dados: devolve (índice, array memmap).
+    Fatias do array (ex.: array[i:j]) são lidas direto do disco sob demanda.
+    """
+    npy_path, index_path = cache_paths(scenario, size, cache_root)
+    return pd.read_csv(index_path, dtype=INDEX_DTYPES), np.load(npy_path, mmap_mode="r")
+
+
+def stream_cached(scenario, size, prep=None, extra_meta=None, cache_root=CACHE_ROOT):
+    """
+    Mesmo formato de pipeline.loader.stream_frames (metadados, imagem float32),
+    mas lendo do cache em vez dos JPEGs.
+    """
+    extra_meta = extra_meta or {}
+    index, array = load(scenario, size, cache_root)
+    meta_columns = ["video", "frame", "label", "label_str"]
+    for i, row in enumerate(index[meta_columns + ["ok"]].itertuples(index=False)):
+        if not row.ok:
+            continue
+        img = array[i].astype(np.float32)
+        if prep is not None:
+            img = prep(img)
+        yield {**dict(zip(meta_columns, row[:4])), **extra_meta}, img
@@ -0,0 +1,108 @@
+"""
+Motor de inferência em lotes (batches) usado pelos scripts de avaliação.
+
+Em vez de chamar model.predict() uma vez por imagem, agrupa os frames já
+pré-processados em lotes e chama um tf.function compilado por lote.
+"""
+import time
+import numpy as np
+
+DEFAULT_BATCH_SIZE = 64
+BENCHMARK_BATCH_SIZES = [1, 8, 16, 32, 64, 128]
+
+
+class BatchInference:
+    """
+    Recebe pares (metadados, imagem) e devolve (metadados, score) na mesma
+    ordem de entrada, rodando o modelo em lotes de `batch_size` imagens.
+    """
+
+    def __init__(self, model, batch_size=DEFAULT_BATCH_SIZE):
+        self.model = model
+        self.batch_size = batch_size
+        self._predict_fn = None
+
+    def _compile(self):
+        import tensorflow as tf
+
+        model = self.model
+        # Batch dinâmico (None) para o último lote menor não recompilar o grafo
+        spec = tf.TensorSpec(shape=(None,) + tuple(model.input_shape[1:]), dtype=tf.float32)
+
+        @tf.function(input_signature=[spec])
+        def predict_fn(x):
+            return model(x, training=False)
+
+        return predict_fn
+
+    def predict_batch(self, batch):
+        """Roda o modelo em um lote (N, H, W, 3) e devolve um vetor de N scores."""
+        if self._predict_fn is None:
+            self._predict_fn = self._compile()
+        batch = np.asarray(batch, dtype=np.float32)
+        scores = self._predict_fn(batch)
+        return np.asarray(scores).reshape(len(batch), -1)[:, 0]
+
+    def run(self, items):
+        """
+        Consome um iterável de (metadados, imagem) e gera (metadados, score).
+        """
+        for metas, batch in batched(items, self.batch_size):
+            yield from zip(metas, self.predict_batch(batch))
+
+
+def batched(items, batch_size):
+    """
+    Agrupa um iterável de (metadados, imagem) em lotes (lista de metadados, array N x H x W x 3).
+    """
+    metas, images = [], []
+    for meta, img in items:
+        metas.append(meta)
+        images.append(img)
+        if len(images) == batch_size:
+            yield metas, np.stack(images)
+            metas, images = [], []
+
+    if images:
+        yield metas, np.stack(images)
+
+
+def benchmark(model, batch_sizes=BENCHMARK_BATCH_SIZES, n_frames=512):
+    """
+    Mede a vazão (frames/segundo) do modelo Keras para cada tamanho de lote,
+    usando imagens aleatórias do tamanho de entrada do modelo.
+    Retorna uma lista de dicionários, um por tamanho de lote.
+    """
+    return benchmark_engine(BatchInference(model), model.input_shape[1:], batch_sizes, n_frames)
+
+
+def benchmark_engine(engine, input_shape, batch_sizes=BENCHMARK_BATCH_SIZES, n_frames=512):
+    """
+    Como benchmark(), mas para qualquer motor com a interface do BatchInference
+    (ex.: os backends TFLite/ONNX de pipeline/backends.py). Também mede a
+    latência média por lote.
+    """
+    frames = np.random.rand(n_frames, *tuple(input_shape)).astype(np.float32)
+    report = []
+
+    for batch_size in batch_sizes:
+        engine.batch_size = batch_size
+        # Aquecimento: a primeira chamada compila o grafo (ou aloca os tensores)
+        engine.predict_batch(frames[:batch_size])
+
+        items = ((i, img) for i, img in enumerate(frames))
+        start = time.perf_counter()
+        for _ in engine.run(items):
+            pass
+        elapsed = time.perf_counter() - start
+        n_batches = -(-n_frames // batch_size)
+
+        report.append({
+            "batch_size": batch_size,
+            "frames": n_frames,
+            "seconds": elapsed,
+            "frames_per_sec": n_frames / elapsed,
+            "latency_ms": 1000 * elapsed / n_batches,
+        })
+
+    return report
@@ -0,0 +1,124 @@
+"""
+Carregamento das imagens em paralelo para alimentar os detectores.
+
+A leitura do disco, o cv2.imread e o cv2.resize rodam em um pool de threads
+(o OpenCV libera o GIL nessas chamadas), enquanto a thread principal roda o
+modelo. A fila de imagens prontas é limitada, então o uso de memória não
+cresce com o tamanho da pasta frames/.
+"""
+import os
+import glob
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import cv2
+import numpy as np
+
+from pipeline import profiling
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+DEFAULT_PREFETCH = 256  # Máximo de imagens decodificadas esperando o modelo
+
+
+def find_images(root):
+    """Encontra todas as imagens .jpg em todas as sub-pastas de `root`."""
+    search_path = os.path.join(root, "**", "*.jpg")
+    return glob.glob(search_path, recursive=True)
+
+
+def parse_frame_path(img_path):
+    """
+    Extrai os metadados de um caminho como frames/hq/videos_fake/v1/frame_0.jpg
+    """
+    parts = img_path.split(os.path.sep)
+    label_str = parts[-3]  # 'videos_fake' ou 'videos_real'
+    return {
+        "video": parts[-2],  # 'v1'
+        "frame": parts[-1],  # 'frame_0.jpg'
+        "label": 1 if label_str == "videos_fake" else 0,
+        "label_str": label_str,
+    }
+
+
+def prep_mesonet(img):
+    """O MesoNet espera a imagem normalizada entre 0.0 e 1.0."""
+    return img / 255.0
+
+
+def read_image(img_path):
+    """
+    Equivalente ao cv2.imread (BGR; None se a imagem não puder ser lida), com
+    a leitura do disco e a decodificação medidas em etapas separadas.
+    """
+    with profiling.stage("read"):
+        data = np.fromfile(img_path, dtype=np.uint8)
+    if data.size == 0:
+        return None
+    with profiling.stage("decode"):
+        return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+
+def decode_resize(img_path, size):
+    """Lê a imagem (BGR) e redimensiona para size x size, mantendo uint8."""
+    img = read_image(img_path)
+    if img is None:
+        raise ValueError("imagem não pôde ser lida")
+    with profiling.stage("resize"):
+        return cv2.resize(img, (size, size))
+
+
+def load_image(img_path, size, prep=None):
+    """Lê a imagem (BGR), redimensiona para size x size e aplica o pré-processamento."""
+    img = decode_resize(img_path, size).astype(np.float32)
+    if prep is not None:
+        with profiling.stage("preprocess"):
+            img = prep(img)
+    return img
+
+
+def stream_images(items, load_fn, workers=DEFAULT_WORKERS, prefetch=DEFAULT_PREFETCH):
+    """
+    Consome um iterável de (metadados, caminho) e gera (metadados, imagem)
+    na mesma ordem de entrada, decodificando até `prefetch` imagens à frente
+    em `workers` threads. Imagens com erro são avisadas e puladas.
+    """
+    items = iter(items)
+    pending = deque()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def fill():
+            while len(pending) < prefetch:
+                try:
+                    meta, path = next(items)
+                except StopIteration:
+                    return
+                pending.append((meta, path, pool.submit(load_fn, path)))
+
+        fill()
+        while pending:
+            meta, path, future = pending.popleft()
+            fill()
+            try:
+                img = future.result()
+            except Exception as e:
+                print(f"Erro ao processar imagem {path}: {e}")
+                continue
+            yield meta, img
+
+
+def stream_frames(image_paths, size, prep=None, extra_meta=None, quality=None, cache=None, **kwargs):
+    """
+    Atalho para o caso comum: caminhos de frames -> (metadados, imagem pronta).
+    `extra_meta` é adicionado aos metadados de cada frame (ex.: o cenário).
+    Com `quality`, cada imagem é comprimida em memória nessa qualidade JPEG
+    antes do redimensionamento (ver pipeline/degrade.py).
+    """
+    extra_meta = extra_meta or {}
+    items = (({**parse_frame_path(p), **extra_meta}, p) for p in image_paths)
+    if quality is not None:
+        from pipeline.degrade import load_degraded
+        load_fn = partial(load_degraded, size=size, quality=quality, prep=prep, cache=cache)
+    else:
+        load_fn = partial(load_image, size=size, prep=prep)
+    return stream_images(items, load_fn, **kwargs)
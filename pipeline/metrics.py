@@ -0,0 +1,173 @@
+"""
+Métricas de todos os (modelo, cenário) de uma vez, com pandas/NumPy vetorizados.
+
+Substitui o cálculo arquivo por arquivo e cenário por cenário do analise.ipynb:
+os results_*.csv são carregados uma única vez e acurácia, AUC, EER, TPR@FPR e
+matriz de confusão saem de uma passada de groupby. Também calcula scores por
+vídeo e intervalos de confiança por bootstrap (reamostragem em lote).
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+GROUP_KEYS = ["model", "scenario"]
+FPR_TARGETS = [0.01, 0.05, 0.10]
+
+
+def load_results(files):
+    """
+    Carrega vários CSVs de resultados num único DataFrame.
+    `files` é um dicionário {nome do modelo: caminho}; o nome só é usado
+    quando o CSV não tem a coluna "model" (ex.: results.csv do MesoNet).
+    """
+    frames = []
+    for model_name, path in files.items():
+        if not os.path.exists(path):
+            print(f"--- ERRO: Arquivo não encontrado: {path} ---")
+            continue
+        df = pd.read_csv(path)
+        if "model" not in df:
+            df.insert(0, "model", model_name)
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=GROUP_KEYS + ["label", "score"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def _roc_points(df, keys):
+    """
+    Pontos da curva ROC de cada grupo (um ponto por valor distinto de score,
+    do maior para o menor), com as colunas tpr e fpr.
+    """
+    ordered = df.sort_values(keys + ["score"], ascending=[True] * len(keys) + [False], kind="mergesort")
+    grouped = ordered.groupby(keys, sort=False, observed=True)
+    tp = grouped["label"].cumsum()
+    fp = grouped["label"].cumcount() + 1 - tp
+    n_pos = grouped["label"].transform("sum")
+    n_neg = grouped["label"].transform("size") - n_pos
+
+    # Só o último frame de cada empate de score vira ponto da curva
+    same_group = (ordered[keys].shift(-1) == ordered[keys]).all(axis=1)
+    last_of_tie = ~(same_group & (ordered["score"].shift(-1) == ordered["score"]))
+
+    points = ordered.loc[last_of_tie, keys].copy()
+    points["tpr"] = (tp / n_pos)[last_of_tie]
+    points["fpr"] = (fp / n_neg)[last_of_tie]
+    return points
+
+
+def _eer(points, keys):
+    """
+    EER de cada grupo: a curva ROC (com a origem) é interpolada linearmente
+    entre os dois pontos em que FPR - FNR troca de sinal, e o EER é a FPR
+    em que FPR = FNR = 1 - TPR.
+    """
+    gap = points["fpr"] - (1 - points["tpr"])  # Cresce de -1 (origem) até 1 ao longo da curva
+    grouped = points.assign(gap=gap).groupby(keys, sort=False, observed=True)
+    prev_fpr = grouped["fpr"].shift(fill_value=0.0)
+    prev_gap = grouped["gap"].shift(fill_value=-1.0)
+    crossing = (gap >= 0) & (prev_gap < 0)
+    t = -prev_gap[crossing] / (gap[crossing] - prev_gap[crossing])
+    eer = prev_fpr[crossing] + t * (points.loc[crossing, "fpr"] - prev_fpr[crossing])
+    return pd.Series(eer.to_numpy(), index=points.loc[crossing, keys].set_index(keys).index)
+
+
+def frame_metrics(df, threshold=0.5, keys=GROUP_KEYS, fpr_targets=FPR_TARGETS):
+    """
+    Uma linha por grupo (por padrão, modelo x cenário) com n, acurácia, AUC,
+    EER, TPR em cada FPR alvo e a matriz de confusão (tp, fp, tn, fn).
+    """
+    df = df[keys + ["label", "score"]].copy()
+    df["label"] = df["label"].astype(np.int64)
+    pred = (df["score"] > threshold).astype(np.int64)
+    df["tp"] = pred & df["label"]
+    df["fp"] = pred & (1 - df["label"])
+    df["fn"] = (1 - pred) & df["label"]
+    df["tn"] = (1 - pred) & (1 - df["label"])
+
+    # AUC pela estatística de Mann-Whitney: posto médio (empates) dentro de cada grupo
+    df["rank"] = df.groupby(keys, observed=True)["score"].rank(method="average")
+    df["pos_rank"] = df["rank"] * df["label"]
+
+    out = df.groupby(keys, observed=True).agg(
+        n=("label", "size"), n_pos=("label", "sum"),
+        tp=("tp", "sum"), fp=("fp", "sum"), tn=("tn", "sum"), fn=("fn", "sum"),
+        pos_rank=("pos_rank", "sum"),
+    )
+    out["n_neg"] = out["n"] - out["n_pos"]
+    out["accuracy"] = (out["tp"] + out["tn"]) / out["n"]
+    valid = (out["n_pos"] > 0) & (out["n_neg"] > 0)
+    auc = (out["pos_rank"] - out["n_pos"] * (out["n_pos"] + 1) / 2) / (out["n_pos"] * out["n_neg"])
+    out["auc"] = auc.where(valid)
+
+    # EER e TPR@FPR a partir dos pontos da curva ROC de cada grupo
+    in_valid_group = df.set_index(keys).index.isin(out.index[valid])
+    points = _roc_points(df[in_valid_group], keys)
+    if not points.empty:
+        out["eer"] = _eer(points, keys).reindex(out.index)
+        for target in fpr_targets:
+            tpr = points[points["fpr"] <= target].groupby(keys, observed=True)["tpr"].max()
+            out[f"tpr@fpr={target:g}"] = tpr.reindex(out.index).fillna(0.0).where(valid)
+    else:
+        out["eer"] = np.nan
+        for target in fpr_targets:
+            out[f"tpr@fpr={target:g}"] = np.nan
+
+    columns = ["n", "n_pos", "n_neg", "accuracy", "auc", "eer"] + [f"tpr@fpr={t:g}" for t in fpr_targets] + ["tp", "fp", "tn", "fn"]
+    return out[columns].reset_index()
+
+
+def video_scores(df, agg="mean", keys=GROUP_KEYS):
+    """
+    Score por vídeo: média (ou mediana) dos scores dos frames de cada vídeo.
+    Devolve um DataFrame no mesmo formato (label, score), pronto para frame_metrics.
+    """
+    if "video" not in df:
+        raise ValueError("os resultados não têm a coluna 'video' (ex.: results_ESTRESSE_COMPLETO.csv)")
+    video_keys = keys + (["label_str"] if "label_str" in df else []) + ["video"]
+    return (df.groupby(video_keys, observed=True)
+              .agg(label=("label", "first"), score=("score", agg), frames=("score", "size"))
+              .reset_index())
+
+
+def _batched_auc(scores, labels):
+    """AUC de cada linha de matrizes (B, n) de scores e rótulos reamostrados."""
+    from scipy.stats import rankdata
+
+    ranks = rankdata(scores, axis=1, method="average")
+    n_pos = labels.sum(axis=1)
+    n_neg = labels.shape[1] - n_pos
+    with np.errstate(divide="ignore", invalid="ignore"):
+        auc = ((ranks * labels).sum(axis=1) - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+    return np.where((n_pos > 0) & (n_neg > 0), auc, np.nan)
+
+
+def bootstrap_ci(df, n_boot=1000, alpha=0.05, threshold=0.5, keys=GROUP_KEYS, seed=42, chunk=250):
+    """
+    Intervalos de confiança (percentis) da acurácia e da AUC de cada grupo.
+    As `n_boot` reamostragens de um grupo são sorteadas de uma vez como uma
+    matriz de índices (em blocos de `chunk` linhas, para limitar a memória).
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for group, g in df.groupby(keys, observed=True):
+        scores = g["score"].to_numpy(dtype=np.float64)
+        labels = g["label"].to_numpy(dtype=np.int64)
+        correct = ((scores > threshold).astype(np.int64) == labels).astype(np.float64)
+
+        accs, aucs = [], []
+        for start in range(0, n_boot, chunk):
+            idx = rng.integers(0, len(g), size=(min(chunk, n_boot - start), len(g)))
+            accs.append(correct[idx].mean(axis=1))
+            aucs.append(_batched_auc(scores[idx], labels[idx]))
+        accs, aucs = np.concatenate(accs), np.concatenate(aucs)
+
+        lo, hi = 100 * alpha / 2, 100 * (1 - alpha / 2)
+        rows.append({
+            **dict(zip(keys, group if isinstance(group, tuple) else (group,))),
+            "accuracy_lo": np.percentile(accs, lo), "accuracy_hi": np.percentile(accs, hi),
+            "auc_lo": np.nanpercentile(aucs, lo) if np.isfinite(aucs).any() else np.nan,
+            "auc_hi": np.nanpercentile(aucs, hi) if np.isfinite(aucs).any() else np.nan,
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,262 @@
+"""
+Medição do tempo de cada etapa (leitura do disco, decodificação, resize,
+pré-processamento, inferência, detecção de rostos, compressão JPEG...).
+
+Desligado por padrão: stage() devolve um contexto vazio e não mede nada.
+Com enable(), cada etapa acumula as suas durações (um histograma por etapa
+no relatório), contadores podem ser somados com count() e, com trace=True,
+cada chamada vira um evento do Chrome trace (chrome://tracing ou Perfetto).
+
+    from pipeline import profiling
+    with profiling.stage("decode"):
+        img = cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+As etapas que rodam em threads (pipeline/loader.py) somam o tempo de cada
+thread, então o total de uma etapa pode passar do tempo de parede. Em
+processos filhos (ProcessPoolExecutor), use submit()/result() para as
+medições voltarem para o processo principal.
+"""
+import os
+import json
+import time
+import threading
+from collections import defaultdict, Counter
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+import numpy as np
+
+# Limites (ms) das faixas do histograma de cada etapa
+HISTOGRAM_BUCKETS_MS = [0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000]
+REPORT_SUFFIX = ".profile.json"
+
+_NULL = nullcontext()
+_lock = threading.Lock()
+_enabled = False
+_trace = False
+_started = 0
+_durations = defaultdict(list)  # etapa -> durações (ns)
+_counters = Counter()
+_events = []  # (etapa, início ns, duração ns, pid, tid)
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter_ns() - self.start
+        with _lock:
+            _durations[self.name].append(elapsed)
+            if _trace:
+                _events.append((self.name, self.start, elapsed, os.getpid(), threading.get_ident()))
+        return False
+
+
+def enable(trace=False):
+    """Liga as medições (zerando as anteriores). Com trace=True, guarda também cada chamada."""
+    global _enabled, _trace, _started
+    with _lock:
+        _durations.clear()
+        _counters.clear()
+        _events.clear()
+        _enabled, _trace, _started = True, trace, time.perf_counter_ns()
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def stage(name):
+    """Contexto que mede o tempo de uma etapa."""
+    return _Timer(name) if _enabled else _NULL
+
+
+def timed(name=None):
+    """Decorador: mede cada chamada da função como a etapa `name` (padrão: nome da função)."""
+    def decorator(fn):
+        stage_name = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Timer(stage_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, n=1):
+    """Soma `n` ao contador `name` (ex.: frames, rostos, bytes gravados)."""
+    if _enabled:
+        with _lock:
+            _counters[name] += n
+
+
+# --- Processos filhos ---
+
+class _Profiled:
+    def __init__(self, value, snap):
+        self.value = value
+        self.snap = snap
+
+
+def _call_profiled(trace, fn, args, kwargs):
+    enable(trace)
+    try:
+        value = fn(*args, **kwargs)
+    finally:
+        snap = snapshot()
+        disable()
+    return _Profiled(value, snap)
+
+
+def submit(pool, fn, *args, **kwargs):
+    """pool.submit(fn, ...) que, com as medições ligadas, também mede a chamada no processo filho."""
+    if not _enabled:
+        return pool.submit(fn, *args, **kwargs)
+    return pool.submit(_call_profiled, _trace, fn, args, kwargs)
+
+
+def result(future):
+    """future.result() de uma tarefa criada por submit(), juntando as medições do filho às daqui."""
+    value = future.result()
+    if isinstance(value, _Profiled):
+        merge(value.snap)
+        return value.value
+    return value
+
+
+def snapshot():
+    with _lock:
+        return {"durations": {k: list(v) for k, v in _durations.items()}, "counters": dict(_counters),
+                "events": list(_events)}
+
+
+def merge(snap):
+    with _lock:
+        for name, values in snap["durations"].items():
+            _durations[name].extend(values)
+        _counters.update(snap["counters"])
+        if _trace:
+            _events.extend(snap["events"])
+
+
+# --- Relatórios ---
+
+def summary():
+    """Estatísticas de cada etapa (na ordem da primeira chamada), em ms."""
+    with _lock:
+        durations = {k: np.array(v, dtype=np.float64) / 1e6 for k, v in _durations.items()}
+    stages = {}
+    edges = [0] + HISTOGRAM_BUCKETS_MS + [np.inf]
+    for name, ms in durations.items():
+        hist, _ = np.histogram(ms, bins=edges)
+        stages[name] = {
+            "calls": len(ms), "total_s": ms.sum() / 1000, "mean_ms": ms.mean(),
+            "p50_ms": np.percentile(ms, 50), "p95_ms": np.percentile(ms, 95), "max_ms": ms.max(),
+            "histogram_ms": {f"<{hi:g}" if np.isfinite(hi) else f">={lo:g}": int(n)
+                             for lo, hi, n in zip(edges[:-1], edges[1:], hist)},
+        }
+    return stages
+
+
+def report_path(results_path):
+    """Relatório ao lado do CSV de resultados: results_X.csv -> results_X.profile.json."""
+    return os.path.splitext(results_path)[0] + REPORT_SUFFIX
+
+
+def write_report(results_path, items=None, item_name="frames", **extra):
+    """
+    Grava o relatório JSON da execução ao lado de `results_path`: tempo de
+    parede, vazão (`items` por segundo), estatísticas por etapa e contadores.
+    """
+    wall = (time.perf_counter_ns() - _started) / 1e9
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results_path,
+        "wall_s": wall,
+        item_name: items,
+        f"{item_name}_per_s": items / wall if items and wall else None,
+        **extra,
+        "stages": summary(),
+        "counters": dict(_counters),
+    }
+    path = report_path(results_path)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, default=float)
+    return path
+
+
+def write_trace(path):
+    """Grava os eventos no formato Chrome trace (JSON), em microssegundos desde enable()."""
+    with _lock:
+        events = [{"name": name, "ph": "X", "ts": (start - _started) / 1000, "dur": dur / 1000, "pid": pid, "tid": tid}
+                  for name, start, dur, pid, tid in _events]
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return path
+
+
+def print_summary():
+    stages = summary()
+    if not stages:
+        return
+    print(f"\n{'etapa':<20} {'chamadas':>9} {'total (s)':>10} {'média (ms)':>11} {'p95 (ms)':>9}")
+    for name, s in sorted(stages.items(), key=lambda kv: -kv[1]["total_s"]):
+        print(f"{name:<20} {s['calls']:>9} {s['total_s']:>10.2f} {s['mean_ms']:>11.2f} {s['p95_ms']:>9.2f}")
+
+
+@contextmanager
+def tf_profiler(logdir):
+    """Liga o profiler do TensorFlow (TensorBoard) em `logdir`; sem `logdir`, não faz nada."""
+    if not logdir:
+        yield
+        return
+    import tensorflow as tf
+
+    tf.profiler.experimental.start(logdir)
+    try:
+        yield
+    finally:
+        tf.profiler.experimental.stop()
+
+
+# --- Scripts ---
+
+def add_arguments(parser, tensorflow=True):
+    """Opções --profile, --trace e (se o script usa o TensorFlow) --tf-profile, comuns aos scripts."""
+    parser.add_argument("--profile", action="store_true", help=f"Mede cada etapa e grava <resultados>{REPORT_SUFFIX}")
+    parser.add_argument("--trace", metavar="ARQUIVO", help="Grava também um Chrome trace (implica --profile)")
+    if tensorflow:
+        parser.add_argument("--tf-profile", metavar="PASTA", help="Roda o profiler do TensorFlow e grava em PASTA (TensorBoard)")
+
+
+def from_args(args):
+    """Liga as medições conforme as opções de add_arguments. Retorna True se ligou."""
+    if args.profile or args.trace:
+        enable(trace=bool(args.trace))
+        return True
+    return False
+
+
+def finish(results_path, items=None, item_name="frames", trace=None, **extra):
+    """Fim da execução: grava o relatório (e o trace em `trace`, se pedido) e mostra o resumo por etapa."""
+    if not _enabled:
+        return
+    print_summary()
+    print(f"Relatório de desempenho salvo em: {write_report(results_path, items, item_name, **extra)}")
+    if trace:
+        print(f"Chrome trace salvo em: {write_trace(trace)}")
@@ -0,0 +1,71 @@
+"""
+Registro dos modelos avaliados no projeto.
+
+Cada modelo é descrito por um dicionário com:
+    name    -> nome usado nos CSVs de resultados
+    path    -> arquivo de pesos (.h5) ou modelo salvo (.keras)
+    size    -> tamanho de entrada (size x size)
+    prep    -> função de pré-processamento aplicada à imagem BGR float32
+    builder -> função que cria a arquitetura (só para arquivos de pesos, ex.: Meso4)
+"""
+import os
+
+from pipeline.loader import prep_mesonet
+
+# O TensorFlow só é importado quando um modelo é de fato carregado ou um
+# pré-processamento é aplicado: importar o registro (ex.: para listar os
+# modelos no --help) não paga os segundos de inicialização do TF.
+
+
+# funções de pré-processamento específicas de cada modelo
+def prep_xception(img):
+    from tensorflow.keras.applications.xception import preprocess_input
+    return preprocess_input(img)
+
+
+def prep_mobilenet(img):
+    from tensorflow.keras.applications.mobilenet_v2 import preprocess_input
+    return preprocess_input(img)
+
+
+def prep_efficient(img):
+    from tensorflow.keras.applications.efficientnet import preprocess_input
+    return preprocess_input(img)
+
+
+def Meso4(input_shape=None):
+    from models.mesonet_model import Meso4 as build
+    return build(input_shape=input_shape)
+
+
+MODELS = {
+    "MesoNet_DF": {"name": "MesoNet_DF", "path": "models/Meso4_DF.h5", "size": 256, "prep": prep_mesonet, "builder": Meso4},
+    "MesoNet_F2F": {"name": "MesoNet_F2F", "path": "models/Meso4_F2F.h5", "size": 256, "prep": prep_mesonet, "builder": Meso4},
+    "Xception": {"name": "Xception", "path": "models/xception_model.keras", "size": 299, "prep": prep_xception},
+    "MobileNetV2": {"name": "MobileNetV2", "path": "models/mobilenet_model.keras", "size": 224, "prep": prep_mobilenet},
+    "EfficientNetB0": {"name": "EfficientNetB0", "path": "models/efficientnet_model.keras", "size": 224, "prep": prep_efficient},
+}
+
+
+def get_models(names, rename=None):
+    """
+    Devolve as entradas do registro na ordem pedida.
+    `rename` permite trocar o nome que vai para o CSV (ex.: {"MesoNet_DF": "MesoNet (Incompatível)"}).
+    """
+    rename = rename or {}
+    return [{**MODELS[n], "name": rename.get(n, MODELS[n]["name"])} for n in names]
+
+
+def load(m_info):
+    """Carrega o modelo descrito por uma entrada do registro."""
+    if not os.path.exists(m_info['path']):
+        raise FileNotFoundError(f"Arquivo {m_info['path']} não encontrado!")
+
+    if m_info.get('builder') is not None:
+        # Cria o "corpo" do modelo e coloca o "cérebro" (pesos) dentro dele
+        model = m_info['builder'](input_shape=(m_info['size'], m_info['size'], 3))
+        model.load_weights(m_info['path'])
+        return model
+
+    from tensorflow.keras.models import load_model as keras_load_model
+    return keras_load_model(m_info['path'])
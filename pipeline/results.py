@@ -0,0 +1,131 @@
+"""
+Gravação incremental dos resultados (scores) em pedaços colunares.
+
+Em vez de acumular um dicionário por frame e montar o DataFrame só no fim,
+os resultados vão para disco a cada `chunk_rows` linhas, em arquivos
+Parquet (se o pyarrow estiver instalado; senão CSV) dentro de uma pasta
+"<arquivo de resultados>.parts/". Se o processo cair, o que já foi gravado
+continua lá, e numa nova execução os frames já avaliados são pulados.
+"""
+import os
+import glob
+import shutil
+
+import numpy as np
+import pandas as pd
+
+KEY_COLUMNS = ["model", "scenario", "label_str", "video", "frame"]
+CATEGORY_COLUMNS = ["model", "scenario", "label_str", "video"]
+COMPLETED_FILE = "completed.csv"  # Células (modelo, cenário) já avaliadas por inteiro
+
+
+def _has_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def typed(df):
+    """Tipos compactos: texto repetido como categoria, rótulo uint8 e score float32."""
+    df = df.copy()
+    for col in CATEGORY_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype(str).astype("category")
+    if "frame" in df:
+        df["frame"] = df["frame"].astype(str)
+    if "label" in df:
+        df["label"] = df["label"].astype(np.uint8)
+    if "score" in df:
+        df["score"] = df["score"].astype(np.float32)
+    return df
+
+
+class ResultsWriter:
+    """
+    Acumula linhas de resultado e grava um novo pedaço a cada `chunk_rows` linhas.
+    Use como gerenciador de contexto (with) para garantir a gravação do último pedaço.
+    Com resume=False, os pedaços de uma execução anterior são apagados.
+    """
+
+    def __init__(self, results_file, columns, chunk_rows=4096, fmt=None, resume=True):
+        self.parts_dir = results_file + ".parts"
+        if not resume and os.path.exists(self.parts_dir):
+            shutil.rmtree(self.parts_dir)
+        self.columns = columns
+        self.chunk_rows = chunk_rows
+        self.fmt = fmt or ("parquet" if _has_pyarrow() else "csv")
+        self._buffer = []
+        os.makedirs(self.parts_dir, exist_ok=True)
+        self._next_part = len(self._part_files())
+
+    def _part_files(self):
+        return sorted(glob.glob(os.path.join(self.parts_dir, "part-*.parquet")) +
+                      glob.glob(os.path.join(self.parts_dir, "part-*.csv")))
+
+    def append(self, rows):
+        self._buffer.extend(rows)
+        if len(self._buffer) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        df = typed(pd.DataFrame(self._buffer, columns=self.columns))
+        path = os.path.join(self.parts_dir, f"part-{self._next_part:05d}.{self.fmt}")
+        tmp_path = path + ".tmp"
+        if self.fmt == "parquet":
+            df.to_parquet(tmp_path, index=False)
+        else:
+            df.to_csv(tmp_path, index=False)
+        # Um pedaço só passa a existir quando está completo
+        os.replace(tmp_path, path)
+        self._next_part += 1
+        self._buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    def read_all(self):
+        """Todos os resultados gravados até agora, com os tipos compactos."""
+        parts = []
+        for path in self._part_files():
+            if path.endswith(".parquet"):
+                parts.append(pd.read_parquet(path))
+            else:
+                parts.append(pd.read_csv(path, dtype={"frame": str, "video": str}))
+        if not parts:
+            return typed(pd.DataFrame(columns=self.columns))
+        return typed(pd.concat([p.astype({c: str for c in CATEGORY_COLUMNS if c in p}) for p in parts], ignore_index=True))
+
+    def done_keys(self):
+        """Conjunto de chaves (modelo, cenário, classe, vídeo, frame) que já têm score gravado."""
+        df = self.read_all()
+        if df.empty:
+            return set()
+        return set(df[KEY_COLUMNS].astype(str).itertuples(index=False, name=None))
+
+
+    def completed_cells(self):
+        """Conjunto de (modelo, cenário) que já foram avaliados por inteiro."""
+        path = os.path.join(self.parts_dir, COMPLETED_FILE)
+        if not os.path.exists(path):
+            return set()
+        df = pd.read_csv(path, dtype=str)
+        return set(df[["model", "scenario"]].itertuples(index=False, name=None))
+
+    def mark_completed(self, model, scenario, frames):
+        """Grava o pedaço pendente e registra a célula (modelo, cenário) como concluída."""
+        self.flush()
+        path = os.path.join(self.parts_dir, COMPLETED_FILE)
+        row = pd.DataFrame([{"model": model, "scenario": scenario, "frames": frames,
+                             "finished_at": pd.Timestamp.now().isoformat(timespec="seconds")}])
+        row.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+
+
+def row_key(model, meta):
+    return (model, meta["scenario"], meta["label_str"], meta["video"], meta["frame"])
@@ -0,0 +1,151 @@
+"""
+Cache persistente de scores (SQLite), endereçado pelo conteúdo.
+
+Cada score é guardado com a chave (hash da imagem decodificada e
+redimensionada, impressão digital dos pesos do modelo, configuração do
+pré-processamento). Assim, numa nova avaliação (ex.: depois de adicionar
+alguns vídeos ou um novo nível de qualidade), só os frames que o modelo
+ainda não viu passam pela inferência, qualquer que seja o caminho ou o
+cenário de onde vieram. Trocar os pesos do modelo muda a impressão digital,
+então os scores antigos deixam de valer sozinhos.
+
+O arquivo é limitado em megabytes: ao passar do limite, os scores usados há
+mais tempo são apagados.
+"""
+import os
+import time
+import hashlib
+import sqlite3
+
+import numpy as np
+
+from pipeline import profiling
+
+SCORE_CACHE_PATH = "cache/scores.sqlite"
+DEFAULT_MAX_MB = 512
+_CHUNK = 500  # Máximo de chaves por consulta (limite de parâmetros do SQLite)
+
+
+def image_hash(img):
+    """Hash do conteúdo da imagem (uint8, já no tamanho de entrada do modelo), independente do caminho."""
+    img = np.ascontiguousarray(img, dtype=np.uint8)
+    digest = hashlib.blake2b(img.tobytes(), digest_size=16)
+    digest.update(str(img.shape).encode())
+    return digest.digest()
+
+
+def prep_key(m_info, backend="keras"):
+    """Configuração do pré-processamento que afeta o score: tamanho, função e runtime."""
+    prep = m_info['prep']
+    return f"{m_info['size']}|{prep.__module__}.{prep.__qualname__}|{backend}"
+
+
+class ScoreCache:
+    def __init__(self, path=SCORE_CACHE_PATH, max_mb=DEFAULT_MAX_MB):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.final_bytes = None
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS scores (
+            image BLOB, model TEXT, prep TEXT, score REAL, used REAL,
+            PRIMARY KEY (image, model, prep)) WITHOUT ROWID""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS scores_used ON scores (used)")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS fingerprints (
+            path TEXT PRIMARY KEY, mtime INTEGER, bytes INTEGER, digest TEXT)""")
+        self.db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def model_fingerprint(self, path):
+        """
+        Hash (SHA-256) do arquivo de pesos. Fica guardado junto com o mtime e o
+        tamanho, então o arquivo só é lido de novo quando muda.
+        """
+        stat = os.stat(path)
+        row = self.db.execute("SELECT mtime, bytes, digest FROM fingerprints WHERE path = ?", (path,)).fetchone()
+        if row is not None and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+            return row[2]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        digest = digest.hexdigest()
+        self.db.execute("INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?)",
+                        (path, stat.st_mtime_ns, stat.st_size, digest))
+        self.db.commit()
+        return digest
+
+    def lookup(self, hashes, model, prep):
+        """Scores já conhecidos para os hashes pedidos: {hash: score}."""
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        for i in range(0, len(unique), _CHUNK):
+            chunk = unique[i:i + _CHUNK]
+            marks = ",".join("?" * len(chunk))
+            found.update(self.db.execute(
+                f"SELECT image, score FROM scores WHERE model = ? AND prep = ? AND image IN ({marks})",
+                (model, prep, *chunk)))
+        if found:
+            now = time.time()
+            self.db.executemany("UPDATE scores SET used = ? WHERE image = ? AND model = ? AND prep = ?",
+                                [(now, h, model, prep) for h in found])
+        hits = sum(h in found for h in hashes)
+        self.hits += hits
+        self.misses += len(hashes) - hits
+        profiling.count("score_cache_hits", hits)
+        profiling.count("score_cache_misses", len(hashes) - hits)
+        return found
+
+    def store(self, hashes, model, prep, scores):
+        now = time.time()
+        self.db.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?)",
+                            [(h, model, prep, float(s), now) for h, s in zip(hashes, scores)])
+        self.db.commit()
+
+    def size_bytes(self):
+        page_size = self.db.execute("PRAGMA page_size").fetchone()[0]
+        pages = self.db.execute("PRAGMA page_count").fetchone()[0] - self.db.execute("PRAGMA freelist_count").fetchone()[0]
+        return pages * page_size
+
+    def evict(self):
+        """Apaga os scores usados há mais tempo até o arquivo caber no limite. Retorna quantos saíram."""
+        removed = 0
+        while self.size_bytes() > self.max_bytes:
+            total = self.db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+            if total == 0:
+                break
+            # Remove a fração que excede o limite (no mínimo 1%) de uma vez
+            excess = 1 - self.max_bytes / self.size_bytes()
+            n = max(int(total * max(excess, 0.01)), 1)
+            removed += self.db.execute(
+                "DELETE FROM scores WHERE (image, model, prep) IN "
+                "(SELECT image, model, prep FROM scores ORDER BY used LIMIT ?)", (n,)).rowcount
+            self.db.commit()
+        self.evicted += removed
+        return removed
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self):
+        return (f"Cache de scores ({self.path}): {self.hits} acertos, {self.misses} inferências "
+                f"({self.hit_rate():.1%} de acerto), {self.evicted} removidos, "
+                f"{(self.final_bytes if self.final_bytes is not None else self.size_bytes()) / 1e6:.1f} MB")
+
+    def close(self):
+        self.evict()
+        self.final_bytes = self.size_bytes()
+        self.db.commit()
+        self.db.close()
@@ -0,0 +1,261 @@
+"""
+Serviço local de scores (HTTP sobre TCP ou socket Unix), só com asyncio.
+
+Os modelos ficam carregados e as requisições que chegam ao mesmo tempo são
+juntadas em lotes (micro-batching): cada imagem entra na fila do seu modelo
+e o lote é rodado quando enche (max_batch) ou quando a imagem mais antiga
+já esperou max_delay_ms. Vídeos (caminho local) são amostrados e têm os
+rostos detectados numa thread, em blocos de VIDEO_DETECT_BATCH frames; os
+recortes entram na mesma fila das imagens.
+
+    POST /score?model=MesoNet_DF           corpo: bytes JPEG/PNG do rosto
+    POST /video?model=MesoNet_DF           corpo: {"path": "...", "sample_rate": 15}
+    GET  /metrics                          fila, histograma dos lotes, latências
+    GET  /health
+"""
+import asyncio
+import json
+import itertools
+import time
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+import cv2
+import numpy as np
+
+from pipeline.faces import sample_frames, crop_face, get_detector, _detector_input
+from pipeline.streaming import CROP_SIZE
+
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_DELAY_MS = 5.0
+LATENCY_WINDOW = 10000  # Últimas N latências guardadas para os percentis do /metrics
+VIDEO_DETECT_BATCH = 16  # Frames de um vídeo lidos e detectados por vez na rota /video
+
+
+class MicroBatcher:
+    """Fila de um modelo: junta as imagens pendentes em lotes e devolve o score de cada uma."""
+
+    def __init__(self, m_info, engine, max_batch=DEFAULT_MAX_BATCH, max_delay_ms=DEFAULT_MAX_DELAY_MS):
+        self.m_info = m_info
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self.queue = asyncio.Queue()
+        self.batch_sizes = Counter()
+        self.queue_depths = Counter()
+        self.latencies = []
+        # Uma thread só para o modelo: o loop de eventos continua livre durante a inferência
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._running = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def score(self, img):
+        """Score de uma imagem já preparada (size x size x 3, pré-processada)."""
+        future = asyncio.get_running_loop().create_future()
+        # Profundidade da fila vista por quem chega (inclui o lote que está rodando)
+        self.queue_depths[self.queue.qsize() + self._running] += 1
+        await self.queue.put((img, future, time.perf_counter()))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = batch[0][2] + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0 and self.queue.empty():
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), max(timeout, 0)) if timeout > 0
+                                 else self.queue.get_nowait())
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+
+            self.batch_sizes[len(batch)] += 1
+            self._running = len(batch)
+            try:
+                scores = await loop.run_in_executor(self._executor, self.engine.predict_batch,
+                                                    np.stack([img for img, _, _ in batch]))
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finally:
+                self._running = 0
+            now = time.perf_counter()
+            for (_, future, queued_at), score in zip(batch, scores):
+                if not future.done():
+                    future.set_result(float(score))
+                self.latencies.append(now - queued_at)
+            del self.latencies[:-LATENCY_WINDOW]
+
+    def metrics(self):
+        latencies = np.array(self.latencies) * 1000
+        return {
+            "queue_depth": self.queue.qsize(),
+            "batches": sum(self.batch_sizes.values()),
+            "images": sum(size * n for size, n in self.batch_sizes.items()),
+            "batch_size_histogram": {str(k): v for k, v in sorted(self.batch_sizes.items())},
+            "queue_depth_histogram": {str(k): v for k, v in sorted(self.queue_depths.items())},
+            "queue_ms_p50": float(np.percentile(latencies, 50)) if len(latencies) else None,
+            "queue_ms_p99": float(np.percentile(latencies, 99)) if len(latencies) else None,
+        }
+
+
+class ScoringService:
+    """Servidor HTTP mínimo (HTTP/1.1 com keep-alive) em cima de asyncio.start_server."""
+
+    def __init__(self, batchers, detector_name=None, threshold=0.5, workers=4):
+        self.batchers = batchers  # {nome do modelo: MicroBatcher}
+        self.detector_name = detector_name
+        # Um detector por thread do pool: o YuNet guarda o tamanho da entrada no próprio objeto
+        self._local = threading.local()
+        self.threshold = threshold
+        self.requests = Counter()
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+
+    async def serve(self, host="127.0.0.1", port=8000, unix_path=None):
+        for batcher in self.batchers.values():
+            batcher.start()
+        if unix_path:
+            server = await asyncio.start_unix_server(self._handle, path=unix_path)
+        else:
+            server = await asyncio.start_server(self._handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self._route(method, target, body)
+                data = json.dumps(payload).encode()
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, target, body):
+        url = urlsplit(target)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        self.requests[url.path] += 1
+        if url.path == "/health":
+            return "200 OK", {"status": "ok", "models": list(self.batchers)}
+        if url.path == "/metrics":
+            return "200 OK", {"requests": dict(self.requests),
+                              "models": {name: b.metrics() for name, b in self.batchers.items()}}
+
+        batcher = self.batchers.get(params.get("model", next(iter(self.batchers))))
+        if batcher is None:
+            return "404 Not Found", {"error": f"modelo desconhecido: {params.get('model')}"}
+        try:
+            if method == "POST" and url.path == "/score":
+                img = await asyncio.get_running_loop().run_in_executor(self._pool, self._prepare_bytes, batcher.m_info, body)
+                return "200 OK", {"model": batcher.m_info['name'], "score": await batcher.score(img)}
+            if method == "POST" and url.path == "/video":
+                return "200 OK", await self._score_video(batcher, json.loads(body or b"{}"))
+        except Exception as e:
+            return "400 Bad Request", {"error": str(e)}
+        return "404 Not Found", {"error": f"rota desconhecida: {method} {url.path}"}
+
+    @staticmethod
+    def _prepare_bytes(m_info, data):
+        img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            raise ValueError("imagem não pôde ser lida")
+        return m_info['prep'](cv2.resize(img, (m_info['size'], m_info['size'])).astype(np.float32))
+
+    def _detector(self):
+        if not hasattr(self._local, "detector"):
+            self._local.detector = get_detector(self.detector_name)
+        return self._local.detector
+
+    def _video_chunk(self, m_info, samples, pad=20):
+        """
+        Próximos VIDEO_DETECT_BATCH frames amostrados de um vídeo (roda numa
+        thread): (índice do frame, imagem preparada) dos rostos encontrados,
+        ou None quando o vídeo acabou.
+        """
+        chunk = list(itertools.islice(samples, VIDEO_DETECT_BATCH))
+        if not chunk:
+            return None
+        detector = self._detector()
+        faces = []
+        for (frame_count, frame), found in zip(chunk, detector.detect([_detector_input(detector, f) for _, f in chunk])):
+            if not found:
+                continue
+            try:
+                face = crop_face(frame, found[0], CROP_SIZE, pad)
+            except Exception:
+                continue  # Caixa degenerada ou fora do frame: pula o frame, como faces._save_face
+            face = cv2.resize(face, (m_info['size'], m_info['size']))
+            faces.append((frame_count, m_info['prep'](face.astype(np.float32))))
+        return faces
+
+    async def _score_video(self, batcher, request):
+        if self.detector_name is None:
+            raise ValueError("serviço iniciado sem detector de rostos")
+        cap = cv2.VideoCapture(request["path"])
+        if not cap.isOpened():
+            raise ValueError(f"vídeo não pôde ser aberto: {request['path']}")
+        samples = sample_frames(cap, int(request.get("sample_rate", 15)))
+        loop = asyncio.get_running_loop()
+        # O vídeo é lido e detectado em blocos: enquanto um bloco é detectado, os rostos do
+        # anterior estão na fila do modelo, então a memória não cresce com a duração do vídeo
+        frames, scores, previous = [], [], None
+        try:
+            while (faces := await loop.run_in_executor(self._pool, self._video_chunk, batcher.m_info, samples)) is not None:
+                current = asyncio.gather(*(batcher.score(img) for _, img in faces))
+                if previous is not None:
+                    scores.extend(await previous)
+                previous = current
+                frames.extend(frame_count for frame_count, _ in faces)
+            if previous is not None:
+                scores.extend(await previous)
+        finally:
+            cap.release()
+        score = float(np.mean(scores)) if scores else None
+        return {"model": batcher.m_info['name'], "frames": len(scores), "score": score,
+                "verdict": None if score is None else ("FAKE" if score > self.threshold else "REAL"),
+                "frame_scores": {f"frame_{frame_count}.jpg": s for frame_count, s in zip(frames, scores)}}
+
+
+async def http_request(method, path, body=b"", host="127.0.0.1", port=8000, unix_path=None, connection=None):
+    """
+    Cliente mínimo para o serviço (usado pelo gerador de carga). Com `connection`
+    (reader, writer) já aberta, reaproveita a conexão (keep-alive).
+    Retorna (status, JSON da resposta, conexão).
+    """
+    if connection is None:
+        connection = await (asyncio.open_unix_connection(unix_path) if unix_path else asyncio.open_connection(host, port))
+    reader, writer = connection
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    data = await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, json.loads(data), connection
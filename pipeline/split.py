@@ -0,0 +1,59 @@
+"""
+Divisão treino/teste por ID de vídeo guardada como manifesto (CSV), sem copiar
+os frames para frames_split/.
+
+O manifesto tem uma linha por vídeo (label_str, video, split) e é gerado com
+semente fixa, então a mesma lista de vídeos sempre gera a mesma divisão.
+"""
+import os
+import random
+
+import pandas as pd
+
+from pipeline.loader import find_images, parse_frame_path
+
+SPLIT_MANIFEST = "frames_split.csv"
+LABELS = ["videos_real", "videos_fake"]
+
+
+def make_split(base_dir="frames", train_split=0.65, seed=42, reference_scenario="hq"):
+    """
+    Sorteia os vídeos de cada classe (a partir do cenário de referência) entre
+    treino e teste. Devolve um DataFrame com as colunas label_str, video, split.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for label in LABELS:
+        sample_path = os.path.join(base_dir, reference_scenario, label)
+        if not os.path.exists(sample_path):
+            print(f"Aviso: Pasta {sample_path} não encontrada. Pulando...")
+            continue
+
+        # Ordena antes de embaralhar para não depender da ordem do os.listdir
+        video_ids = sorted(d for d in os.listdir(sample_path) if os.path.isdir(os.path.join(sample_path, d)))
+        rng.shuffle(video_ids)
+
+        split_idx = int(len(video_ids) * train_split)
+        train_ids = set(video_ids[:split_idx])
+        print(f"Classe {label}: Total {len(video_ids)} | Treino {len(train_ids)} | Teste {len(video_ids) - len(train_ids)}")
+
+        rows.extend({"label_str": label, "video": vid, "split": "train" if vid in train_ids else "test"}
+                    for vid in sorted(video_ids))
+
+    return pd.DataFrame(rows, columns=["label_str", "video", "split"])
+
+
+def load_split(path=SPLIT_MANIFEST):
+    return pd.read_csv(path, dtype=str)
+
+
+def split_images(scenario, split, base_dir="frames", manifest_path=SPLIT_MANIFEST):
+    """Caminhos dos frames de base_dir/<cenário> cujos vídeos pertencem ao `split` ('train' ou 'test')."""
+    manifest = load_split(manifest_path)
+    wanted = set(manifest.loc[manifest["split"] == split, ["label_str", "video"]].itertuples(index=False, name=None))
+    paths = []
+    for path in sorted(find_images(os.path.join(base_dir, scenario))):
+        meta = parse_frame_path(path)
+        if (meta["label_str"], meta["video"]) in wanted:
+            paths.append(path)
+    return paths
@@ -0,0 +1,73 @@
+"""
+Benchmark do tempo de inicialização dos comandos (python -m pipeline startup).
+
+Cada comando é iniciado `--repeat` vezes num processo novo com --help, que
+importa tudo o que o script importa no topo e sai antes de fazer qualquer
+trabalho. Também registra se o TensorFlow foi carregado e, como referência,
+o tempo de um Python vazio e o de `import tensorflow`.
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+from pipeline.__main__ import COMMANDS
+
+# Comandos com argparse (os outros rodariam o script inteiro em vez de mostrar a ajuda)
+HELP_COMMANDS = ["faces", "lq", "split", "evaluate", "cache", "metrics", "early-exit", "export"]
+STARTUP_FILE = "benchmark_startup.csv"
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+PROBE = """
+import sys
+from pipeline.__main__ import main
+try:
+    main({argv!r})
+except SystemExit:
+    pass
+sys.stderr.write("\\nTF_LOADED=%d\\n" % ("tensorflow" in sys.modules))
+"""
+
+
+def time_process(code, repeat):
+    """Mediana do tempo (s) de `python -c code` e se o TensorFlow foi importado."""
+    times, tf_loaded = [], False
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.PIPE, text=True)
+        times.append(time.perf_counter() - start)
+        tf_loaded = tf_loaded or "TF_LOADED=1" in proc.stderr
+    return statistics.median(times), tf_loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pipeline startup", description="Tempo de inicialização dos comandos.")
+    parser.add_argument("commands", nargs="*", help=f"Comandos a medir (padrão: {' '.join(HELP_COMMANDS)})")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=STARTUP_FILE)
+    args = parser.parse_args(argv)
+    unknown = [c for c in args.commands if c not in HELP_COMMANDS]
+    if unknown:
+        parser.error(f"comandos sem --help: {', '.join(unknown)} (use {', '.join(HELP_COMMANDS)})")
+    args.commands = args.commands or HELP_COMMANDS
+
+    import pandas as pd
+
+    rows = []
+    references = [("(python vazio)", "pass"), ("(import tensorflow)", "import tensorflow")]
+    for name, code in references:
+        seconds, _ = time_process(code, args.repeat)
+        rows.append({"command": name, "script": "", "seconds": seconds, "tensorflow": name != "(python vazio)"})
+        print(f"{name:<22} {seconds:6.2f} s")
+
+    for command in args.commands:
+        seconds, tf_loaded = time_process(PROBE.format(argv=[command, "--help"]), args.repeat)
+        rows.append({"command": command, "script": COMMANDS[command][0], "seconds": seconds, "tensorflow": tf_loaded})
+        print(f"{command:<22} {seconds:6.2f} s{'   (carrega o TensorFlow)' if tf_loaded else ''}")
+
+    pd.DataFrame(rows).to_csv(args.output, index=False)
+    print(f"\nResultados salvos em: {args.output}")
+    return 0
@@ -0,0 +1,219 @@
+"""
+Do vídeo ao veredito sem passar pelo disco.
+
+Em vez de 01 (grava os rostos em JPEG) -> 02 (recomprime) -> 03/08 (lê de
+volta), cada vídeo passa por quatro estágios que rodam ao mesmo tempo, em
+threads ligadas por filas limitadas (o uso de memória não cresce com o
+tamanho do vídeo e um estágio lento segura os anteriores):
+
+    leitura (decodifica e amostra os frames)
+      -> detecção (rostos em lote, recorte em memória)
+      -> preparo (compressão JPEG simulada opcional, redimensionamento, pré-processamento)
+      -> inferência (lotes com frames de vários vídeos)
+
+Para cada vídeo concluído sai o score de cada frame e o veredito do vídeo.
+"""
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from pipeline import profiling
+from pipeline.degrade import jpeg_degrade
+from pipeline.faces import sample_frames, crop_face, _detector_input
+from pipeline.inference import DEFAULT_BATCH_SIZE
+
+DEFAULT_QUEUE_SIZE = 64
+CROP_SIZE = 256  # Mesmo recorte salvo pelo 01_extract_faces.py
+_END = object()
+
+
+class _StageError:
+    def __init__(self, error):
+        self.error = error
+
+
+class _Stopped(Exception):
+    pass
+
+
+class _Outbox:
+    """Fila de saída de um estágio; put() desiste quando o consumidor para (erro ou fim antecipado)."""
+
+    def __init__(self, q, stop):
+        self.q = q
+        self.stop = stop
+
+    def put(self, item):
+        while True:
+            if self.stop.is_set():
+                raise _Stopped()
+            try:
+                self.q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+
+def _stage(target, inbox, outbox):
+    """Roda um estágio numa thread; erros são repassados adiante para a thread principal."""
+    def run():
+        try:
+            target(inbox, outbox)
+            outbox.put(_END)
+        except _Stopped:
+            return
+        except Exception as e:
+            try:
+                outbox.put(_StageError(e))
+                outbox.put(_END)
+            except _Stopped:
+                return
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def _forward_error(item, outbox):
+    if isinstance(item, _StageError):
+        outbox.put(item)
+        return True
+    return False
+
+
+def _get(q, stop):
+    while True:
+        if stop.is_set():
+            raise _Stopped()
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            pass
+
+
+def stream_videos(videos, detector, m_info, engine, sample_rate=15, quality=None, pad=20, detect_batch=16,
+                  batch_size=DEFAULT_BATCH_SIZE, threshold=0.5, queue_size=DEFAULT_QUEUE_SIZE):
+    """
+    Avalia uma lista de (caminho do vídeo, rótulo) e gera, para cada vídeo
+    concluído, (linhas por frame, linha do vídeo). O rótulo é o nome da pasta
+    (videos_fake / videos_real) ou None quando desconhecido.
+    """
+    stop = threading.Event()
+    frames_q = queue.Queue(maxsize=queue_size)
+    faces_q = queue.Queue(maxsize=queue_size)
+    ready_q = queue.Queue(maxsize=queue_size)
+
+    def read(_, outbox):
+        for video_path, label_str in videos:
+            video = os.path.splitext(os.path.basename(video_path))[0]
+            start = time.perf_counter()
+            outbox.put(("start", (label_str, video), start))
+            cap = cv2.VideoCapture(video_path)
+            if not cap.isOpened():
+                print(f"Erro ao abrir vídeo: {video_path}")
+            else:
+                for frame_count, frame in sample_frames(cap, sample_rate):
+                    outbox.put(("frame", (label_str, video), (frame_count, frame)))
+            cap.release()
+            outbox.put(("end", (label_str, video), None))
+
+    def detect(inbox, outbox):
+        batch = []
+
+        def flush():
+            inputs = [_detector_input(detector, frame) for _, _, frame in batch]
+            with profiling.stage("detect"):
+                detections = detector.detect(inputs)
+            for (key, frame_count, frame), faces in zip(batch, detections):
+                if faces:
+                    # Pega o primeiro rosto (geralmente o maior); caixa degenerada ou fora do frame: pula o frame
+                    try:
+                        face = crop_face(frame, faces[0], CROP_SIZE, pad)
+                    except Exception:
+                        profiling.count("faces_skipped")
+                        continue
+                    outbox.put(("face", key, (frame_count, face)))
+            batch.clear()
+
+        while (item := _get(inbox, stop)) is not _END:
+            if _forward_error(item, outbox):
+                continue
+            kind, key, payload = item
+            if kind == "frame":
+                batch.append((key, *payload))
+                if len(batch) == detect_batch:
+                    flush()
+            else:
+                if kind == "end" and batch:
+                    flush()
+                outbox.put(item)
+
+    def prepare(inbox, outbox):
+        size = m_info['size']
+        while (item := _get(inbox, stop)) is not _END:
+            if _forward_error(item, outbox):
+                continue
+            kind, key, payload = item
+            if kind == "face":
+                frame_count, face = payload
+                if quality is not None:
+                    with profiling.stage("jpeg_degrade"):
+                        face = jpeg_degrade(face, quality)
+                with profiling.stage("resize"):
+                    img = cv2.resize(face, (size, size)).astype(np.float32)
+                with profiling.stage("preprocess"):
+                    img = m_info['prep'](img)
+                item = (kind, key, (frame_count, img))
+            outbox.put(item)
+
+    threads = [_stage(read, None, _Outbox(frames_q, stop)), _stage(detect, frames_q, _Outbox(faces_q, stop)),
+               _stage(prepare, faces_q, _Outbox(ready_q, stop))]
+
+    # Inferência na thread principal: lotes com frames de vários vídeos; o lote
+    # pendente é rodado quando um vídeo termina, para o veredito sair logo
+    started, scores = {}, {}
+    pending = []
+
+    def run_batch():
+        if not pending:
+            return
+        with profiling.stage("inference"):
+            batch_scores = engine.predict_batch(np.stack([img for _, _, img in pending]))
+        for (key, frame_count, _), score in zip(pending, batch_scores):
+            scores[key].append((frame_count, float(score)))
+        pending.clear()
+
+    try:
+        while (item := ready_q.get()) is not _END:
+            if isinstance(item, _StageError):
+                raise item.error
+            kind, key, payload = item
+            if kind == "start":
+                started[key] = payload
+                scores[key] = []
+            elif kind == "face":
+                pending.append((key, *payload))
+                if len(pending) == batch_size:
+                    run_batch()
+            elif kind == "end":
+                run_batch()
+                yield _video_result(key, scores.pop(key), time.perf_counter() - started.pop(key), threshold)
+    finally:
+        # Erro ou consumidor que parou no meio: libera os estágios presos nas filas
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def _video_result(key, frame_scores, seconds, threshold):
+    label_str, video = key
+    label = None if label_str is None else int(label_str == "videos_fake")
+    frames = [{"label_str": label_str, "video": video, "frame": f"frame_{frame_count}.jpg", "label": label, "score": score}
+              for frame_count, score in frame_scores]
+    score = float(np.mean([s for _, s in frame_scores])) if frame_scores else np.nan
+    verdict = None if not frame_scores else ("FAKE" if score > threshold else "REAL")
+    return frames, {"label_str": label_str, "video": video, "label": label, "frames": len(frame_scores),
+                    "score": score, "verdict": verdict, "seconds": seconds}
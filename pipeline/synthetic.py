@@ -0,0 +1,134 @@
+"""
+Base sintética para medir desempenho sem os vídeos do SDFVD.
+
+Gera vídeos com um "rosto" desenhado que se move pela cena (nos vídeos fake,
+a região interna do rosto é trocada por uma versão borrada e com a cor
+alterada, com a borda da colagem visível) e monta a mesma estrutura que os
+scripts 01 e 02 produzem:
+
+    <root>/data/videos_{real,fake}/<vídeo>.avi
+    <root>/frames/{hq,q60,q30,q10}/videos_{real,fake}/<vídeo>/frame_N.jpg
+
+Os modelos do registro podem ser criados com pesos aleatórios
+(random_model), então tudo roda offline, na CPU.
+"""
+import os
+
+import cv2
+import numpy as np
+
+from pipeline.degrade import write_levels
+from pipeline.faces import crop_face
+from pipeline.split import LABELS
+
+FRAME_SIZE = (320, 240)  # (largura, altura) dos vídeos gerados
+FPS = 15
+FACE_SIZE = 256  # Mesmo recorte do 01_extract_faces.py
+PAD = 20
+QUALITIES = [60, 30, 10]
+
+# Backbones do keras.applications usados pelos scripts 05-07
+BACKBONES = {"Xception": "Xception", "MobileNetV2": "MobileNetV2", "EfficientNetB0": "EfficientNetB0"}
+
+
+def render_frame(rng_state, t, fake):
+    """
+    Desenha o frame t de um vídeo. `rng_state` guarda a aparência do vídeo
+    (cores, trajetória); devolve (frame BGR, caixa do rosto x, y, w, h).
+    """
+    width, height = FRAME_SIZE
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:] = rng_state["background"]
+    frame = cv2.add(frame, rng_state["noise"][t % len(rng_state["noise"])])
+
+    w, h = rng_state["face_size"]
+    cx = int(width / 2 + rng_state["amplitude"] * np.sin(2 * np.pi * t / rng_state["period"]))
+    cy = int(height / 2 + rng_state["amplitude"] / 2 * np.cos(2 * np.pi * t / rng_state["period"]))
+    cv2.ellipse(frame, (cx, cy), (w // 2, h // 2), 0, 0, 360, rng_state["skin"], -1)
+    for dx in (-w // 5, w // 5):
+        cv2.circle(frame, (cx + dx, cy - h // 8), max(w // 12, 2), (40, 30, 30), -1)
+    mouth_open = 2 + int(4 * abs(np.sin(np.pi * t / 7)))
+    cv2.ellipse(frame, (cx, cy + h // 4), (w // 6, mouth_open), 0, 0, 360, (60, 40, 140), -1)
+
+    box = (cx - w // 2, cy - h // 2, w, h)
+    if fake:
+        # "Troca de rosto": a região interna vem borrada e com outra cor, com borda dura
+        x1, y1 = cx - w // 3, cy - h // 3
+        x2, y2 = cx + w // 3, cy + h // 3
+        patch = cv2.GaussianBlur(frame[y1:y2, x1:x2], (7, 7), 0).astype(np.int16) + rng_state["shift"]
+        frame[y1:y2, x1:x2] = np.clip(patch, 0, 255).astype(np.uint8)
+    return frame, box
+
+
+def _video_state(rng):
+    width, height = FRAME_SIZE
+    face_w = int(rng.integers(70, 100))
+    return {
+        "background": rng.integers(0, 255, 3).tolist(),
+        "noise": [rng.integers(0, 25, (height, width, 3), dtype=np.uint8) for _ in range(4)],
+        "skin": rng.integers(90, 230, 3).tolist(),
+        "face_size": (face_w, int(face_w * 1.3)),
+        "amplitude": int(rng.integers(10, 40)),
+        "period": int(rng.integers(20, 60)),
+        "shift": rng.integers(-25, 25, 3).astype(np.int16),
+    }
+
+
+def generate(root, videos_per_label=4, frames_per_video=90, sample_rate=15, qualities=QUALITIES, seed=42):
+    """
+    Gera a base sintética em `root` (vídeos em data/ e rostos em frames/hq
+    e frames/qN). Retorna um dicionário com o que foi gerado.
+    """
+    rng = np.random.default_rng(seed)
+    hq_root = os.path.join(root, "frames", "hq")
+    n_videos, n_faces = 0, 0
+    for label in LABELS:
+        video_dir = os.path.join(root, "data", label)
+        os.makedirs(video_dir, exist_ok=True)
+        for i in range(videos_per_label):
+            name = f"{label.split('_')[1]}_{i:03d}"
+            state = _video_state(rng)
+            writer = cv2.VideoWriter(os.path.join(video_dir, f"{name}.avi"), cv2.VideoWriter_fourcc(*"MJPG"),
+                                     FPS, FRAME_SIZE)
+            face_dir = os.path.join(hq_root, label, name)
+            os.makedirs(face_dir, exist_ok=True)
+            for t in range(frames_per_video):
+                frame, box = render_frame(state, t, fake=label == "videos_fake")
+                writer.write(frame)
+                if t % sample_rate == 0:
+                    face_path = os.path.join(face_dir, f"frame_{t}.jpg")
+                    cv2.imwrite(face_path, crop_face(frame, box, FACE_SIZE, PAD))
+                    outputs = []
+                    for quality in qualities:
+                        out_path = os.path.join(root, "frames", f"q{quality}", label, name, f"frame_{t}.jpg")
+                        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+                        outputs.append((quality, out_path))
+                    write_levels(face_path, outputs)
+                    n_faces += 1
+            writer.release()
+            n_videos += 1
+    return {"root": root, "videos": n_videos, "faces": n_faces, "qualities": list(qualities), "seed": seed}
+
+
+def random_model(m_info, seed=42):
+    """
+    A arquitetura de um modelo do registro com pesos aleatórios (sem baixar
+    pesos do ImageNet nem ler models/): MesoNet pelo builder, os outros como
+    nos scripts 05-07 (backbone + GlobalAveragePooling2D + Dense).
+    """
+    import tensorflow as tf
+    from tensorflow.keras import applications
+    from tensorflow.keras.layers import Dense, GlobalAveragePooling2D
+    from tensorflow.keras.models import Model
+
+    tf.keras.utils.set_random_seed(seed)
+    shape = (m_info['size'], m_info['size'], 3)
+    if m_info.get('builder') is not None:
+        return m_info['builder'](input_shape=shape)
+    backbone = BACKBONES.get(m_info['name'])
+    if backbone is None:
+        raise ValueError(f"sem arquitetura conhecida para {m_info['name']}")
+    base_model = getattr(applications, backbone)(weights=None, include_top=False, input_shape=shape)
+    x = GlobalAveragePooling2D()(base_model.output)
+    x = Dense(1024, activation='relu')(x)
+    return Model(inputs=base_model.input, outputs=Dense(1, activation='sigmoid', dtype='float32')(x))
@@ -1,127 +1,63 @@
 import os
-import cv2
-from mtcnn import MTCNN
-from tqdm import tqdm
+import sys
 import time
+import argparse
+from tqdm import tqdm
 
-#  Configurações 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline import dedup, profiling
+from pipeline.faces import extract_all, DETECTORS
 
-VIDEO_ROOT = "data"       
+#  Configurações
+
+VIDEO_ROOT = "data"
 FRAME_ROOT = "frames/hq"  # Pasta de saída para os rostos (HQ = High Quality)
-SAMPLE_RATE = 15          # Salvar 1 frame a cada 15 frames 
+SAMPLE_RATE = 15          # Salvar 1 frame a cada 15 frames
 IMG_SIZE = 256            # Tamanho final da imagem do rosto (256x256 pixels)
 PAD = 20                  # Um preenchimento (padding) para pegar um pouco do contexto do rosto
-
-# Inicia
-try:
-    detector = MTCNN()
-    print("Carregando detector de rostos MTCNN...")
-except Exception as e:
-    print(f"Erro ao carregar MTCNN: {e}")
-    print("Verifique se o TensorFlow está instalado corretamente.")
-    exit()
-
-def process_video(video_path, output_dir):
-    """
-    Abre um vídeo, detecta rostos, recorta e salva os frames.
-    """
-    
-    video_name = os.path.basename(video_path).split('.')[0]
-    video_output_dir = os.path.join(output_dir, video_name)
-    
-
-    if os.path.exists(video_output_dir): 
-        return 0 
-        
-    os.makedirs(video_output_dir, exist_ok=True)
-    
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        print(f"Erro ao abrir vídeo: {video_path}")
-        return 0
-
-    frame_count = 0
-    saved_count = 0
-    
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-            
-        
-        if frame_count % SAMPLE_RATE == 0:
-            
-            try:
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            except cv2.error as e:
-                print(f"Erro ao converter frame (vídeo: {video_name}, frame: {frame_count}): {e}")
-                continue 
-            
-            # Detecta rostos
-            results = detector.detect_faces(frame_rgb)
-            
-            if results:
-                # Pega o primeiro rosto (geralmente o maior)
-                result = results[0]
-                x, y, w, h = result['box']
-                
-                # Adiciona padding e garante que não saia dos limites da imagem
-                x1 = max(0, x - PAD)
-                y1 = max(0, y - PAD)
-                x2 = min(frame.shape[1], x + w + PAD)
-                y2 = min(frame.shape[0], y + h + PAD)
-                
-                try:
-                    # Recorta o rosto do frame original (BGR)
-                    face = frame[y1:y2, x1:x2]
-                    # Redimensiona para o tamanho padrão
-                    resized_face = cv2.resize(face, (IMG_SIZE, IMG_SIZE))
-                    
-                    # Salva a imagem
-                    save_path = os.path.join(video_output_dir, f"frame_{frame_count}.jpg")
-                    cv2.imwrite(save_path, resized_face)
-                    saved_count += 1
-                except Exception as e:
-                    
-                    pass
-
-        frame_count += 1
-        
-    cap.release()
-    return saved_count
-
-
-start_time = time.time()
-print("Iniciando extração de rostos... Isso pode demorar.")
-
-total_saved = 0
-videos_processados = 0
-
-for label_folder in os.listdir(VIDEO_ROOT):
-    label_path = os.path.join(VIDEO_ROOT, label_folder)
-    
-    if os.path.isdir(label_path):
-        output_label_path = os.path.join(FRAME_ROOT, label_folder)
-        
-        video_files = [f for f in os.listdir(label_path) if f.endswith(('.mp4', '.avi', '.mov'))]
-        
-        if not video_files:
-            print(f"Nenhum vídeo (.mp4, .avi, .mov) encontrado em {label_path}")
-            continue
-            
-        print(f"\nProcessando pasta: {label_folder}")
-        
-        
-        for video_file in tqdm(video_files, desc=f"Pasta {label_folder}", unit="vídeo"):
-            video_path = os.path.join(label_path, video_file)
-            saved = process_video(video_path, output_label_path)
-            total_saved += saved
-            if saved > 0:
-                videos_processados += 1
-
-end_time = time.time()
-print("\n--- Processamento Concluído ---")
-print(f"Tempo total: {((end_time - start_time) / 60):.2f} minutos")
-print(f"Vídeos processados: {videos_processados}")
-print(f"Total de frames de rosto salvos: {total_saved}")
-print(f"Frames salvos em: {os.path.abspath(FRAME_ROOT)}")
\ No newline at end of file
+DETECTOR = "mtcnn"        # Detector de rostos: 'mtcnn', 'yunet' (OpenCV DNN) ou 'haar'
+BATCH_SIZE = 16           # Quantos frames amostrados são enviados juntos ao detector
+WORKERS = 1               # Quantos vídeos são processados em paralelo (um processo por vídeo)
+TRACK_EVERY = 0           # Modo de rastreamento: detecção completa só a cada N amostras (0 = desligado)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extração dos rostos dos vídeos de data/ para frames/hq.")
+    parser.add_argument("--detector", default=DETECTOR, choices=list(DETECTORS))
+    parser.add_argument("--sample-rate", type=int, default=SAMPLE_RATE)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--track-every", type=int, default=TRACK_EVERY, help="Detecção completa a cada N amostras; nas demais o rosto é rastreado")
+    parser.add_argument("--dedup-threshold", type=int, help="Agrupa os rostos quase idênticos de cada vídeo (hash perceptual) e grava frames/dedup_groups.csv")
+    parser.add_argument("--dedup-method", choices=dedup.METHODS, default="dhash")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.from_args(args)
+
+    start_time = time.time()
+    print(f"Iniciando extração de rostos (detector: {args.detector}, processos: {args.workers})... Isso pode demorar.")
+
+    with profiling.tf_profiler(args.tf_profile):
+        videos_processados, total_saved = extract_all(
+            VIDEO_ROOT, FRAME_ROOT,
+            detector_name=args.detector,
+            workers=args.workers,
+            progress=lambda it, total: tqdm(it, total=total, unit="vídeo"),
+            sample_rate=args.sample_rate,
+            img_size=IMG_SIZE,
+            pad=PAD,
+            batch_size=args.batch_size,
+            track_every=args.track_every,
+        )
+
+    end_time = time.time()
+    print("\n--- Processamento Concluído ---")
+    print(f"Tempo total: {((end_time - start_time) / 60):.2f} minutos")
+    print(f"Vídeos processados: {videos_processados}")
+    print(f"Total de frames de rosto salvos: {total_saved}")
+    print(f"Frames salvos em: {os.path.abspath(FRAME_ROOT)}")
+    if args.dedup_threshold is not None:
+        groups = dedup.load_groups(FRAME_ROOT, args.dedup_threshold, args.dedup_method)
+        print(f"Deduplicação: {len(groups.drop_duplicates(['label_str', 'video', 'group']))} grupos em {len(groups)} rostos "
+              f"(manifesto: {dedup.DEDUP_MANIFEST})")
+    profiling.finish(FRAME_ROOT, total_saved, "faces", detector=args.detector, workers=args.workers,
+                     videos=videos_processados, trace=args.trace)
@@ -1,62 +1,133 @@
 import os
-import cv2
-from tqdm import tqdm
+import sys
 import time
-import glob
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+from tqdm import tqdm
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline import profiling
+from pipeline.degrade import write_levels
+from pipeline.loader import find_images
 
 # --- Configurações ---
 HQ_FRAME_ROOT = "frames/hq"      # Pasta de ONDE VAMOS LER (os originais)
 BASE_OUTPUT_ROOT = "frames"      # Pasta base para as novas compressões
 QUALITIES = [60, 30, 10]         # Níveis de qualidade JPEG que vamos testar
+MANIFEST_FILE = os.path.join(BASE_OUTPUT_ROOT, "lq_manifest.csv")  # O que já foi gerado
+WORKERS = os.cpu_count() or 1
 
-#  Execução Principal 
-start_time = time.time()
-print(f"Iniciando criação de múltiplos níveis de compressão a partir de '{HQ_FRAME_ROOT}'...")
+MANIFEST_COLUMNS = ["source", "quality", "output", "src_mtime", "src_bytes", "out_bytes"]
 
-# 1. Encontrar TODAS as imagens HQ
-search_path = os.path.join(HQ_FRAME_ROOT, "**", "*.jpg")
-hq_image_files = glob.glob(search_path, recursive=True)
 
-if not hq_image_files:
-    print(f"ERRO: Nenhuma imagem .jpg encontrada em '{HQ_FRAME_ROOT}'. Verifique a pasta.")
-    exit()
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    df = pd.read_csv(path)
+    return {(row.source, row.quality): row._asdict() for row in df.itertuples(index=False)}
 
-print(f"Encontradas {len(hq_image_files)} imagens HQ para processar.\n")
 
-# 2. Processar para cada nível de qualidade
-for quality in QUALITIES:
-    current_lq_root = os.path.join(BASE_OUTPUT_ROOT, f"q{quality}")
-    print(f"Gerando imagens para Qualidade {quality}% em '{current_lq_root}'...")
-    
-    total_saved = 0
-    
-    for hq_image_path in tqdm(hq_image_files, desc=f"Qualidade {quality}", unit="imagem"):
-        try:
-            # Carrega a imagem HQ
-            img = cv2.imread(hq_image_path)
-            
-            if img is None:
+def save_manifest(manifest, path):
+    # Grava num temporário e troca: uma interrupção no meio não corrompe o manifesto anterior
+    tmp_path = path + ".tmp"
+    pd.DataFrame(list(manifest.values()), columns=MANIFEST_COLUMNS).to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def is_up_to_date(src_stat, out_path, record):
+    """A saída vale se existe, é mais nova que o HQ e o HQ não mudou de tamanho desde a última geração."""
+    if not os.path.exists(out_path) or os.path.getmtime(out_path) < src_stat.st_mtime:
+        return False
+    return record is None or record["src_bytes"] == src_stat.st_size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera as versões comprimidas (q60, q30, q10...) de frames/hq.")
+    parser.add_argument("--qualities", nargs="+", type=int, default=QUALITIES)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--force", action="store_true", help="Regrava tudo, mesmo o que já está atualizado")
+    profiling.add_arguments(parser, tensorflow=False)
+    args = parser.parse_args()
+    profiling.from_args(args)
+
+    start_time = time.time()
+    print(f"Iniciando criação de múltiplos níveis de compressão a partir de '{HQ_FRAME_ROOT}'...")
+
+    # 1. Encontrar TODAS as imagens HQ
+    hq_image_files = sorted(find_images(HQ_FRAME_ROOT))
+
+    if not hq_image_files:
+        print(f"ERRO: Nenhuma imagem .jpg encontrada em '{HQ_FRAME_ROOT}'. Verifique a pasta.")
+        sys.exit(1)
+
+    print(f"Encontradas {len(hq_image_files)} imagens HQ para processar.\n")
+
+    # 2. Planejar: para cada imagem HQ, quais qualidades ainda precisam ser geradas
+    manifest = load_manifest(MANIFEST_FILE)
+    jobs = {}
+    created_dirs = set()
+    for hq_image_path in hq_image_files:
+        src_stat = os.stat(hq_image_path)
+        relative_path = os.path.relpath(hq_image_path, HQ_FRAME_ROOT)
+        for quality in args.qualities:
+            lq_image_path = os.path.join(BASE_OUTPUT_ROOT, f"q{quality}", relative_path)
+            record = manifest.get((hq_image_path, quality))
+            if not args.force and is_up_to_date(src_stat, lq_image_path, record):
                 continue
 
-            # Cria o novo caminho de saída 
-            relative_path = os.path.relpath(hq_image_path, HQ_FRAME_ROOT)
-            lq_image_path = os.path.join(current_lq_root, relative_path)
-            
-            # Cria a pasta de destino
-            os.makedirs(os.path.dirname(lq_image_path), exist_ok=True)
-
-            # Define os parâmetros de compressão
-            compression_params = [cv2.IMWRITE_JPEG_QUALITY, quality]
-            
-            # Salva a imagem
-            cv2.imwrite(lq_image_path, img, compression_params)
-            total_saved += 1
-            
+            # Cria a pasta de destino (uma vez por pasta)
+            out_dir = os.path.dirname(lq_image_path)
+            if out_dir not in created_dirs:
+                os.makedirs(out_dir, exist_ok=True)
+                created_dirs.add(out_dir)
+            jobs.setdefault(hq_image_path, []).append((quality, lq_image_path))
+
+    pending = sum(len(outputs) for outputs in jobs.values())
+    print(f"{pending} imagens a gerar ({len(hq_image_files) * len(args.qualities) - pending} já atualizadas).\n")
+
+    # 3. Cada imagem HQ é lida uma única vez e gera todas as qualidades pendentes
+    total_saved = 0
+
+    def record(hq_image_path, future):
+        global total_saved
+        try:
+            written = profiling.result(future)
         except Exception as e:
             print(f"Erro ao processar imagem {hq_image_path}: {e}")
-    
-    print(f"Finalizado Qualidade {quality}: {total_saved} imagens salvas.\n")
+            return
+        src_stat = os.stat(hq_image_path)
+        for quality, lq_image_path, out_bytes in written:
+            manifest[(hq_image_path, quality)] = {
+                "source": hq_image_path, "quality": quality, "output": lq_image_path,
+                "src_mtime": src_stat.st_mtime, "src_bytes": src_stat.st_size, "out_bytes": out_bytes,
+            }
+            total_saved += 1
+
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = {profiling.submit(pool, write_levels, path, outputs): path for path, outputs in jobs.items()}
+            recorded = set()
+            try:
+                for future in tqdm(as_completed(futures), total=len(futures), unit="imagem"):
+                    record(futures[future], future)
+                    recorded.add(future)
+            except KeyboardInterrupt:
+                # Cancela o que ainda não começou e registra o que terminou enquanto o pool fechava
+                pool.shutdown(wait=True, cancel_futures=True)
+                for future, hq_image_path in futures.items():
+                    if future not in recorded and future.done() and not future.cancelled() \
+                            and future.exception() is None:
+                        record(hq_image_path, future)
+                raise
+    finally:
+        # 4. Manifesto com tudo o que foi gerado até agora (também se a execução for interrompida)
+        save_manifest(manifest, MANIFEST_FILE)
 
-end_time = time.time()
-print("--- Processamento de Todos os Níveis Concluído ---")
-print(f"Tempo total: {((end_time - start_time)):.2f} segundos")
\ No newline at end of file
+    end_time = time.time()
+    print("--- Processamento de Todos os Níveis Concluído ---")
+    print(f"Imagens salvas nesta execução: {total_saved}")
+    print(f"Manifesto salvo em: {MANIFEST_FILE}")
+    print(f"Tempo total: {((end_time - start_time)):.2f} segundos")
+    profiling.finish(MANIFEST_FILE, total_saved, "images", workers=args.workers, trace=args.trace)
@@ -3,18 +3,27 @@ import cv2
 import numpy as np
 import pandas as pd
 import glob
-from tensorflow.keras.preprocessing.image import img_to_array, ImageDataGenerator
+from tensorflow.keras.preprocessing.image import img_to_array
 from tensorflow.keras.applications import EfficientNetB0
 from tensorflow.keras.applications.efficientnet import preprocess_input
 from tensorflow.keras.layers import Dense, GlobalAveragePooling2D
 from tensorflow.keras.models import Model
 from tensorflow.keras.optimizers import Adam
 from sklearn.model_selection import train_test_split
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline import features
+from pipeline.datasets import make_dataset, augmentation, use_mixed_precision
 
 
 HQ_FRAME_ROOT = "frames/hq"
 IMAGE_SIZE = 224
 MODEL_SAVE_PATH = "models/efficientnet_model.keras" 
+FEATURE_CACHE = False  # True: treina só a cabeça sobre os embeddings do backbone congelado (pipeline/features.py)
+AUGMENT_VARIANTS = 4   # Cópias aumentadas (rotação/espelhamento) de cada imagem guardadas no cache
+TFDATA_CACHE = True    # Sem FEATURE_CACHE: imagens decodificadas ficam em memória após a 1ª época (ou um caminho de arquivo)
+MIXED_PRECISION = None # ex.: "mixed_float16" (GPU) ou "mixed_bfloat16" (CPU com bf16)
 
 search_path = os.path.join(HQ_FRAME_ROOT, "**", "*.jpg")
 hq_image_files = glob.glob(search_path, recursive=True)
@@ -22,18 +31,30 @@ data = [{"path": f, "label": (1 if f.split(os.path.sep)[-3] == "videos_fake" els
 df = pd.DataFrame(data)
 train_df, _ = train_test_split(df, test_size=0.2, random_state=42, stratify=df['label'])
 
+if MIXED_PRECISION:
+    use_mixed_precision(MIXED_PRECISION)
+
 base_model = EfficientNetB0(weights='imagenet', include_top=False, input_shape=(IMAGE_SIZE, IMAGE_SIZE, 3))
 base_model.trainable = False
 x = GlobalAveragePooling2D()(base_model.output)
 x = Dense(1024, activation='relu')(x)
-model = Model(inputs=base_model.input, outputs=Dense(1, activation='sigmoid')(x))
+model = Model(inputs=base_model.input, outputs=Dense(1, activation='sigmoid', dtype='float32')(x))
 model.compile(optimizer=Adam(learning_rate=0.001), loss='binary_crossentropy', metrics=['accuracy'])
 
-train_datagen = ImageDataGenerator(preprocessing_function=preprocess_input, rotation_range=10, horizontal_flip=True)
-train_gen = train_datagen.flow_from_dataframe(train_df, x_col='path', y_col='label', target_size=(IMAGE_SIZE, IMAGE_SIZE), batch_size=16, class_mode='raw')
+if FEATURE_CACHE:
+    # Embeddings calculados uma vez (e reaproveitados nas próximas execuções); só as Dense treinam
+    print("\nCalculando embeddings do EfficientNetB0 congelado...")
+    stores = features.extract(model, preprocess_input, train_df['path'].tolist(), train_df['label'].tolist(), IMAGE_SIZE,
+                              backbone=base_model.name, variants=1 + AUGMENT_VARIANTS)
+    print("\nIniciando Treinamento EfficientNetB0 (cabeça, a partir do cache)...")
+    features.fit_head(model, stores, train_df['label'].to_numpy(), epochs=5, batch_size=16)
+else:
+    # tf.data: decodificação em paralelo, cache, aumento de dados no lote inteiro e prefetch
+    train_ds = make_dataset(train_df['path'].tolist(), IMAGE_SIZE, batch_size=16, shuffle=True, cache=TFDATA_CACHE,
+                            augment=augmentation(), preprocess=preprocess_input)
 
-print("\nIniciando Treinamento EfficientNetB0...")
-model.fit(train_gen, epochs=5)
+    print("\nIniciando Treinamento EfficientNetB0...")
+    model.fit(train_ds, epochs=5)
 
 model.save(MODEL_SAVE_PATH)
 print(f"Modelo salvo em: {MODEL_SAVE_PATH}")
\ No newline at end of file
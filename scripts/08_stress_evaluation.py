@@ -1,89 +1,108 @@
 import os
 import sys
-import cv2
-import numpy as np
 import pandas as pd
-import glob
-from tqdm import tqdm
-import tensorflow as tf
-from tensorflow.keras.models import load_model
 
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from models.mesonet_model import Meso4
+from pipeline import dedup, profiling
+from pipeline.evaluation import evaluate, sort_by_model, RESULT_COLUMNS
+from pipeline.registry import get_models
+from pipeline.results import ResultsWriter
+from pipeline.score_cache import ScoreCache
+from pipeline.backends import backend_name, make_engine
+from pipeline.inference import benchmark_engine
+from pipeline.metrics import frame_metrics
 
 IMAGE_ROOT = "frames"
 SCENARIOS = ["hq", "q60", "q30", "q10"]
 FINAL_RESULTS_FILE = "results_ESTRESSE_COMPLETO.csv"
+BATCH_SIZE = 64
+RESUME = True  # Pula os frames que já têm score gravado em <FINAL_RESULTS_FILE>.parts/
+SPLIT = None  # 'test' avalia só os vídeos de teste do manifesto (scripts/09_split_data.py); None = todos
 
-# funções de pré-processamento específicas de cada modelo
-from tensorflow.keras.applications.xception import preprocess_input as prep_xception
-from tensorflow.keras.applications.mobilenet_v2 import preprocess_input as prep_mobilenet
-from tensorflow.keras.applications.efficientnet import preprocess_input as prep_efficient
+# Modelos treinados (05-07) + MesoNet pré-treinado; ver pipeline/registry.py
+MODELS = ["Xception", "MobileNetV2", "EfficientNetB0", "MesoNet_DF"]
+RENAME = {"MesoNet_DF": "MesoNet (Incompatível)"}
 
-MODELS_INFO = [
-    {"name": "Xception", "path": "models/xception_model.keras", "size": 299, "prep": prep_xception},
-    {"name": "MobileNetV2", "path": "models/mobilenet_model.keras", "size": 224, "prep": prep_mobilenet},
-    {"name": "EfficientNetB0", "path": "models/efficientnet_model.keras", "size": 224, "prep": prep_efficient}
-]
+# Runtimes de inferência (pipeline/backends.py). Os não-Keras usam os modelos
+# exportados por scripts/16_export_models.py, ex.: ["keras", "tflite", "tflite-int8"]
+BACKENDS = ["keras"]
+BACKEND_COMPARISON_FILE = "comparacao_backends.csv"
+BENCHMARK_FRAMES = 256
 
-results_list = []
+# Cache de scores por conteúdo do frame + pesos do modelo (pipeline/score_cache.py):
+# numa nova rodada, só os frames novos ou alterados passam pela inferência. None = desligado
+SCORE_CACHE = "cache/scores.sqlite"
+SCORE_CACHE_MB = 512
 
-print("--- INICIANDO AVALIAÇÃO DE ESTRESSE RECURSIVA ---")
+# Deduplicação (pipeline/dedup.py): só um frame por grupo de rostos quase idênticos
+# (hash perceptual a até N bits) é avaliado; os outros herdam o score. None = desligado
+DEDUP_THRESHOLD = None
+
+# Medição por etapa (pipeline/profiling.py): grava <FINAL_RESULTS_FILE>.profile.json
+PROFILE = False
+TRACE_FILE = None      # ex.: "trace_estresse.json" (chrome://tracing)
+TF_PROFILE_DIR = None  # ex.: "logs/profile" (TensorBoard)
 
-# 1. AVALIAÇÃO DOS MODELOS TREINADOS
-for m_info in MODELS_INFO:
-    print(f"\n>>> Avaliando Modelo: {m_info['name']}")
-    if not os.path.exists(m_info['path']):
-        print(f"Erro: Arquivo {m_info['path']} não encontrado!")
-        continue
-    
-    model = load_model(m_info['path'])
-    
-    for scenario in SCENARIOS:
-        
-        search_pattern = os.path.join(IMAGE_ROOT, scenario, "**", "*.jpg")
-        image_paths = glob.glob(search_pattern, recursive=True)
-        
-        if not image_paths:
-            print(f"Aviso: Nenhuma imagem encontrada em {scenario}")
-            continue
+print("--- INICIANDO AVALIAÇÃO DE ESTRESSE RECURSIVA ---")
+if PROFILE or TRACE_FILE:
+    profiling.enable(trace=bool(TRACE_FILE))
 
-        print(f"   Processando {scenario}: {len(image_paths)} imagens")
-        
-        for img_path in tqdm(image_paths, desc=f"      {scenario}", leave=False):
-            # Identifica se é real ou fake pelo caminho da pasta
-            label = 1 if "videos_fake" in img_path else 0
-            
-            img = cv2.imread(img_path)
-            img = cv2.resize(img, (m_info['size'], m_info['size']))
-            img_array = np.expand_dims(img.astype(np.float32), axis=0)
-            img_array = m_info['prep'](img_array) # Usa o pré-processamento correto
-            
-            score = model.predict(img_array, verbose=0)[0][0]
-            results_list.append({"model": m_info['name'], "scenario": scenario, "label": label, "score": score})
+# 1. AVALIAÇÃO DE TODOS OS MODELOS (cada frame é lido uma vez por tamanho de entrada)
+model_infos = get_models(MODELS, rename=RENAME)
+score_cache = ScoreCache(SCORE_CACHE, SCORE_CACHE_MB) if SCORE_CACHE else None
+dedup_groups = None
+if DEDUP_THRESHOLD is not None:
+    dedup_groups = dedup.load_groups(os.path.join(IMAGE_ROOT, "hq"), DEDUP_THRESHOLD,
+                                     path=os.path.join(IMAGE_ROOT, os.path.basename(dedup.DEDUP_MANIFEST)))
+with ResultsWriter(FINAL_RESULTS_FILE, RESULT_COLUMNS, resume=RESUME) as writer, profiling.tf_profiler(TF_PROFILE_DIR):
+    for backend in BACKENDS:
+        print(f"\n=== Backend: {backend} ===")
+        df = evaluate(model_infos, SCENARIOS, image_root=IMAGE_ROOT, batch_size=BATCH_SIZE,
+                      split=SPLIT, writer=writer, backend=backend, score_cache=score_cache,
+                      dedup_groups=dedup_groups)
+if score_cache is not None:
+    score_cache.close()
+    print(f"\n{score_cache.summary()}")
+df = sort_by_model(df, [backend_name(m['name'], b) for b in BACKENDS for m in model_infos])
 
-# 2. AVALIAÇÃO DO MESONET
-print("\n>>> Avaliando Modelo: MesoNet (Pré-treinado)")
-model_meso = Meso4(input_shape=(256, 256, 3))
-weights_path = "models/Meso4_DF.h5"
+# 2. SALVAR
+df[["model", "scenario", "label", "score"]].to_csv(FINAL_RESULTS_FILE, index=False)
+print(f"\n--- SUCESSO! Resultados salvos em: {FINAL_RESULTS_FILE} ---")
+profiling.finish(FINAL_RESULTS_FILE, len(df), trace=TRACE_FILE, backends=BACKENDS, batch_size=BATCH_SIZE,
+                 models=MODELS, scenarios=SCENARIOS)
 
-if os.path.exists(weights_path):
-    model_meso.load_weights(weights_path)
-    for scenario in SCENARIOS:
-        search_pattern = os.path.join(IMAGE_ROOT, scenario, "**", "*.jpg")
-        image_paths = glob.glob(search_pattern, recursive=True)
-        
-        for img_path in tqdm(image_paths, desc=f"      {scenario}", leave=False):
-            label = 1 if "videos_fake" in img_path else 0
-            img = cv2.resize(cv2.imread(img_path), (256, 256))
-            img = np.expand_dims(img / 255.0, axis=0) # MesoNet normaliza 0-1
-            score = model_meso.predict(img, verbose=0)[0][0]
-            results_list.append({"model": "MesoNet (Incompatível)", "scenario": scenario, "label": label, "score": score})
-else:
-    print("Pesos do MesoNet não encontrados.")
+# 3. COMPARAÇÃO ENTRE BACKENDS: diferença de acurácia/AUC para o Keras em cada
+# nível de compressão, latência (lote de 1 frame) e vazão (lote de BATCH_SIZE)
+if len(BACKENDS) > 1 and not df.empty:
+    metrics = frame_metrics(df)
+    metrics["model"] = metrics["model"].astype(str)
+    rows = []
+    for m_info in model_infos:
+        reference = metrics[metrics["model"] == backend_name(m_info['name'], "keras")].set_index("scenario")
+        for backend in BACKENDS:
+            current = metrics[metrics["model"] == backend_name(m_info['name'], backend)].set_index("scenario")
+            if current.empty:
+                continue
+            try:
+                engine = make_engine(m_info, backend)
+            except Exception as e:
+                print(f"Erro: {e}")
+                continue
+            size = m_info['size']
+            bench = {r['batch_size']: r for r in benchmark_engine(engine, (size, size, 3), [1, BATCH_SIZE], BENCHMARK_FRAMES)}
+            for scenario, row in current.iterrows():
+                rows.append({
+                    "model": m_info['name'], "backend": backend, "scenario": scenario,
+                    "accuracy": row["accuracy"], "auc": row["auc"],
+                    "accuracy_delta": row["accuracy"] - reference["accuracy"].get(scenario, float("nan")),
+                    "auc_delta": row["auc"] - reference["auc"].get(scenario, float("nan")),
+                    "latency_ms": bench[1]["latency_ms"],
+                    "frames_per_sec": bench[BATCH_SIZE]["frames_per_sec"],
+                })
 
-# 3. SALVAR 
-df = pd.DataFrame(results_list)
-df.to_csv(FINAL_RESULTS_FILE, index=False)
-print(f"\n--- SUCESSO! Resultados salvos em: {FINAL_RESULTS_FILE} ---")
\ No newline at end of file
+    comparison = pd.DataFrame(rows)
+    comparison.to_csv(BACKEND_COMPARISON_FILE, index=False)
+    print("\n--- COMPARAÇÃO ENTRE BACKENDS ---")
+    print(comparison.to_string(index=False, float_format="%.4f"))
+    print(f"Salvo em: {BACKEND_COMPARISON_FILE}")
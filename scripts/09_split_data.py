@@ -1,43 +1,29 @@
 import os
-import shutil
-import random
+import sys
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline.split import make_split, SPLIT_MANIFEST
 
 BASE_DIR = "frames"
-SCENARIOS = ["hq", "q60", "q30", "q10"]
 TRAIN_SPLIT = 0.65
-OUTPUT_DIR = "frames_split"
-
-# Limpar execução anterior 
-if os.path.exists(OUTPUT_DIR):
-    print(f"Limpando pasta antiga {OUTPUT_DIR}...")
-    shutil.rmtree(OUTPUT_DIR)
-
-# Processar cada classe (Real e Fake) 
-for label in ["videos_real", "videos_fake"]:
-    sample_path = os.path.join(BASE_DIR, "hq", label)
-    
-    if not os.path.exists(sample_path):
-        print(f"Aviso: Pasta {sample_path} não encontrada. Pulando...")
-        continue
+SEED = 42                        # Semente fixa: a divisão é reproduzível
+OUTPUT_FILE = SPLIT_MANIFEST     # Manifesto vídeo -> treino/teste (nenhum frame é copiado)
 
-    
-    video_ids = [d for d in os.listdir(sample_path) if os.path.isdir(os.path.join(sample_path, d))]
-    random.shuffle(video_ids)
+parser = argparse.ArgumentParser(description="Divide os vídeos em treino/teste e salva o manifesto.")
+parser.add_argument("--base-dir", default=BASE_DIR)
+parser.add_argument("--train-split", type=float, default=TRAIN_SPLIT)
+parser.add_argument("--seed", type=int, default=SEED)
+parser.add_argument("--output", default=OUTPUT_FILE)
+args = parser.parse_args()
 
-    split_idx = int(len(video_ids) * TRAIN_SPLIT)
-    train_ids = video_ids[:split_idx]
-    
-    print(f"Classe {label}: Total {len(video_ids)} | Treino {len(train_ids)} | Teste {len(video_ids)-len(train_ids)}")
+# A divisão vale para todos os cenários (hq, q60, q30, q10): o mesmo vídeo
+# fica sempre do mesmo lado, evitando vazamento de dados entre treino e teste.
+df = make_split(args.base_dir, train_split=args.train_split, seed=args.seed)
 
-    for scenario in SCENARIOS:
-        for vid in video_ids:
-            src = os.path.join(BASE_DIR, scenario, label, vid)
-            if not os.path.exists(src): continue
-            
-            category = "train" if vid in train_ids else "test"
-            dest = os.path.join(OUTPUT_DIR, category, scenario, label, vid)
-            
-            os.makedirs(os.path.dirname(dest), exist_ok=True)
-            shutil.copytree(src, dest, dirs_exist_ok=True)
+if df.empty:
+    print("Nenhum vídeo encontrado. Verifique a pasta de frames.")
+    sys.exit(1)
 
-print("\n--- SUCESSO! Verifique se 'frames_split' agora tem as duas pastas em cada cenário ---")
\ No newline at end of file
+df.to_csv(args.output, index=False)
+print(f"\n--- SUCESSO! Divisão salva em '{args.output}' ({len(df)} vídeos) ---")
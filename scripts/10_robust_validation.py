@@ -1,59 +1,82 @@
-import tensorflow as tf
 from tensorflow.keras import layers, models
 from tensorflow.keras.applications import EfficientNetB0
 import pandas as pd
 import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline.datasets import make_dataset, throughput
+from pipeline.split import split_images, SPLIT_MANIFEST
 
 IMG_SIZE = 224
-TRAIN_DIR = "frames_split/train/hq"
-TEST_ROOT = "frames_split/test"
+BASE_DIR = "frames"
+SPLIT_FILE = SPLIT_MANIFEST  # Gerado pelo scripts/09_split_data.py
+EPOCHS = 3
+TIMES_FILE = "TEMPOS_VALIDACAO_ROBUSTEZ.csv"
 
-def build_model():
+def build_model(name):
     base = EfficientNetB0(weights='imagenet', include_top=False, input_shape=(IMG_SIZE, IMG_SIZE, 3))
     x = layers.GlobalAveragePooling2D()(base.output)
     x = layers.Dense(1, activation='sigmoid')(x)
-    return models.Model(base.input, x)
+    return models.Model(base.input, x, name=name)
+
+start_time = time.time()
+times = []
 
-# 1. Carregar Treino 
+# 1. Carregar Treino (decodificado uma vez: as épocas seguintes leem do cache em memória)
 print("\n>>> Carregando dados de treino...")
-train_ds = tf.keras.utils.image_dataset_from_directory(
-    TRAIN_DIR, 
-    image_size=(IMG_SIZE, IMG_SIZE), 
+train_ds = make_dataset(
+    split_images("hq", "train", BASE_DIR, SPLIT_FILE),
+    IMG_SIZE,
     batch_size=32,
-    label_mode='binary' 
+    shuffle=True,
+    cache=True
 )
+n_images, seconds, _ = throughput(train_ds)
+times.append({"etapa": "leitura do treino (JPEG -> cache)", "imagens": n_images, "segundos": seconds})
 
-# 2. Treino Padrão
-print("\n>>> Treinando Modelo Padrão (Sem aumento de dados)...")
-model_std = build_model()
-model_std.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
-model_std.fit(train_ds, epochs=3)
-
-# 3. Treino Robusto 
-print("\n>>> Treinando Modelo Robusto (Com Simulação de Compressão)...")
+# 2 e 3. Modelos Padrão e Robusto treinados juntos, com os mesmos lotes: um
+# modelo de duas saídas. O ramo robusto aplica a simulação de compressão
+# (contraste + ruído, ativos só no treino) antes do seu EfficientNet; como os
+# pesos dos dois ramos são separados, é o mesmo que treinar cada um sozinho.
+print("\n>>> Treinando Modelo Padrão (Sem aumento de dados) e Modelo Robusto (Com Simulação de Compressão)...")
 augmentation = models.Sequential([
     layers.RandomContrast(0.2),
-    layers.GaussianNoise(0.1) 
-])
+    layers.GaussianNoise(0.1)
+], name="simulacao_compressao")
 
-model_robust = build_model()
-model_robust.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
-train_ds_robust = train_ds.map(lambda x, y: (augmentation(x), y))
-model_robust.fit(train_ds_robust, epochs=3)
+inputs = layers.Input(shape=(IMG_SIZE, IMG_SIZE, 3))
+model_std = build_model("padrao")
+model_robust = build_model("robusto")
+dual = models.Model(inputs, [model_std(inputs), model_robust(augmentation(inputs))])
+dual.compile(optimizer='adam', loss=['binary_crossentropy', 'binary_crossentropy'],
+             metrics=[['accuracy'], ['accuracy']])
 
-# 4. Avaliação Cruzada
+two_heads = lambda x, y: (x, (y, y))
+step_start = time.time()
+dual.fit(train_ds.map(two_heads), epochs=EPOCHS)
+times.append({"etapa": f"treino dos dois modelos ({EPOCHS} épocas)", "imagens": n_images * EPOCHS, "segundos": time.time() - step_start})
+
+# 4. Avaliação Cruzada (cada cenário é decodificado uma vez para os dois modelos)
 results = []
 for scenario in ["hq", "q60", "q30", "q10"]:
-    test_ds = tf.keras.utils.image_dataset_from_directory(
-        os.path.join(TEST_ROOT, scenario),
-        image_size=(IMG_SIZE, IMG_SIZE),
-        label_mode='binary'
-    )
-    acc_std = model_std.evaluate(test_ds, verbose=0)[1]
-    acc_robust = model_robust.evaluate(test_ds, verbose=0)[1]
+    test_ds = make_dataset(split_images(scenario, "test", BASE_DIR, SPLIT_FILE), IMG_SIZE, cache=True)
+    n_test, seconds, _ = throughput(test_ds)
+    times.append({"etapa": f"leitura do teste {scenario}", "imagens": n_test, "segundos": seconds})
+
+    scores = dual.evaluate(test_ds.map(two_heads), verbose=0, return_dict=True)
+    acc_std = scores[next(k for k in scores if k.startswith("padrao") and k.endswith("accuracy"))]
+    acc_robust = scores[next(k for k in scores if k.startswith("robusto") and k.endswith("accuracy"))]
     results.append({"Cenário": scenario, "Acurácia_Padrão": acc_std, "Acurácia_Robusta": acc_robust})
 
+times.append({"etapa": "total", "imagens": None, "segundos": time.time() - start_time})
+
 df = pd.DataFrame(results)
 df.to_csv("VALIDACAO_ROBUSTEZ_FINAL.csv", index=False)
+df_times = pd.DataFrame(times).astype({"imagens": "Int64"})
+df_times.to_csv(TIMES_FILE, index=False)
 print("\n--- RESULTADO FINAL ---")
-print(df)
\ No newline at end of file
+print(df)
+print("\n--- TEMPOS ---")
+print(df_times.to_string(index=False, float_format="%.2f"))
@@ -0,0 +1,30 @@
+import os
+import sys
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline import registry
+from pipeline.inference import benchmark, BENCHMARK_BATCH_SIZES
+
+# Mede a vazão (frames/segundo) de cada modelo para vários tamanhos de lote
+N_FRAMES = 512
+BENCHMARK_FILE = "benchmark_inferencia.csv"
+
+rows = []
+for m_info in registry.MODELS.values():
+    try:
+        model = registry.load(m_info)
+    except Exception as e:
+        print(f"Aviso: {e} Pulando {m_info['name']}.")
+        continue
+
+    print(f"\n>>> Benchmark: {m_info['name']}")
+    for row in benchmark(model, batch_sizes=BENCHMARK_BATCH_SIZES, n_frames=N_FRAMES):
+        print(f"   batch {row['batch_size']:>4}: {row['frames_per_sec']:8.1f} frames/s")
+        rows.append({"model": m_info['name'], **row})
+
+if rows:
+    pd.DataFrame(rows).to_csv(BENCHMARK_FILE, index=False)
+    print(f"\nResultados do benchmark salvos em: {BENCHMARK_FILE}")
+else:
+    print("Nenhum modelo encontrado para o benchmark.")
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline import dedup, profiling
+from pipeline.evaluation import evaluate, RESULT_COLUMNS
+from pipeline.registry import MODELS, get_models
+from pipeline.results import ResultsWriter
+from pipeline.score_cache import ScoreCache, SCORE_CACHE_PATH, DEFAULT_MAX_MB
+from pipeline.backends import BACKENDS
+
+# Ponto de entrada único: avalia N modelos do registro x M cenários de compressão
+parser = argparse.ArgumentParser(description="Avaliação de modelos do registro (pipeline/registry.py) nos cenários de compressão.")
+parser.add_argument("--models", nargs="+", default=list(MODELS), choices=list(MODELS), help="Modelos do registro a avaliar")
+parser.add_argument("--scenarios", nargs="+", default=["hq", "q60", "q30", "q10"], help="Sub-pastas de --image-root; 'qN' sem pasta é gerado em memória a partir de hq")
+parser.add_argument("--image-root", default="frames")
+parser.add_argument("--batch-size", type=int, default=64)
+parser.add_argument("--backend", choices=BACKENDS, default="keras", help="Runtime de inferência; os não-Keras usam os modelos de scripts/16_export_models.py")
+parser.add_argument("--output", default="results_AVALIACAO.csv")
+parser.add_argument("--degrade-in-memory", action="store_true", help="Gera todos os cenários 'qN' em memória a partir de hq, mesmo que a pasta exista")
+parser.add_argument("--split", choices=["train", "test"], help="Avalia só os vídeos desse lado do manifesto (scripts/09_split_data.py)")
+parser.add_argument("--fresh", action="store_true", help="Descarta os scores gravados por uma execução anterior (<output>.parts/)")
+parser.add_argument("--no-cache", action="store_true", help="Ignora o cache decodificado (scripts/13_build_frame_cache.py)")
+parser.add_argument("--score-cache", default=SCORE_CACHE_PATH, help="Cache de scores por conteúdo do frame e pesos do modelo (SQLite)")
+parser.add_argument("--score-cache-mb", type=float, default=DEFAULT_MAX_MB, help="Tamanho máximo do cache de scores")
+parser.add_argument("--dedup-threshold", type=int, help="Avalia só um frame por grupo de rostos quase idênticos (distância de Hamming do hash <= N)")
+parser.add_argument("--dedup-method", choices=dedup.METHODS, default="dhash")
+parser.add_argument("--no-score-cache", action="store_true", help="Roda a inferência em todos os frames, sem consultar o cache de scores")
+profiling.add_arguments(parser)
+args = parser.parse_args()
+profiling.from_args(args)
+
+start_time = time.time()
+print(f"--- AVALIANDO {len(args.models)} MODELOS x {len(args.scenarios)} CENÁRIOS ---")
+
+dedup_groups = None
+if args.dedup_threshold is not None:
+    dedup_groups = dedup.load_groups(os.path.join(args.image_root, "hq"), args.dedup_threshold, args.dedup_method,
+                                     os.path.join(args.image_root, os.path.basename(dedup.DEDUP_MANIFEST)))
+score_cache = None if args.no_score_cache else ScoreCache(args.score_cache, args.score_cache_mb)
+with ResultsWriter(args.output, RESULT_COLUMNS, resume=not args.fresh) as writer, profiling.tf_profiler(args.tf_profile):
+    df = evaluate(get_models(args.models), args.scenarios, image_root=args.image_root, batch_size=args.batch_size,
+                  use_cache=not args.no_cache, degrade_in_memory=args.degrade_in_memory, split=args.split,
+                  writer=writer, backend=args.backend, score_cache=score_cache,
+                  dedup_groups=dedup_groups)
+if score_cache is not None:
+    score_cache.close()
+    print(f"\n{score_cache.summary()}")
+
+if df.empty:
+    print("Nenhum resultado foi gerado. Verifique as pastas de frames e os arquivos dos modelos.")
+    sys.exit(1)
+
+df.to_csv(args.output, index=False)
+print(f"\nTempo total: {((time.time() - start_time) / 60):.2f} minutos")
+print(f"--- SUCESSO! Resultados salvos em: {args.output} ---")
+profiling.finish(args.output, len(df), backend=args.backend, batch_size=args.batch_size,
+                 models=args.models, scenarios=args.scenarios, trace=args.trace)
@@ -0,0 +1,27 @@
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline import frame_cache
+
+# Gera o cache decodificado (.npy com memória mapeada) de cada cenário em cada tamanho de entrada
+parser = argparse.ArgumentParser(description="Cria/atualiza o cache das imagens decodificadas de frames/.")
+parser.add_argument("--scenarios", nargs="+", default=["hq", "q60", "q30", "q10"])
+parser.add_argument("--sizes", nargs="+", type=int, default=[256, 299, 224], help="256 = MesoNet, 299 = Xception, 224 = MobileNetV2/EfficientNetB0")
+parser.add_argument("--image-root", default="frames")
+parser.add_argument("--cache-root", default=frame_cache.CACHE_ROOT)
+parser.add_argument("--force", action="store_true", help="Recria mesmo se o cache estiver válido")
+args = parser.parse_args()
+
+start_time = time.time()
+for scenario in args.scenarios:
+    for size in args.sizes:
+        if not args.force and frame_cache.is_valid(scenario, size, args.image_root, args.cache_root):
+            print(f"Cache {scenario} {size}px já está atualizado. Pulando.")
+            continue
+        saved = frame_cache.build(scenario, size, args.image_root, args.cache_root)
+        print(f"Cache {scenario} {size}px: {saved} imagens salvas em {frame_cache.cache_paths(scenario, size, args.cache_root)[0]}")
+
+print(f"\nTempo total: {(time.time() - start_time):.2f} segundos")
@@ -0,0 +1,37 @@
+import os
+import sys
+import glob
+import argparse
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline.metrics import load_results, frame_metrics, video_scores, bootstrap_ci, GROUP_KEYS
+
+# Métricas de todos os modelos x cenários de uma vez (acurácia, AUC, EER, TPR@FPR, matriz de confusão)
+parser = argparse.ArgumentParser(description="Calcula as métricas de todos os arquivos de resultados.")
+parser.add_argument("files", nargs="*", help="CSVs de resultados (padrão: results*.csv)")
+parser.add_argument("--video", choices=["mean", "median"], help="Métricas por vídeo (média ou mediana dos scores dos frames)")
+parser.add_argument("--bootstrap", type=int, default=0, help="Número de reamostragens para os intervalos de confiança (0 = sem)")
+parser.add_argument("--output", default="METRICAS.csv")
+args = parser.parse_args()
+
+files = args.files or sorted(glob.glob("results*.csv"))
+# CSVs sem a coluna "model" (ex.: results.csv) usam o nome do arquivo como modelo
+df = load_results({os.path.splitext(os.path.basename(f))[0]: f for f in files})
+if df.empty:
+    print("Nenhum resultado encontrado.")
+    sys.exit(1)
+
+if args.video:
+    df = df[df["video"].notna()] if "video" in df else df
+    df = video_scores(df, agg=args.video)
+
+metrics = frame_metrics(df)
+if args.bootstrap:
+    metrics = metrics.merge(bootstrap_ci(df, n_boot=args.bootstrap), on=GROUP_KEYS)
+
+metrics.to_csv(args.output, index=False)
+with pd.option_context("display.max_columns", None, "display.width", 200):
+    print(metrics)
+print(f"\n--- Métricas salvas em: {args.output} ---")
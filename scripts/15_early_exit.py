@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+import argparse
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline import registry
+from pipeline.early_exit import group_by_video, score_videos
+from pipeline.inference import BatchInference
+from pipeline.loader import find_images, load_image
+from pipeline.metrics import frame_metrics
+
+# Veredito por vídeo com parada antecipada, comparado com a avaliação de todos os frames
+parser = argparse.ArgumentParser(description="Avaliação por vídeo com parada antecipada (early exit) x avaliação completa.")
+parser.add_argument("--models", nargs="+", default=["Xception", "MobileNetV2", "EfficientNetB0", "MesoNet_DF"], choices=list(registry.MODELS))
+parser.add_argument("--scenarios", nargs="+", default=["hq", "q60", "q30", "q10"])
+parser.add_argument("--image-root", default="frames")
+parser.add_argument("--step", type=int, default=4, help="Frames por vídeo a cada rodada")
+parser.add_argument("--min-frames", type=int, default=4, help="Mínimo de frames antes de decidir")
+parser.add_argument("--z", type=float, default=1.96, help="Largura do intervalo de confiança (1.96 = 95%%)")
+parser.add_argument("--no-benchmark", action="store_true", help="Não roda a avaliação completa de referência")
+parser.add_argument("--output", default="results_VIDEO_EARLY_EXIT.csv")
+parser.add_argument("--summary", default="BENCHMARK_EARLY_EXIT.csv")
+args = parser.parse_args()
+
+modes = ["early_exit"] if args.no_benchmark else ["early_exit", "full"]
+video_rows, summary = [], []
+
+for m_info in registry.get_models(args.models):
+    try:
+        model = registry.load(m_info)
+    except Exception as e:
+        print(f"Erro: {e}")
+        continue
+    engine = BatchInference(model)
+    # Aquecimento: a compilação do grafo não entra no tempo de nenhum dos modos
+    engine.predict_batch(np.zeros((1, m_info['size'], m_info['size'], 3), dtype=np.float32))
+    load_fn = partial(load_image, size=m_info['size'], prep=m_info['prep'])
+
+    for scenario in args.scenarios:
+        videos = group_by_video(find_images(os.path.join(args.image_root, scenario)))
+        if not videos:
+            print(f"Aviso: Nenhuma imagem encontrada em {scenario}")
+            continue
+
+        for mode in modes:
+            start = time.perf_counter()
+            rows = list(score_videos(videos, engine, load_fn, step=args.step, min_frames=args.min_frames,
+                                     z=args.z, full=(mode == "full")))
+            elapsed = time.perf_counter() - start
+
+            df = pd.DataFrame(rows).assign(model=m_info['name'], scenario=scenario, mode=mode)
+            video_rows.append(df)
+            metrics = frame_metrics(df).iloc[0]
+            summary.append({
+                "model": m_info['name'], "scenario": scenario, "mode": mode, "videos": len(df),
+                "frames_used": int(df["frames_used"].sum()), "frames_total": int(df["frames_total"].sum()),
+                "seconds": elapsed, "accuracy": metrics["accuracy"], "auc": metrics["auc"],
+            })
+            print(f"{m_info['name']:>15} {scenario:>4} {mode:>10}: {summary[-1]['frames_used']:>6} frames, "
+                  f"acc {metrics['accuracy']:.3f}, {elapsed:.1f}s")
+
+if not summary:
+    print("Nenhum resultado foi gerado.")
+    sys.exit(1)
+
+pd.concat(video_rows, ignore_index=True).to_csv(args.output, index=False)
+summary = pd.DataFrame(summary)
+if not args.no_benchmark:
+    # Quanto se economiza de frames e quanto se perde de acurácia em relação à avaliação completa
+    full = summary[summary["mode"] == "full"].set_index(["model", "scenario"])
+    early = summary[summary["mode"] == "early_exit"].set_index(["model", "scenario"])
+    early = early.assign(frames_saved=1 - early["frames_used"] / full["frames_used"],
+                         accuracy_delta=early["accuracy"] - full["accuracy"],
+                         auc_delta=early["auc"] - full["auc"])
+    summary = pd.concat([early.reset_index(), full.reset_index()], ignore_index=True)
+summary.to_csv(args.summary, index=False)
+print(f"\nScores por vídeo salvos em: {args.output}")
+print(f"Resumo (frames economizados x acurácia perdida) salvo em: {args.summary}")
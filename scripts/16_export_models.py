@@ -0,0 +1,48 @@
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline import registry
+from pipeline.backends import exported_path, EXPORT_DIR
+from pipeline.export import calibration_frames, export_tflite, export_onnx
+
+# Exporta os modelos do registro para TFLite ou ONNX (para --backend nos scripts de avaliação)
+parser = argparse.ArgumentParser(description="Exporta os modelos do registro (pipeline/registry.py) para TFLite/ONNX.")
+parser.add_argument("--models", nargs="+", default=list(registry.MODELS), choices=list(registry.MODELS))
+parser.add_argument("--format", choices=["tflite", "onnx"], default="tflite")
+parser.add_argument("--int8", action="store_true", help="Quantização int8 pós-treinamento (só TFLite), calibrada em --calibration-root")
+parser.add_argument("--calibration-root", default="frames/hq")
+parser.add_argument("--calibration-frames", type=int, default=200)
+args = parser.parse_args()
+
+if args.int8 and args.format != "tflite":
+    parser.error("--int8 só está disponível com --format tflite")
+
+backend = "tflite-int8" if args.int8 else args.format
+print(f"--- EXPORTANDO {len(args.models)} MODELOS ({backend}) PARA {EXPORT_DIR}/ ---")
+
+for name in args.models:
+    m_info = registry.MODELS[name]
+    print(f"\n>>> {name}")
+    try:
+        model = registry.load(m_info)
+    except Exception as e:
+        print(f"Erro: {e}")
+        continue
+
+    out_path = exported_path(m_info, backend)
+    if args.format == "onnx":
+        export_onnx(model, out_path)
+    else:
+        calibration = None
+        if args.int8:
+            calibration = calibration_frames(m_info, args.calibration_root, args.calibration_frames)
+            print(f"   Calibrando com {len(calibration)} frames de {args.calibration_root}")
+        export_tflite(model, out_path, calibration=calibration)
+
+    original_mb = os.path.getsize(m_info['path']) / 1e6
+    exported_mb = os.path.getsize(out_path) / 1e6
+    print(f"   Salvo em {out_path} ({original_mb:.1f} MB -> {exported_mb:.1f} MB)")
+
+print("\n--- EXPORTAÇÃO CONCLUÍDA ---")
@@ -0,0 +1,59 @@
+import os
+import sys
+import glob
+import argparse
+
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from tensorflow.keras.preprocessing.image import ImageDataGenerator
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline.datasets import make_dataset, augmentation, throughput
+
+# Vazão (imagens/segundo) da entrada do treino: ImageDataGenerator antigo x tf.data (pipeline/datasets.py)
+parser = argparse.ArgumentParser(description="Compara a vazão do ImageDataGenerator com a do pipeline tf.data.")
+parser.add_argument("--frame-root", default="frames/hq")
+parser.add_argument("--image-size", type=int, default=299)
+parser.add_argument("--batch-size", type=int, default=16)
+parser.add_argument("--batches", type=int, default=200, help="Lotes medidos por variante (limitado ao tamanho do treino)")
+parser.add_argument("--output", default="benchmark_entrada_treino.csv")
+args = parser.parse_args()
+
+# Mesmo conjunto de treino dos scripts 05-07
+hq_image_files = glob.glob(os.path.join(args.frame_root, "**", "*.jpg"), recursive=True)
+data = [{"path": f, "label": (1 if f.split(os.path.sep)[-3] == "videos_fake" else 0)} for f in hq_image_files]
+df = pd.DataFrame(data)
+if df.empty:
+    print(f"Nenhuma imagem encontrada em {args.frame_root}.")
+    sys.exit(1)
+train_df, _ = train_test_split(df, test_size=0.2, random_state=42, stratify=df['label'])
+n_batches = min(args.batches, -(-len(train_df) // args.batch_size))
+
+def preprocess_input(img): return (img / 127.5) - 1.0
+
+rows = []
+
+def report(name, result):
+    images, seconds, per_sec = result
+    print(f"   {name:<32} {per_sec:8.1f} imagens/s")
+    rows.append({"pipeline": name, "images": images, "seconds": seconds, "images_per_sec": per_sec})
+
+print(f"--- {n_batches} lotes de {args.batch_size} imagens ({args.image_size}px) ---")
+
+datagen = ImageDataGenerator(preprocessing_function=preprocess_input, rotation_range=10, horizontal_flip=True)
+train_gen = datagen.flow_from_dataframe(train_df, x_col='path', y_col='label', target_size=(args.image_size, args.image_size),
+                                        batch_size=args.batch_size, class_mode='raw')
+report("ImageDataGenerator", throughput(train_gen, n_batches))
+
+train_ds = make_dataset(train_df['path'].tolist(), args.image_size, batch_size=args.batch_size, shuffle=True,
+                        augment=augmentation(), preprocess=preprocess_input)
+report("tf.data", throughput(train_ds, n_batches))
+
+# Com cache: a 1ª passada decodifica os JPEGs, as seguintes leem da memória
+cached_ds = make_dataset(train_df['path'].tolist(), args.image_size, batch_size=args.batch_size, shuffle=True, cache=True,
+                         augment=augmentation(), preprocess=preprocess_input)
+throughput(cached_ds)
+report("tf.data + cache (2ª época)", throughput(cached_ds, n_batches))
+
+pd.DataFrame(rows).to_csv(args.output, index=False)
+print(f"\nResultados salvos em: {args.output}")
@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+import argparse
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline import profiling, registry
+from pipeline.backends import make_engine, BACKENDS
+from pipeline.faces import get_detector, list_videos, DETECTORS, VIDEO_EXTENSIONS
+from pipeline.streaming import stream_videos, DEFAULT_QUEUE_SIZE
+
+# Do vídeo ao veredito em memória: sem gravar rostos em frames/ nem recomprimir no disco
+parser = argparse.ArgumentParser(description="Avalia vídeos direto do arquivo (detecção, recorte e inferência em memória).")
+parser.add_argument("videos", nargs="*", help="Arquivos de vídeo (padrão: todos os vídeos de --video-root)")
+parser.add_argument("--video-root", default="data", help="Pasta com videos_real/ e videos_fake/")
+parser.add_argument("--model", default="MesoNet_DF", choices=list(registry.MODELS))
+parser.add_argument("--backend", choices=BACKENDS, default="keras")
+parser.add_argument("--detector", default="mtcnn", choices=list(DETECTORS))
+parser.add_argument("--sample-rate", type=int, default=15, help="1 frame a cada N (como no 01_extract_faces.py)")
+parser.add_argument("--quality", type=int, help="Compressão JPEG simulada em memória (ex.: 30 = cenário q30)")
+parser.add_argument("--batch-size", type=int, default=64)
+parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE, help="Itens em espera entre os estágios")
+parser.add_argument("--threshold", type=float, default=0.5)
+parser.add_argument("--output", default="results_STREAMING.csv", help="Scores por frame")
+parser.add_argument("--videos-output", default="VEREDITOS_STREAMING.csv", help="Score e veredito por vídeo")
+profiling.add_arguments(parser)
+args = parser.parse_args()
+profiling.from_args(args)
+
+if args.videos:
+    # Vídeos avulsos: o rótulo só é conhecido se a pasta for videos_real/videos_fake
+    videos = [(v, os.path.basename(os.path.dirname(v)) if os.path.basename(os.path.dirname(v)) in ("videos_real", "videos_fake") else None)
+              for v in args.videos if v.endswith(VIDEO_EXTENSIONS)]
+else:
+    videos = list_videos(args.video_root)
+if not videos:
+    print("Nenhum vídeo encontrado.")
+    sys.exit(1)
+
+m_info = registry.MODELS[args.model]
+scenario = "hq" if args.quality is None else f"q{args.quality}"
+print(f">>> Carregando Modelo: {m_info['name']} ({args.backend}), detector: {args.detector}")
+engine = make_engine(m_info, args.backend, batch_size=args.batch_size)
+detector = get_detector(args.detector)
+
+start_time = time.time()
+frame_rows, video_rows = [], []
+with profiling.tf_profiler(args.tf_profile):
+    for frames, video in stream_videos(videos, detector, m_info, engine, sample_rate=args.sample_rate, quality=args.quality,
+                                       batch_size=args.batch_size, threshold=args.threshold, queue_size=args.queue_size):
+        frame_rows.extend(frames)
+        video_rows.append(video)
+        print(f"   {video['video']:>20}: {video['verdict'] or 'sem rostos':>10} (score {video['score']:.3f}, "
+              f"{video['frames']} frames, {video['seconds']:.1f}s)")
+
+model_name = m_info['name'] if args.backend == "keras" else f"{m_info['name']} [{args.backend}]"
+pd.DataFrame(frame_rows, columns=["label_str", "video", "frame", "label", "score"]).assign(model=model_name, scenario=scenario).to_csv(args.output, index=False)
+videos_df = pd.DataFrame(video_rows).assign(model=model_name, scenario=scenario)
+videos_df.to_csv(args.videos_output, index=False)
+
+elapsed = time.time() - start_time
+print(f"\n{len(video_rows)} vídeos em {elapsed:.1f}s ({len(frame_rows) / elapsed:.1f} rostos/s)")
+if videos_df["label"].notna().any():
+    known = videos_df[videos_df["label"].notna() & videos_df["verdict"].notna()]
+    accuracy = ((known["verdict"] == "FAKE").astype(int) == known["label"]).mean()
+    print(f"Acurácia por vídeo: {accuracy:.3f}")
+print(f"--- SUCESSO! Scores salvos em: {args.output} e {args.videos_output} ---")
+profiling.finish(args.output, len(frame_rows), model=model_name, backend=args.backend, videos=len(video_rows), trace=args.trace)
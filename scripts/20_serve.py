@@ -0,0 +1,53 @@
+import os
+import sys
+import asyncio
+import argparse
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline import registry
+from pipeline.backends import make_engine, BACKENDS
+from pipeline.faces import DETECTORS
+from pipeline.service import MicroBatcher, ScoringService, DEFAULT_MAX_BATCH, DEFAULT_MAX_DELAY_MS
+
+# Serviço local: os modelos ficam carregados e as requisições simultâneas são avaliadas em lote
+parser = argparse.ArgumentParser(description="Serviço local de scores com micro-batching entre requisições simultâneas.")
+parser.add_argument("--models", nargs="+", default=["MesoNet_DF"], help=f"Modelos carregados (opções: {', '.join(registry.MODELS)})")
+parser.add_argument("--backend", choices=BACKENDS, default="keras")
+parser.add_argument("--host", default="127.0.0.1")
+parser.add_argument("--port", type=int, default=8000)
+parser.add_argument("--unix", help="Escuta num socket Unix em vez de TCP")
+parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="Tamanho máximo do lote")
+parser.add_argument("--max-delay-ms", type=float, default=DEFAULT_MAX_DELAY_MS,
+                    help="Espera máxima de uma imagem na fila antes de o lote ser rodado")
+parser.add_argument("--detector", choices=list(DETECTORS), help="Detector de rostos para a rota /video (padrão: sem vídeos)")
+parser.add_argument("--threshold", type=float, default=0.5)
+args = parser.parse_args()
+
+unknown = [m for m in args.models if m not in registry.MODELS]
+if unknown:
+    parser.error(f"modelos desconhecidos: {', '.join(unknown)}")
+
+batchers = {}
+for m_info in registry.get_models(args.models):
+    print(f">>> Carregando Modelo: {m_info['name']} ({args.backend})")
+    try:
+        engine = make_engine(m_info, args.backend, batch_size=args.max_batch)
+    except Exception as e:
+        print(f"Erro: {e}")
+        continue
+    # Aquecimento: a primeira requisição não paga a compilação do grafo
+    engine.predict_batch(np.zeros((1, m_info['size'], m_info['size'], 3), dtype=np.float32))
+    batchers[m_info['name']] = MicroBatcher(m_info, engine, args.max_batch, args.max_delay_ms)
+if not batchers:
+    print("Nenhum modelo foi carregado.")
+    sys.exit(1)
+
+service = ScoringService(batchers, args.detector, args.threshold)
+print(f"--- Servindo {', '.join(batchers)} em {args.unix or f'http://{args.host}:{args.port}'} "
+      f"(lote até {args.max_batch}, espera até {args.max_delay_ms:g} ms) ---")
+try:
+    asyncio.run(service.serve(args.host, args.port, args.unix))
+except KeyboardInterrupt:
+    pass
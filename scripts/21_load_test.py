@@ -0,0 +1,112 @@
+import os
+import sys
+import glob
+import time
+import random
+import asyncio
+import argparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline.service import http_request
+
+# Gerador de carga para o 20_serve.py: N clientes simultâneos enviando rostos de frames/
+parser = argparse.ArgumentParser(description="Carga no serviço de scores: latência p50/p99 e vazão por nível de concorrência.")
+parser.add_argument("--host", default="127.0.0.1")
+parser.add_argument("--port", type=int, default=8000)
+parser.add_argument("--unix", help="Socket Unix do serviço (em vez de TCP)")
+parser.add_argument("--model", default="MesoNet_DF")
+parser.add_argument("--image-root", default="frames/hq", help="Imagens enviadas nas requisições")
+parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64], help="Clientes simultâneos (um teste por valor)")
+parser.add_argument("--requests", type=int, default=1000, help="Requisições por teste")
+parser.add_argument("--images", type=int, default=200, help="Imagens distintas carregadas na memória")
+parser.add_argument("--seed", type=int, default=42)
+parser.add_argument("--output", default="benchmark_servico.csv")
+args = parser.parse_args()
+
+paths = sorted(glob.glob(os.path.join(args.image_root, "**", "*.jpg"), recursive=True))
+if not paths:
+    print(f"Nenhuma imagem encontrada em {args.image_root}")
+    sys.exit(1)
+random.Random(args.seed).shuffle(paths)
+payloads = []
+for path in paths[:args.images]:
+    with open(path, "rb") as f:
+        payloads.append(f.read())
+target = f"/score?model={args.model}"
+server = dict(host=args.host, port=args.port, unix_path=args.unix)
+
+
+async def request_once(method, path, body=b""):
+    """Requisição avulsa (fora dos clientes medidos): abre e fecha a própria conexão."""
+    status, data, connection = await http_request(method, path, body, **server)
+    connection[1].close()
+    return status, data
+
+
+async def client(requests_left, latencies, errors):
+    connection = None
+    while requests_left:
+        body = payloads[requests_left.pop() % len(payloads)]
+        start = time.perf_counter()
+        try:
+            status, _, connection = await http_request("POST", target, body, connection=connection, **server)
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            errors.append(str(e))
+            connection = None
+            continue
+        if status == 200:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors.append(status)
+    if connection is not None:
+        connection[1].close()
+
+
+async def run(concurrency):
+    requests_left = list(range(args.requests))
+    latencies, errors = [], []
+    _, before = await request_once("GET", "/metrics")
+    start = time.perf_counter()
+    await asyncio.gather(*(client(requests_left, latencies, errors) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    _, after = await request_once("GET", "/metrics")
+
+    # Lotes formados durante este teste (diferença dos contadores do /metrics)
+    hist_before = before["models"][args.model]["batch_size_histogram"]
+    hist = {int(k): v - hist_before.get(k, 0) for k, v in after["models"][args.model]["batch_size_histogram"].items()}
+    batches = sum(hist.values())
+    ms = np.array(latencies) * 1000
+    return {"concurrency": concurrency, "requests": len(latencies), "errors": len(errors), "seconds": elapsed,
+            "throughput": len(latencies) / elapsed, "p50_ms": np.percentile(ms, 50) if len(ms) else np.nan,
+            "p99_ms": np.percentile(ms, 99) if len(ms) else np.nan,
+            "mean_batch": sum(k * v for k, v in hist.items()) / batches if batches else np.nan,
+            "max_batch": max((k for k, v in hist.items() if v), default=0)}
+
+
+async def main():
+    _, health = await request_once("GET", "/health")
+    if args.model not in health["models"]:
+        print(f"O serviço não carregou {args.model} (modelos: {', '.join(health['models'])})")
+        sys.exit(1)
+    # Aquecimento
+    await request_once("POST", target, payloads[0])
+    rows = []
+    for concurrency in args.concurrency:
+        row = await run(concurrency)
+        rows.append(row)
+        print(f"   {concurrency:>3} clientes: {row['throughput']:7.1f} req/s, p50 {row['p50_ms']:7.1f} ms, "
+              f"p99 {row['p99_ms']:7.1f} ms, lote médio {row['mean_batch']:.1f}, erros {row['errors']}")
+    return rows
+
+
+print(f">>> {args.requests} requisições por teste, {len(payloads)} imagens de {args.image_root} -> {args.model}")
+try:
+    rows = asyncio.run(main())
+except (ConnectionError, OSError) as e:
+    print(f"Erro ao conectar no serviço: {e}")
+    sys.exit(1)
+pd.DataFrame(rows).assign(model=args.model).to_csv(args.output, index=False)
+print(f"--- SUCESSO! Resultados salvos em: {args.output} ---")
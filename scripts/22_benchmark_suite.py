@@ -0,0 +1,71 @@
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline import bench, synthetic
+from pipeline.faces import DETECTORS
+from pipeline.registry import MODELS, get_models
+
+# Benchmarks reprodutíveis (offline, CPU, pesos aleatórios) sobre uma base sintética
+parser = argparse.ArgumentParser(description="Suíte de benchmarks sobre a base sintética: gera a base, mede cada etapa e compara com a linha de base.")
+commands = parser.add_subparsers(dest="command", required=True)
+
+gen = commands.add_parser("generate", help="Gera a base sintética (data/ e frames/{hq,q60,q30,q10})")
+gen.add_argument("--root", default=bench.DEFAULT_ROOT)
+gen.add_argument("--videos", type=int, default=4, help="Vídeos por classe")
+gen.add_argument("--frames", type=int, default=90, help="Frames por vídeo")
+gen.add_argument("--sample-rate", type=int, default=15)
+gen.add_argument("--seed", type=int, default=42)
+
+run = commands.add_parser("run", help="Roda os benchmarks e grava o JSON")
+run.add_argument("--root", default=bench.DEFAULT_ROOT, help="Base sintética (gerada com os padrões do 'generate' se não existir)")
+run.add_argument("--stages", nargs="+", default=bench.STAGES, help=f"Etapas medidas ({', '.join(bench.STAGES)})")
+run.add_argument("--models", nargs="+", default=["MesoNet_DF", "MobileNetV2"], help=f"Modelos da inferência ({', '.join(MODELS)})")
+run.add_argument("--batch-sizes", nargs="+", type=int, default=bench.DEFAULT_BATCH_SIZES)
+run.add_argument("--inference-frames", type=int, default=128, help="Frames aleatórios por medição de inferência")
+run.add_argument("--repeats", type=int, default=3, help="Repetições de cada medição (vale a mediana)")
+run.add_argument("--detector", default="haar", choices=list(DETECTORS), help="Detector da etapa de extração")
+run.add_argument("--output", default="benchmark_atual.json", help="Ex.: benchmark_baseline.json para gravar a linha de base")
+
+cmp = commands.add_parser("compare", help="Compara uma execução com a linha de base")
+cmp.add_argument("baseline")
+cmp.add_argument("current")
+cmp.add_argument("--tolerance", type=float, default=bench.DEFAULT_TOLERANCE, help="Queda de vazão tolerada (0.10 = 10%%)")
+cmp.add_argument("--output", help="CSV com a comparação")
+args = parser.parse_args()
+
+if args.command == "generate":
+    info = synthetic.generate(args.root, args.videos, args.frames, args.sample_rate, seed=args.seed)
+    print(f"--- Base sintética em {info['root']}: {info['videos']} vídeos, {info['faces']} rostos por cenário ---")
+
+elif args.command == "run":
+    unknown = [s for s in args.stages if s not in bench.STAGES] + [m for m in args.models if m not in MODELS]
+    if unknown:
+        parser.error(f"etapas/modelos desconhecidos: {', '.join(unknown)}")
+    if not os.path.isdir(os.path.join(args.root, "frames", "hq")):
+        print(f">>> Gerando a base sintética em {args.root}...")
+        synthetic.generate(args.root)
+
+    print(f">>> Benchmarks ({args.repeats} repetições, mediana):")
+    report = bench.run_suite(args.root, args.stages, get_models(args.models) if "inference" in args.stages else [],
+                             args.batch_sizes, args.repeats, args.inference_frames, args.detector)
+    bench.save(report, args.output)
+    print(f"--- SUCESSO! Resultados salvos em: {args.output} ---")
+
+else:
+    baseline, current = bench.load(args.baseline), bench.load(args.current)
+    for key, (before, after) in bench.environment_changes(baseline, current).items():
+        print(f"Aviso: ambiente diferente da linha de base ({key}: {before} -> {after})")
+    comparison = bench.compare(baseline, current, args.tolerance)
+    for row in comparison.itertuples(index=False):
+        flag = "MAIS LENTO" if row.slower else ("mais rápido" if row.faster else "")
+        print(f"   {row.benchmark:<36} {row.baseline_per_s:10.1f} -> {row.current_per_s:10.1f} {row.unit}/s "
+              f"({row.ratio - 1:+6.1%}) {flag}")
+    if args.output:
+        comparison.to_csv(args.output, index=False)
+    slower = comparison[comparison["slower"]]
+    if len(slower):
+        print(f"\n{len(slower)} benchmark(s) mais lento(s) que a linha de base (tolerância {args.tolerance:.0%}).")
+        sys.exit(1)
+    print("\n--- Nenhuma etapa mais lenta que a linha de base ---")
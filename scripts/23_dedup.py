@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+import argparse
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline import dedup
+from pipeline.backends import BACKENDS
+from pipeline.evaluation import evaluate
+from pipeline.loader import find_images, parse_frame_path
+from pipeline.metrics import frame_metrics
+from pipeline.registry import MODELS, get_models
+from pipeline.score_cache import ScoreCache, SCORE_CACHE_PATH
+
+# Quanto da inferência a deduplicação economiza e quanto ela muda a AUC, para vários limiares
+parser = argparse.ArgumentParser(description="Deduplicação de frames quase idênticos: inferência economizada x efeito na acurácia/AUC.")
+parser.add_argument("--models", nargs="+", default=list(MODELS), choices=list(MODELS))
+parser.add_argument("--scenarios", nargs="+", default=["hq", "q60", "q30", "q10"])
+parser.add_argument("--image-root", default="frames")
+parser.add_argument("--thresholds", nargs="+", type=int, default=[2, 4, 8, 12], help="Distâncias de Hamming (bits de 64) testadas")
+parser.add_argument("--method", choices=dedup.METHODS, default="dhash")
+parser.add_argument("--batch-size", type=int, default=64)
+parser.add_argument("--backend", choices=BACKENDS, default="keras")
+parser.add_argument("--no-score-cache", action="store_true", help="Não reaproveita scores de execuções anteriores (pipeline/score_cache.py)")
+parser.add_argument("--output", default="DEDUP.csv")
+args = parser.parse_args()
+
+# 1. Scores de todos os frames (a referência); com o cache de scores, só os frames novos são avaliados
+start_time = time.time()
+score_cache = None if args.no_score_cache else ScoreCache(SCORE_CACHE_PATH)
+full = evaluate(get_models(args.models), args.scenarios, image_root=args.image_root, batch_size=args.batch_size,
+                backend=args.backend, score_cache=score_cache)
+if score_cache is not None:
+    score_cache.close()
+if full.empty:
+    print("Nenhum resultado foi gerado. Verifique as pastas de frames e os arquivos dos modelos.")
+    sys.exit(1)
+print(f"\nReferência (todos os frames): {len(full)} scores em {time.time() - start_time:.1f}s")
+
+reference = frame_metrics(full)[["model", "scenario", "n", "accuracy", "auc", "eer"]]
+
+# 2. Para cada limiar, os membros de cada grupo recebem o score do representante
+hq_root = os.path.join(args.image_root, "hq")
+rows = []
+for threshold in args.thresholds:
+    groups = dedup.build_groups(hq_root, threshold, args.method)
+    deduped = dedup.broadcast(full, groups)
+    # Frames realmente avaliados: os que dedup.representatives escolhe na lista de frames de cada
+    # cenário (um membro cujo representante falta no cenário é avaliado, como em evaluate())
+    rep_keys = []
+    for scenario in args.scenarios:
+        reps, _ = dedup.representatives(sorted(find_images(os.path.join(args.image_root, scenario))), groups)
+        rep_keys += [{"scenario": scenario, **parse_frame_path(path)} for path in reps]
+    rep_keys = pd.DataFrame(rep_keys, columns=["scenario", "label_str", "video", "frame"]).assign(rep=True)
+    scored = (full.merge(rep_keys[["scenario", "label_str", "video", "frame", "rep"]],
+                         on=["scenario", "label_str", "video", "frame"], how="left")
+              .assign(rep=lambda d: d["rep"].notna())
+              .groupby(["model", "scenario"], observed=True)["rep"].sum().rename("scored").reset_index())
+    metrics = frame_metrics(deduped)[["model", "scenario", "accuracy", "auc", "eer"]]
+    report = (reference.merge(metrics, on=["model", "scenario"], suffixes=("_full", "_dedup"))
+              .merge(scored, on=["model", "scenario"]))
+    report.insert(0, "threshold", threshold)
+    report["saved_frac"] = 1 - report["scored"] / report["n"]
+    report["delta_auc"] = report["auc_dedup"] - report["auc_full"]
+    report["delta_accuracy"] = report["accuracy_dedup"] - report["accuracy_full"]
+    rows.append(report)
+
+    n_groups = len(groups.drop_duplicates(["label_str", "video", "group"]))
+    print(f"   limiar {threshold:>2}: {n_groups} grupos em {len(groups)} rostos, "
+          f"{report['saved_frac'].mean():.1%} da inferência economizada, "
+          f"ΔAUC médio {report['delta_auc'].mean():+.4f} (pior {report['delta_auc'].min():+.4f})")
+
+summary = pd.concat(rows, ignore_index=True)
+summary.insert(1, "method", args.method)
+summary.to_csv(args.output, index=False)
+print(f"\n--- SUCESSO! Economia x efeito na AUC salvos em: {args.output} ---")
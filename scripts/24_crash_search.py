@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import argparse
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipeline import crash_search, degrade
+from pipeline.backends import make_engine, BACKENDS
+from pipeline.loader import find_images
+from pipeline.registry import MODELS, get_models
+
+# Qualidade JPEG em que cada modelo quebra, por bisseção adaptativa em vez da grade [60, 30, 10]
+parser = argparse.ArgumentParser(description="Busca adaptativa (bisseção + intervalos de confiança) da qualidade JPEG em que cada modelo quebra.")
+parser.add_argument("--models", nargs="+", default=list(MODELS), choices=list(MODELS))
+parser.add_argument("--metric", choices=crash_search.METRICS, default="auc")
+parser.add_argument("--threshold", type=float, default=crash_search.DEFAULT_THRESHOLD, help="O modelo 'quebra' quando a métrica fica abaixo deste valor")
+parser.add_argument("--image-root", default="frames", help="Os frames de <image-root>/hq são comprimidos em memória")
+parser.add_argument("--min-frames", type=int, default=64, help="Amostra inicial de cada qualidade")
+parser.add_argument("--max-frames", type=int, default=1024, help="Amostra máxima quando o intervalo de confiança cruza o limiar")
+parser.add_argument("--tolerance", type=int, default=2, help="Precisão do ponto de quebra (em níveis de qualidade)")
+parser.add_argument("--alpha", type=float, default=0.05, help="Intervalos de confiança de 1 - alpha")
+parser.add_argument("--batch-size", type=int, default=64)
+parser.add_argument("--backend", choices=BACKENDS, default="keras")
+parser.add_argument("--seed", type=int, default=42)
+parser.add_argument("--output", default="PONTO_DE_QUEBRA.csv")
+parser.add_argument("--steps-output", default="PONTO_DE_QUEBRA_passos.csv", help="Cada qualidade avaliada (amostra, métrica e intervalo)")
+args = parser.parse_args()
+
+image_paths = find_images(os.path.join(args.image_root, "hq"))
+if not image_paths:
+    print(f"Nenhuma imagem encontrada em {os.path.join(args.image_root, 'hq')}")
+    sys.exit(1)
+ordered = crash_search.sample_order(image_paths, args.seed)
+dense_cost = crash_search.grid_cost(len(ordered))
+print(f">>> {len(ordered)} frames em hq; amostra de {args.min_frames} a {args.max_frames} frames por qualidade")
+
+encoded_cache = degrade.EncodedCache()
+summary, steps = [], []
+for m_info in get_models(args.models):
+    print(f"\n>>> Carregando Modelo: {m_info['name']}")
+    try:
+        engine = make_engine(m_info, args.backend, batch_size=args.batch_size)
+    except Exception as e:
+        print(f"Erro: {e}")
+        continue
+
+    start = time.perf_counter()
+    search = crash_search.CrashSearch(m_info, engine, ordered, args.metric, args.threshold, args.min_frames,
+                                      args.max_frames, args.tolerance, args.alpha, image_root=args.image_root,
+                                      encoded_cache=encoded_cache, batch_size=args.batch_size, seed=args.seed)
+    try:
+        result = search.run()
+    except ValueError as e:
+        print(f"Erro: {e}")
+        continue
+    result["seconds"] = time.perf_counter() - start
+    result["cost_vs_dense_grid"] = result["frames_scored"] / dense_cost
+    summary.append(result)
+    steps.extend(search.steps)
+
+    for step in search.steps:
+        mark = "ok" if step["ok"] else "QUEBRADO"
+        print(f"   q{step['quality']:>3}: {args.metric} {step[args.metric]:.3f} [{step['ci_lo']:.3f}, {step['ci_hi']:.3f}] "
+              f"({step['frames']} frames) {mark}{'' if step['certain'] else ' (incerto)'}")
+    if result["crash_quality"] is None:
+        print(f"   {m_info['name']} não quebra nem em q{crash_search.MIN_QUALITY}")
+    elif result["ok_quality"] is None:
+        print(f"   {m_info['name']} já está abaixo de {args.threshold} sem compressão")
+    else:
+        print(f"   Ponto de quebra de {m_info['name']}: entre q{result['crash_quality']} (quebrado) e q{result['ok_quality']} (ok)")
+    print(f"   {result['frames_scored']} frames avaliados ({result['cost_vs_dense_grid']:.1%} de uma grade densa q1-q100)")
+
+if not summary:
+    print("Nenhum resultado foi gerado.")
+    sys.exit(1)
+
+summary = pd.DataFrame(summary).astype({"crash_quality": "Int64", "ok_quality": "Int64"})
+summary.to_csv(args.output, index=False)
+pd.DataFrame(steps).to_csv(args.steps_output, index=False)
+print(f"\n--- SUCESSO! Pontos de quebra salvos em: {args.output} (passos em {args.steps_output}) ---")